@@ -8,18 +8,20 @@ and the modern Chat Completions endpoint (client.chat.completions.create).
 
 import argparse
 import os
+import sys
 import time
 
-from openai import OpenAI
-from dotenv import load_dotenv
+if __package__:
+    from .batch_mode import add_batch_args, run_batch
+    from .response_cache import add_cache_args, cached_chat_completion, init_response_cache
+else:  # run as a script: python projects/p01_basic_chat/basic_chat.py
+    from batch_mode import add_batch_args, run_batch
+    from response_cache import add_cache_args, cached_chat_completion, init_response_cache
 
-# Load environment variables (.env should contain OPENAI_API_KEY)
-load_dotenv()
-
-# Unified OpenAI client (SDK 2.x pattern)
-client = OpenAI(
-    api_key=os.environ.get("OPENAI_API_KEY"),
-)
+# The OpenAI SDK import, .env loading and client construction are deferred
+# to the first real request (see get_client), so --help, slash commands and
+# import-only use start fast.
+_client = None
 
 # ANSI color codes for terminal output
 YELLOW = "\033[93m"
@@ -28,6 +30,21 @@ MAGENTA = "\033[95m"
 RESET = "\033[0m"
 
 
+def get_client():
+    """Return the shared OpenAI client, creating it on first use (SDK 2.x pattern)."""
+    global _client
+    if _client is None:
+        from dotenv import load_dotenv
+        from openai import OpenAI
+
+        # Load environment variables (.env should contain OPENAI_API_KEY)
+        load_dotenv()
+        _client = OpenAI(
+            api_key=os.environ.get("OPENAI_API_KEY"),
+        )
+    return _client
+
+
 def parse_args():
     """Parse command-line arguments for the stateless CLI chat tool."""
     parser = argparse.ArgumentParser(
@@ -65,6 +82,9 @@ def parse_args():
         help="Maximum number of output tokens (min 16, default: model default)",
     )
 
+    add_cache_args(parser)
+    add_batch_args(parser)
+
     return parser.parse_args()
 
 
@@ -80,6 +100,10 @@ def main(args):
         print("max-tokens is below the API minimum (16); using 16 instead.")
         max_tokens = 16
 
+    if args.batch:
+        failures = run_batch(get_client, init_response_cache(args), args, max_tokens)
+        sys.exit(1 if failures else 0)
+
     print("=== Project 01 - Basic Chat (STATELESS) ===")
     print(f"Using model: {args.model}")
     print(f"Temperature: {args.temperature} | top_p: {args.top_p}")
@@ -88,6 +112,11 @@ def main(args):
     print("Backend: chat.completions.create (OpenAI SDK 2.9.0)\n")
     print("Type '/exit' to quit.\n")
 
+    cache = init_response_cache(args)
+    if cache is not None:
+        note = "" if args.temperature == 0 else " (inactive: only used with --temperature 0)"
+        print(f"{MAGENTA}[response cache enabled → {args.cache_dir}]{note}{RESET}\n")
+
     while True:
         try:
             user_input = input(f"{YELLOW}You:{RESET} ")
@@ -107,7 +136,9 @@ def main(args):
 
         # --- Call to OpenAI Chat Completions API (stateless) ---
         start = time.time()
-        completion = client.chat.completions.create(
+        result = cached_chat_completion(
+            get_client,
+            cache,
             model=args.model,
             messages=[
                 {
@@ -126,23 +157,27 @@ def main(args):
         elapsed = time.time() - start
 
         # Extract assistant message text
-        assistant_message = completion.choices[0].message
-        assistant_text = assistant_message.content
+        assistant_text = result.text
 
         # --- Output formatting with colors ---
         print(f"\n{CYAN}Assistant:{RESET}\n")
         print(assistant_text)
 
         # --- Token usage and latency ---
-        usage = completion.usage
         # For chat.completions: prompt_tokens, completion_tokens, total_tokens
-        print(f"\n{MAGENTA}[latency: {elapsed:.3f}s]{RESET}")
+        # (cache hits replay the original usage; nothing is billed)
+        hit_note = f" · cache hit ({result.cache_hit})" if result.cache_hit else ""
+        print(f"\n{MAGENTA}[latency: {elapsed:.3f}s{hit_note}]{RESET}")
         print(
-            f"{MAGENTA}[tokens - input: {usage.prompt_tokens}, "
-            f"output: {usage.completion_tokens}, total: {usage.total_tokens}]{RESET}"
+            f"{MAGENTA}[tokens - input: {result.prompt_tokens}, "
+            f"output: {result.completion_tokens}, total: {result.total_tokens}"
+            f"{' · cached, not billed' if result.cache_hit else ''}]{RESET}"
         )
         print("-" * 50)
 
+    if cache is not None:
+        print(f"{MAGENTA}[response cache · {cache.describe()}]{RESET}")
+
 
 if __name__ == "__main__":
     cli_args = parse_args()
@@ -5,7 +5,8 @@ Project 01 : Basic Chat (CLI) - Stateful
 Stateful CLI chat client using the OpenAI Python SDK 2.9.0 and
 the Chat Completions endpoint (client.chat.completions.create).
 
-This version keeps full conversation history in memory during the session
+This version keeps conversation history in memory during the session
+(optionally bounded by a prompt token budget, see history_window.py)
 and supports internal slash commands. It can also log the session to disk.
 """
 
@@ -14,16 +15,39 @@ import os
 import time
 from datetime import datetime
 
-from openai import OpenAI
-from dotenv import load_dotenv
-
-# Load environment variables (.env should contain OPENAI_API_KEY)
-load_dotenv()
+if __package__:
+    from .history_window import HistoryWindow
+    from .log_writer import DEFAULT_FLUSH_INTERVAL, BackgroundLogWriter
+    from .prompt_cache_stats import PromptCacheStats
+    from .session_journal import (
+        DEFAULT_SESSION_DIR,
+        JournalError,
+        SessionJournal,
+        list_sessions,
+        load_session,
+        new_session_id,
+        resolve_journal_path,
+    )
+    from .response_cache import add_cache_args, cached_chat_completion, init_response_cache
+else:  # run as a script: python projects/p01_basic_chat/basic_chat_stateful.py
+    from history_window import HistoryWindow
+    from log_writer import DEFAULT_FLUSH_INTERVAL, BackgroundLogWriter
+    from prompt_cache_stats import PromptCacheStats
+    from session_journal import (
+        DEFAULT_SESSION_DIR,
+        JournalError,
+        SessionJournal,
+        list_sessions,
+        load_session,
+        new_session_id,
+        resolve_journal_path,
+    )
+    from response_cache import add_cache_args, cached_chat_completion, init_response_cache
 
-# Unified OpenAI client (SDK 2.9.0 pattern)
-client = OpenAI(
-    api_key=os.environ.get("OPENAI_API_KEY"),
-)
+# The OpenAI SDK import, .env loading and client construction are deferred
+# to the first real request (see get_client), so --help, slash commands and
+# import-only use start fast.
+_client = None
 
 # ANSI color codes for terminal output
 YELLOW = "\033[93m"
@@ -34,6 +58,21 @@ RESET = "\033[0m"
 LOG_DIR = "logs"
 
 
+def get_client():
+    """Return the shared OpenAI client, creating it on first use (SDK 2.9.0 pattern)."""
+    global _client
+    if _client is None:
+        from dotenv import load_dotenv
+        from openai import OpenAI
+
+        # Load environment variables (.env should contain OPENAI_API_KEY)
+        load_dotenv()
+        _client = OpenAI(
+            api_key=os.environ.get("OPENAI_API_KEY"),
+        )
+    return _client
+
+
 def parse_args():
     """Parse command-line arguments for the stateful CLI chat tool."""
     parser = argparse.ArgumentParser(
@@ -71,17 +110,50 @@ def parse_args():
         help="Maximum number of output tokens (min 16, default: model default)",
     )
 
+    parser.add_argument(
+        "--history-budget",
+        type=int,
+        default=None,
+        help=(
+            "Maximum prompt tokens kept in conversation history; oldest turns "
+            "are evicted once exceeded (default: unbounded)"
+        ),
+    )
+
     parser.add_argument(
         "--no-log",
         action="store_true",
         help="Disable writing a session log file to disk.",
     )
 
+    parser.add_argument(
+        "--log-flush-interval",
+        type=float,
+        default=DEFAULT_FLUSH_INTERVAL,
+        help=f"Seconds between background log flushes (default: {DEFAULT_FLUSH_INTERVAL})",
+    )
+
+    parser.add_argument(
+        "--resume",
+        type=str,
+        default=None,
+        metavar="SESSION",
+        help=f"Resume a journaled session (ID from {DEFAULT_SESSION_DIR}/ or a .journal path).",
+    )
+
+    parser.add_argument(
+        "--no-journal",
+        action="store_true",
+        help="Disable the binary session journal used by --resume.",
+    )
+
+    add_cache_args(parser)
+
     return parser.parse_args()
 
 
 def init_log_file(args):
-    """Create and open a timestamped log file for the current session."""
+    """Create a timestamped log file and wrap it in a background log writer."""
     os.makedirs(LOG_DIR, exist_ok=True)
     ts = datetime.now().strftime("%Y%m%d-%H%M%S")
     path = os.path.join(LOG_DIR, f"project01-stateful-{ts}.log")
@@ -96,90 +168,111 @@ def init_log_file(args):
     f.write("# ------------------------------\n\n")
     f.flush()
 
-    return f, path
+    return BackgroundLogWriter(f, flush_interval=args.log_flush_interval), path
 
 
 def log_line(log_file, role: str, content: str):
-    """Write a single timestamped line to the log file."""
+    """Queue a single timestamped line for the background log writer."""
     if log_file is None:
         return
-    ts = datetime.now().isoformat(timespec="seconds")
-    log_file.write(f"[{ts}] {role.upper()}: {content}\n")
-    log_file.flush()
-
-
-def initial_messages(system_prompt: str):
-    """Create the initial messages list with a system prompt."""
-    return [{"role": "system", "content": system_prompt}]
-
-
-def print_config(args, effective_max_tokens):
-    """Pretty print current runtime configuration."""
-    print("\n--- Current Configuration ---")
-    print(f"Model: {args.model}")
-    print(f"Temperature: {args.temperature}")
-    print(f"top_p: {args.top_p}")
-    print(f"Max tokens (effective): {effective_max_tokens}")
-    print("Backend: chat.completions.create (OpenAI SDK 2.9.0)")
-    print("--- End of config ---\n")
-
-
-def print_help():
-    """Print available slash commands."""
-    print("\n--- Available Commands ---")
-    print("/help    - show this help message")
-    print("/history - print conversation history (excluding system)")
-    print("/clear   - clear conversation history (reset to system prompt)")
-    print("/config  - show current configuration")
-    print("/exit    - exit the program")
-    print("--- End of help ---\n")
-
-
-def print_history(messages):
-    """Print conversation history excluding the system prompt."""
-    print("\n--- Conversation History (excluding system) ---")
+    log_file.log(role, content)
+
+
+def format_config(args, effective_max_tokens, history, cache=None, usage_stats=None) -> str:
+    """Render the current runtime configuration."""
+    budget = history.budget_tokens if history.budget_tokens is not None else "unbounded"
+    lines = [
+        "",
+        "--- Current Configuration ---",
+        f"Model: {args.model}",
+        f"Temperature: {args.temperature}",
+        f"top_p: {args.top_p}",
+        f"Max tokens (effective): {effective_max_tokens}",
+        f"History budget: {budget}",
+        f"History usage: {history.describe_usage()} · {len(history.messages)} messages",
+        (
+            f"History evicted: {history.evicted_messages} messages "
+            f"({history.evicted_tokens} tokens) · tokenizer: {history.tokenizer}"
+        ),
+        f"Response cache: {cache.describe() if cache is not None else 'disabled'}",
+        f"Prompt cache: {usage_stats.describe() if usage_stats is not None else 'n/a'}",
+        "Backend: chat.completions.create (OpenAI SDK 2.9.0)",
+        "--- End of config ---",
+        "",
+    ]
+    return "\n".join(lines)
+
+
+def format_help() -> str:
+    """Render the available slash commands."""
+    lines = [
+        "",
+        "--- Available Commands ---",
+        "/help    - show this help message",
+        "/history - print conversation history (excluding system)",
+        "/clear   - clear conversation history (reset to system prompt)",
+        "/config  - show current configuration",
+        "/exit    - exit the program",
+        "--- End of help ---",
+        "",
+    ]
+    return "\n".join(lines)
+
+
+def format_history(messages) -> str:
+    """Render conversation history excluding the system prompt."""
+    lines = ["", "--- Conversation History (excluding system) ---"]
     for msg in messages:
         if msg.get("role") == "system":
             continue
         role = msg.get("role", "").upper()
         content = msg.get("content", "")
-        print(f"{role}: {content}")
-    print("--- End of history ---\n")
+        lines.append(f"{role}: {content}")
+    lines += ["--- End of history ---", ""]
+    return "\n".join(lines)
 
 
-def handle_command(user_input: str, messages: list, args, effective_max_tokens, log_file):
+def run_command(user_input: str, history: HistoryWindow, args, effective_max_tokens, cache=None, usage_stats=None):
     """
-    Handle internal commands.
-    Returns True if a command was handled and the main loop should continue,
-    False otherwise.
+    Execute an internal slash command (except /exit) against a session history.
+
+    Shared by the interactive CLI and the headless chat server (chat_server.py).
+    Returns the command output text, or None if the command is unknown.
     """
     cmd = user_input.strip().lower()
 
     if cmd == "/help":
-        print_help()
-        log_line(log_file, "command", user_input)
-        return True
+        return format_help()
 
     if cmd == "/config":
-        print_config(args, effective_max_tokens)
-        log_line(log_file, "command", user_input)
-        return True
+        return format_config(args, effective_max_tokens, history, cache, usage_stats)
 
     if cmd == "/history":
-        print_history(messages)
-        log_line(log_file, "command", user_input)
-        return True
+        return format_history(history.messages)
 
     if cmd == "/clear":
-        # Keep only the first system message (index 0)
-        system_msg = messages[0]
-        messages.clear()
-        messages.append(system_msg)
-        print("Conversation history cleared.")
-        log_line(log_file, "command", user_input)
-        return True
+        # Keep only the pinned system message (index 0)
+        history.clear()
+        return "Conversation history cleared."
 
-    return False
+    return None
+
+
+def handle_command(
+    user_input: str, history: HistoryWindow, args, effective_max_tokens, log_file, cache=None, usage_stats=None
+):
+    """
+    Handle internal commands.
+    Returns True if a command was handled and the main loop should continue,
+    False otherwise.
+    """
+    output = run_command(user_input, history, args, effective_max_tokens, cache, usage_stats)
+    if output is None:
+        return False
+
+    print(output)
+    log_line(log_file, "command", user_input)
+    return True
 
 
 def main(args):
@@ -197,93 +290,161 @@ def main(args):
     print("Backend: chat.completions.create (OpenAI SDK 2.9.0)")
     print("Type '/help' for commands. Type '/exit' to quit.\n")
 
+    system_prompt = "You are a helpful assistant in a terminal chat session."
+
+    journal = None
+    if args.resume:
+        journal_path = resolve_journal_path(args.resume)
+        if not os.path.exists(journal_path):
+            available = ", ".join(list_sessions()[-5:]) or "none"
+            print(f"ERROR: session journal not found: {journal_path} (recent sessions: {available})")
+            return
+        try:
+            history, restored = load_session(
+                journal_path,
+                lambda prompt: HistoryWindow(prompt, model=args.model, budget_tokens=args.history_budget),
+            )
+            journal = SessionJournal(journal_path) if not args.no_journal else None
+        except JournalError as e:
+            print(f"ERROR: cannot resume session: {e}")
+            return
+        system_prompt = history.messages[0]["content"]
+        print(f"{MAGENTA}[resumed {journal_path}: {restored} messages · {history.describe_usage()}]{RESET}")
+    else:
+        history = HistoryWindow(system_prompt, model=args.model, budget_tokens=args.history_budget)
+        if not args.no_journal:
+            session_id = new_session_id()
+            journal_path = resolve_journal_path(session_id)
+            journal = SessionJournal(journal_path, system_prompt=system_prompt)
+            print(f"{MAGENTA}[journal → {journal_path} (resume with --resume {session_id})]{RESET}")
+
     log_file = None
     log_path = None
     if not args.no_log:
         log_file, log_path = init_log_file(args)
         print(f"{MAGENTA}[logging enabled → {log_path}]{RESET}")
 
-    system_prompt = "You are a helpful assistant in a terminal chat session."
-    messages = initial_messages(system_prompt)
-    log_line(log_file, "system", system_prompt)
-
-    while True:
-        try:
-            user_input = input(f"{YELLOW}You:{RESET} ")
-        except (EOFError, KeyboardInterrupt):
-            print("\nExiting...")
-            log_line(log_file, "command", "EOF/KeyboardInterrupt")
-            break
-
-        # Exit command
-        if user_input.strip().lower() == "/exit":
-            print("Goodbye!")
-            log_line(log_file, "command", user_input)
-            break
-
-        # Empty input
-        if not user_input.strip():
-            print("(empty input, type something or '/exit')")
-            continue
+    cache = init_response_cache(args)
+    if cache is not None:
+        note = "" if args.temperature == 0 else " (inactive: only used with --temperature 0)"
+        print(f"{MAGENTA}[response cache enabled → {args.cache_dir}]{note}{RESET}")
 
-        # Commands
-        if user_input.strip().startswith("/"):
-            handled = handle_command(
-                user_input=user_input,
-                messages=messages,
-                args=args,
-                effective_max_tokens=effective_max,
-                log_file=log_file,
-            )
-            if handled:
+    usage_stats = PromptCacheStats(args.model)
+    log_line(log_file, "system", system_prompt)
+    if journal is not None:
+        log_line(log_file, "journal", journal.path)
+
+    try:
+        while True:
+            try:
+                user_input = input(f"{YELLOW}You:{RESET} ")
+            except (EOFError, KeyboardInterrupt):
+                print("\nExiting...")
+                log_line(log_file, "command", "EOF/KeyboardInterrupt")
+                break
+
+            # Exit command
+            if user_input.strip().lower() == "/exit":
+                print("Goodbye!")
+                log_line(log_file, "command", user_input)
+                break
+
+            # Empty input
+            if not user_input.strip():
+                print("(empty input, type something or '/exit')")
                 continue
 
-            print("Unknown command. Available: /help, /history, /clear, /config, /exit")
-            log_line(log_file, "command", f"UNKNOWN {user_input}")
-            continue
-
-        # Append user message to memory
-        messages.append({"role": "user", "content": user_input})
-        log_line(log_file, "user", user_input)
-
-        # Call OpenAI (stateful: send full message history)
-        start = time.time()
-        completion = client.chat.completions.create(
-            model=args.model,
-            messages=messages,
-            temperature=args.temperature,
-            top_p=args.top_p,
-            max_tokens=max_tokens,
-        )
-        elapsed = time.time() - start
+            # Commands
+            if user_input.strip().startswith("/"):
+                handled = handle_command(
+                    user_input=user_input,
+                    history=history,
+                    args=args,
+                    effective_max_tokens=effective_max,
+                    log_file=log_file,
+                    cache=cache,
+                    usage_stats=usage_stats,
+                )
+                if handled:
+                    if journal is not None and user_input.strip().lower() == "/clear":
+                        journal.clear()
+                    continue
+
+                print("Unknown command. Available: /help, /history, /clear, /config, /exit")
+                log_line(log_file, "command", f"UNKNOWN {user_input}")
+                continue
 
-        choice = completion.choices[0]
-        assistant_text = choice.message.content or ""
+            # Append user message to memory (oldest turns are evicted over budget)
+            evicted = history.append("user", user_input)
+            log_line(log_file, "user", user_input)
+
+            # Call OpenAI (stateful: send the retained message history)
+            start = time.time()
+            result = cached_chat_completion(
+                get_client,
+                cache,
+                model=args.model,
+                messages=history.messages,
+                temperature=args.temperature,
+                top_p=args.top_p,
+                max_tokens=max_tokens,
+            )
+            elapsed = time.time() - start
+
+            assistant_text = result.text
+
+            # Append assistant message to memory
+            evicted += history.append("assistant", assistant_text)
+            log_line(log_file, "assistant", assistant_text)
+            if journal is not None:
+                journal.append_turn(user_input, assistant_text)
+            if result.cache_hit:
+                log_line(log_file, "cache", f"hit ({result.cache_hit}) · {elapsed:.3f}s · no request sent")
+                turn_usage = None
+            else:
+                # Only billed requests count toward prompt-cache telemetry.
+                turn_usage = usage_stats.record(result.prompt_tokens, result.cached_tokens, result.completion_tokens)
+                log_line(log_file, "usage", f"{turn_usage.describe()} · {elapsed:.3f}s")
+            if evicted:
+                log_line(log_file, "history", f"evicted {evicted} messages ({history.describe_usage()})")
+
+            # Output
+            print(f"\n{CYAN}Assistant:{RESET}\n")
+            print(assistant_text)
+
+            # Token usage (cache hits replay the original usage; nothing is billed)
+            hit_note = f" · cache hit ({result.cache_hit})" if result.cache_hit else ""
+            print(f"\n{MAGENTA}[latency: {elapsed:.3f}s{hit_note}]{RESET}")
+            print(
+                f"{MAGENTA}[tokens - input: {result.prompt_tokens}, "
+                f"output: {result.completion_tokens}, total: {result.total_tokens}"
+                f"{' · cached, not billed' if result.cache_hit else ''}]{RESET}"
+            )
+            if turn_usage is not None:
+                print(f"{MAGENTA}[{turn_usage.describe()} · session hit ratio: {100.0 * usage_stats.hit_ratio:.1f}%]{RESET}")
 
-        # Append assistant message to memory
-        messages.append({"role": "assistant", "content": assistant_text})
-        log_line(log_file, "assistant", assistant_text)
+            if evicted:
+                print(f"{MAGENTA}[history: evicted {evicted} messages · {history.describe_usage()}]{RESET}")
 
-        # Output
-        print(f"\n{CYAN}Assistant:{RESET}\n")
-        print(assistant_text)
+            # Finish reason (useful for debugging)
+            if result.finish_reason:
+                print(f"{MAGENTA}[finish_reason: {result.finish_reason}]{RESET}")
 
-        # Token usage
-        usage = completion.usage
-        print(f"\n{MAGENTA}[latency: {elapsed:.3f}s]{RESET}")
-        print(
-            f"{MAGENTA}[tokens - input: {usage.prompt_tokens}, "
-            f"output: {usage.completion_tokens}, total: {usage.total_tokens}]{RESET}"
-        )
+            print("-" * 50)
+    finally:
+        print(f"{MAGENTA}[session prompt cache · {usage_stats.describe()}]{RESET}")
+        log_line(log_file, "usage", f"session · {usage_stats.describe()}")
 
-        # Finish reason (useful for debugging)
-        if choice.finish_reason:
-            print(f"{MAGENTA}[finish_reason: {choice.finish_reason}]{RESET}")
+        if cache is not None:
+            print(f"{MAGENTA}[response cache · {cache.describe()}]{RESET}")
+            log_line(log_file, "cache", cache.describe())
 
-        print("-" * 50)
+        if journal is not None:
+            journal.close()
 
-    if log_file is not None:
-        log_file.close()
+        # Drain queued log records on /exit, EOF, Ctrl-C or an unexpected error
+        if log_file is not None:
+            log_file.close()
 
 
 if __name__ == "__main__":
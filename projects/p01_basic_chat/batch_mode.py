@@ -0,0 +1,256 @@
+"""
+Project 01 : Basic Chat (CLI) - Concurrent batch mode
+
+`basic_chat.py --batch FILE` turns the stateless client into a throughput tool:
+prompts are read from a JSONL file (or stdin with `--batch -`), sent
+concurrently on a bounded thread pool, and results are written as JSONL.
+
+Input lines (one per prompt):
+    {"id": "q1", "prompt": "Explain JSON Mode."}
+    "A bare JSON string is also accepted."
+
+Output lines (one per prompt):
+    {"index": 0, "id": "q1", "status": "ok", "output": "...", "latency_ms": 812,
+     "prompt_tokens": 21, "completion_tokens": 96, "total_tokens": 117,
+     "finish_reason": "stop", "cache_hit": null, "error": null}
+
+A line that is not valid input (bad JSON, no "prompt" string) does not stop
+the run: it gets an output line with "status": "error", "id" set to its line
+number and "latency_ms": null (it was never sent), and counts as a failed item.
+
+Each request is independent (system prompt + one user message), exactly like
+the interactive stateless loop. Memory stays bounded: at most
+2 x --concurrency prompts are in flight or buffered for ordering at any time.
+"""
+
+import json
+import math
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterator, List, Optional, TextIO, Tuple
+
+if __package__:
+    from .response_cache import ResponseCache, cached_chat_completion
+else:  # run as a script: python projects/p01_basic_chat/batch_mode.py
+    from response_cache import ResponseCache, cached_chat_completion
+
+SYSTEM_PROMPT = "You are a helpful assistant in a terminal chat session."
+
+
+def add_batch_args(parser) -> None:
+    """Register the batch-mode flags on the basic_chat.py parser."""
+    parser.add_argument(
+        "--batch",
+        type=str,
+        default=None,
+        metavar="FILE",
+        help="Run prompts from a JSONL file ('-' for stdin) concurrently instead of the interactive loop.",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=8,
+        help="Batch mode: maximum requests in flight (default: 8)",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        default="-",
+        help="Batch mode: JSONL results path ('-' for stdout, default)",
+    )
+    parser.add_argument(
+        "--order",
+        choices=["input", "completion"],
+        default="input",
+        help="Batch mode: emit results in input order or as they complete (default: input)",
+    )
+
+
+def iter_batch_items(src: TextIO) -> Iterator[Tuple[Any, Optional[str], Optional[str]]]:
+    """
+    Yield (id, prompt, error) from JSONL lines, skipping blank lines.
+
+    A malformed line yields (line number, None, error message) instead of
+    raising, so one bad line does not abort the batch.
+    """
+    for line_no, line in enumerate(src, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            item = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_no, None, f"line {line_no}: invalid JSON: {e}"
+            continue
+        if isinstance(item, str):
+            yield line_no, item, None
+        elif isinstance(item, dict) and isinstance(item.get("prompt"), str):
+            yield item.get("id", line_no), item["prompt"], None
+        else:
+            yield line_no, None, f"line {line_no}: expected a JSON string or an object with a 'prompt' string"
+
+
+def error_record(index: int, item_id: Any, error: str, latency_ms: Optional[int] = None) -> Dict[str, Any]:
+    """Result record of an item that failed (bad input line or failed request; no latency for input errors)."""
+    return {
+        "index": index,
+        "id": item_id,
+        "status": "error",
+        "output": None,
+        "latency_ms": latency_ms,
+        "prompt_tokens": 0,
+        "completion_tokens": 0,
+        "total_tokens": 0,
+        "finish_reason": None,
+        "cache_hit": None,
+        "error": error,
+    }
+
+
+def run_batch_item(
+    get_client: Callable[[], Any],
+    cache: Optional[ResponseCache],
+    args,
+    max_tokens: Optional[int],
+    index: int,
+    item_id: Any,
+    prompt: str,
+) -> Dict[str, Any]:
+    """Send one prompt and return its result record (errors are captured, not raised)."""
+    record: Dict[str, Any] = {"index": index, "id": item_id}
+
+    start = time.perf_counter()
+    try:
+        result = cached_chat_completion(
+            get_client,
+            cache,
+            model=args.model,
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": prompt},
+            ],
+            temperature=args.temperature,
+            top_p=args.top_p,
+            max_tokens=max_tokens,
+        )
+    except Exception as e:
+        latency_ms = int(round((time.perf_counter() - start) * 1000))
+        return error_record(index, item_id, f"{e.__class__.__name__}: {str(e)[:300]}", latency_ms)
+
+    record.update(
+        {
+            "status": "ok",
+            "output": result.text,
+            "latency_ms": int(round((time.perf_counter() - start) * 1000)),
+            "prompt_tokens": result.prompt_tokens,
+            "completion_tokens": result.completion_tokens,
+            "total_tokens": result.total_tokens,
+            "finish_reason": result.finish_reason,
+            "cache_hit": result.cache_hit,
+            "error": None,
+        }
+    )
+    return record
+
+
+def _percentile(sorted_values: List[float], p: float) -> float:
+    """Nearest-rank percentile (same method as the p04 summarizer)."""
+    if not sorted_values:
+        return 0.0
+    k = max(0, min(math.ceil((p / 100.0) * len(sorted_values)) - 1, len(sorted_values) - 1))
+    return float(sorted_values[k])
+
+
+def run_batch(get_client: Callable[[], Any], cache: Optional[ResponseCache], args, max_tokens: Optional[int]) -> int:
+    """
+    Run batch mode. Returns the number of failed items (usable as exit status).
+
+    The client is created on the first cache miss, so a batch answered
+    entirely from the cache never imports the SDK or needs an API key.
+    """
+    src = sys.stdin if args.batch == "-" else open(args.batch, "r", encoding="utf-8")
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+
+    window = max(1, args.concurrency) * 2
+    pending: Dict[Future, int] = {}
+    ready: Dict[int, Dict[str, Any]] = {}  # completed but waiting for input order
+    next_to_emit = 0
+
+    client_lock = threading.Lock()
+
+    def shared_client():
+        # Workers may miss the cache at the same time: create the client once.
+        with client_lock:
+            return get_client()
+
+    latencies: List[float] = []
+    totals = {"items": 0, "errors": 0, "prompt_tokens": 0, "completion_tokens": 0}
+
+    def emit(record: Dict[str, Any]) -> None:
+        out.write(json.dumps(record, ensure_ascii=False) + "\n")
+        out.flush()
+        totals["items"] += 1
+        totals["errors"] += record["status"] != "ok"
+        totals["prompt_tokens"] += record["prompt_tokens"]
+        totals["completion_tokens"] += record["completion_tokens"]
+        if record["latency_ms"] is not None:  # None: the line was never sent
+            latencies.append(record["latency_ms"])
+
+    def finish(index: int, record: Dict[str, Any]) -> None:
+        nonlocal next_to_emit
+        if args.order == "completion":
+            emit(record)
+            return
+        ready[index] = record
+        while next_to_emit in ready:
+            emit(ready.pop(next_to_emit))
+            next_to_emit += 1
+
+    def collect(block: bool) -> None:
+        if not pending:
+            return
+        done, _ = wait(list(pending), timeout=None if block else 0, return_when=FIRST_COMPLETED)
+        for fut in done:
+            finish(pending.pop(fut), fut.result())
+
+    start = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, args.concurrency)) as pool:
+            for index, (item_id, prompt, error) in enumerate(iter_batch_items(src)):
+                if error is not None:
+                    finish(index, error_record(index, item_id, error))
+                    continue
+                # Bound in-flight + reorder buffer so huge inputs stream through.
+                while len(pending) + len(ready) >= window:
+                    collect(block=True)
+                fut = pool.submit(run_batch_item, shared_client, cache, args, max_tokens, index, item_id, prompt)
+                pending[fut] = index
+                collect(block=False)
+
+            while pending:
+                collect(block=True)
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if out is not sys.stdout:
+            out.close()
+
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    n = totals["items"]
+    print(
+        f"[batch] items: {n} · errors: {totals['errors']} · concurrency: {args.concurrency} · "
+        f"elapsed: {elapsed:.2f}s · throughput: {n / elapsed if elapsed else 0.0:.2f} req/s",
+        file=sys.stderr,
+    )
+    print(
+        f"[batch] latency ms: p50 {_percentile(latencies, 50):.0f} · p95 {_percentile(latencies, 95):.0f} · "
+        f"tokens in/out: {totals['prompt_tokens']}/{totals['completion_tokens']}",
+        file=sys.stderr,
+    )
+    if cache is not None:
+        print(f"[batch] response cache · {cache.describe()}", file=sys.stderr)
+
+    return totals["errors"]
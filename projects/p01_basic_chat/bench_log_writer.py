@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+
+"""
+Project 01 : Basic Chat (CLI) - Log writer benchmark
+
+Measures the logging overhead paid on the interactive thread per chat turn:
+
+- sync:       the original log_line (format + write + flush per line)
+- background: BackgroundLogWriter (enqueue only; batched writes off-thread)
+
+A "turn" logs the same lines the stateful CLI writes for one exchange
+(user, assistant, plus one extra line). Only the time spent inside the logging
+calls is measured; `--turn-gap-ms` sleeps between turns (outside the timed
+region) to stand in for the network call, as in a real session.
+No network calls are made.
+
+Usage:
+    python projects/p01_basic_chat/bench_log_writer.py --turns 2000 --turn-gap-ms 1
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime
+
+if __package__:
+    from .log_writer import BackgroundLogWriter
+else:  # run as a script: python projects/p01_basic_chat/bench_log_writer.py
+    from log_writer import BackgroundLogWriter
+
+
+USER_TEXT = "Explain the difference between stateless and stateful chat clients."
+ASSISTANT_TEXT = "A stateless client sends one message per request. " * 8
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark per-turn logging overhead.")
+    parser.add_argument("--turns", type=int, default=2000, help="Number of simulated turns (default: 2000)")
+    parser.add_argument(
+        "--turn-gap-ms",
+        type=float,
+        default=1.0,
+        help="Untimed pause between turns, simulating the API call (default: 1.0)",
+    )
+    parser.add_argument("--repeats", type=int, default=3, help="Repeats per variant; best run is kept (default: 3)")
+    return parser.parse_args()
+
+
+def sync_log_line(log_file, role: str, content: str):
+    """The original per-line write + flush implementation."""
+    ts = datetime.now().isoformat(timespec="seconds")
+    log_file.write(f"[{ts}] {role.upper()}: {content}\n")
+    log_file.flush()
+
+
+def run_sync(path: str, turns: int, gap_s: float) -> float:
+    f = open(path, "w", encoding="utf-8")
+    elapsed = 0.0
+    for _ in range(turns):
+        start = time.perf_counter()
+        sync_log_line(f, "user", USER_TEXT)
+        sync_log_line(f, "assistant", ASSISTANT_TEXT)
+        sync_log_line(f, "latency", "0.812s")
+        elapsed += time.perf_counter() - start
+        time.sleep(gap_s)
+    f.close()
+    return elapsed
+
+
+def run_background(path: str, turns: int, gap_s: float) -> float:
+    writer = BackgroundLogWriter(open(path, "w", encoding="utf-8"))
+    elapsed = 0.0
+    for _ in range(turns):
+        start = time.perf_counter()
+        writer.log("user", USER_TEXT)
+        writer.log("assistant", ASSISTANT_TEXT)
+        writer.log("latency", "0.812s")
+        elapsed += time.perf_counter() - start
+        time.sleep(gap_s)
+    # Draining happens off the interactive path (and on /exit), so it is not timed.
+    writer.close()
+    return elapsed
+
+
+def main(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        results = {}
+        for name, fn in (("sync", run_sync), ("background", run_background)):
+            path = os.path.join(tmp, f"{name}.log")
+            gap_s = args.turn_gap_ms / 1000.0
+            results[name] = min(fn(path, args.turns, gap_s) for _ in range(args.repeats))
+
+            with open(path, encoding="utf-8") as f:
+                lines = sum(1 for _ in f)
+            assert lines == args.turns * 3, f"{name}: expected {args.turns * 3} lines, got {lines}"
+
+    print(f"turns: {args.turns} (3 log lines per turn, best of {args.repeats})")
+    for name, elapsed in results.items():
+        per_turn_us = elapsed / args.turns * 1e6
+        print(f"{name:>10}: {elapsed * 1000:8.1f} ms total · {per_turn_us:7.2f} µs/turn")
+    print(f"speedup: {results['sync'] / results['background']:.1f}x on the interactive thread")
+
+
+if __name__ == "__main__":
+    main(parse_args())
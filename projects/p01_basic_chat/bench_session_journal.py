@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+
+"""
+Project 01 : Basic Chat (CLI) - Session journal resume benchmark
+
+Writes a synthetic session of --turns turns to a temporary directory, both as
+a binary journal (session_journal.py) and as one JSON object per line (the
+obvious text alternative), then times rebuilding the history from each:
+
+- jsonl:              read every line and json.loads it
+- journal:            mmap + backward walk, whole session (no budget)
+- journal (budget):   mmap + backward walk, only the newest --budget tokens
+
+No API calls are made.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+
+if __package__:
+    from .history_window import HistoryWindow
+    from .session_journal import SessionJournal, load_session
+else:  # run as a script: python projects/p01_basic_chat/bench_session_journal.py
+    from history_window import HistoryWindow
+    from session_journal import SessionJournal, load_session
+
+SYSTEM_PROMPT = "You are a helpful assistant in a terminal chat session."
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark --resume from a binary journal vs a JSONL transcript.")
+    parser.add_argument("--turns", type=int, default=20_000, help="Turns in the synthetic session (default: 20000)")
+    parser.add_argument("--budget", type=int, default=4000, help="History budget for the budgeted resume (default: 4000)")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement; the median is reported (default: 5)")
+    return parser.parse_args()
+
+
+def _time_ms(fn, repeat: int) -> float:
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        runs.append((time.perf_counter() - start) * 1000.0)
+    return statistics.median(runs)
+
+
+def main():
+    args = parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        journal_path = os.path.join(tmp, "bench.journal")
+        jsonl_path = os.path.join(tmp, "bench.jsonl")
+
+        journal = SessionJournal(journal_path, system_prompt=SYSTEM_PROMPT)
+        with open(jsonl_path, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"role": "system", "content": SYSTEM_PROMPT}) + "\n")
+            for i in range(args.turns):
+                user = f"Question {i}: explain topic number {i} in a couple of sentences."
+                assistant = f"Answer {i}: " + "lorem ipsum dolor sit amet " * 12
+                journal.append_turn(user, assistant)
+                f.write(json.dumps({"role": "user", "content": user}) + "\n")
+                f.write(json.dumps({"role": "assistant", "content": assistant}) + "\n")
+        journal.close()
+
+        def resume_jsonl():
+            with open(jsonl_path, "r", encoding="utf-8") as f:
+                messages = [json.loads(line) for line in f]
+            history = HistoryWindow(messages[0]["content"], model="gpt-4o-mini")
+            history.restore((m["role"], m["content"]) for m in reversed(messages[1:]))
+            return history
+
+        def resume_journal(budget=None):
+            return load_session(
+                journal_path,
+                lambda prompt: HistoryWindow(prompt, model="gpt-4o-mini", budget_tokens=budget),
+            )[0]
+
+        assert resume_jsonl().messages == resume_journal().messages
+
+        print(
+            f"session: {args.turns} turns · journal {os.path.getsize(journal_path) / 1024:.0f} KiB · "
+            f"jsonl {os.path.getsize(jsonl_path) / 1024:.0f} KiB · tokenizer: {resume_journal().tokenizer}"
+        )
+        rows = [
+            ("jsonl (json.loads per line)", lambda: resume_jsonl()),
+            ("journal (full session)", lambda: resume_journal()),
+            (f"journal (budget {args.budget})", lambda: resume_journal(args.budget)),
+        ]
+        for label, fn in rows:
+            print(f"  {label:<32} {_time_ms(fn, args.repeat):>9.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
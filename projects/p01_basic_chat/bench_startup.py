@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+
+"""
+Project 01 : Basic Chat (CLI) - Startup benchmark
+
+Tracks the cold-start cost of each chat entry point:
+
+- import time: `python -X importtime -c "import <module>"`, parsed from the
+  cumulative column of the importtime report (plus the heaviest imports)
+- --help time: median wall-clock of `python <script> --help`
+
+Nothing here talks to the API. Use --record to append one JSON line per run
+so regressions (e.g. a new top-level SDK import) show up over time:
+
+    python projects/p01_basic_chat/bench_startup.py --repeat 5 --record logs/startup.jsonl
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Dict, List, Tuple
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+PROJECTS = os.path.dirname(HERE)
+
+# (label, project directory, module name)
+ENTRY_POINTS = [
+    ("basic_chat", HERE, "basic_chat"),
+    ("basic_chat_stateful", HERE, "basic_chat_stateful"),
+    ("chat_server", HERE, "chat_server"),
+    ("streaming_chat", os.path.join(PROJECTS, "p02_streaming_chat"), "streaming_chat"),
+]
+
+# A placeholder key keeps entry points that validate the key at startup
+# comparable; no request is ever sent.
+BENCH_ENV = {**os.environ, "OPENAI_API_KEY": os.environ.get("OPENAI_API_KEY") or "bench-startup"}
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Project 01 - Cold-start benchmark of the chat entry points.")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement; the median is reported (default: 5)")
+    parser.add_argument("--top", type=int, default=5, help="Heaviest top-level imports to list per entry point (default: 5)")
+    parser.add_argument("--record", type=str, default=None, help="Append results as one JSON line to this file")
+    return parser.parse_args()
+
+
+def measure_import(cwd: str, module: str) -> Tuple[float, List[Tuple[str, float]]]:
+    """Return (cumulative import ms of `module`, heaviest direct imports as (name, ms))."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=cwd,
+        env=BENCH_ENV,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    # importtime prints children before their parent and indents each level
+    # by two spaces: the direct imports of the entry point are the indent-3
+    # lines between the previous top-level line and the module's own line.
+    total_us = 0
+    children: Dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        m = IMPORTTIME_LINE.match(line)
+        if not m:
+            continue
+        cumulative, indent, name = int(m.group(2)), len(m.group(3)), m.group(4)
+        if indent == 1:
+            if name == module:
+                total_us = cumulative
+                break
+            children.clear()
+        elif indent == 3:
+            children[name] = cumulative
+
+    heaviest = sorted(children.items(), key=lambda kv: kv[1], reverse=True)
+    return total_us / 1000.0, [(name, us / 1000.0) for name, us in heaviest]
+
+
+def measure_help(cwd: str, module: str) -> float:
+    """Wall-clock ms of `python <module>.py --help`."""
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable, f"{module}.py", "--help"],
+        cwd=cwd,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        env=BENCH_ENV,
+        check=True,
+    )
+    return (time.perf_counter() - start) * 1000.0
+
+
+def main():
+    args = parse_args()
+    repeat = max(1, args.repeat)
+    results = []
+
+    for label, cwd, module in ENTRY_POINTS:
+        import_runs = []
+        heaviest: List[Tuple[str, float]] = []
+        for _ in range(repeat):
+            total_ms, heaviest = measure_import(cwd, module)
+            import_runs.append(total_ms)
+        help_runs = [measure_help(cwd, module) for _ in range(repeat)]
+
+        result = {
+            "entry_point": label,
+            "import_ms": round(statistics.median(import_runs), 1),
+            "help_ms": round(statistics.median(help_runs), 1),
+            "heaviest_imports": [{"module": n, "ms": round(ms, 1)} for n, ms in heaviest[: args.top]],
+        }
+        results.append(result)
+
+        print(f"{label:<22} import: {result['import_ms']:>7.1f} ms · --help: {result['help_ms']:>7.1f} ms")
+        for item in result["heaviest_imports"]:
+            print(f"    {item['module']:<28} {item['ms']:>7.1f} ms")
+
+    if args.record:
+        record = {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "repeat": repeat,
+            "results": results,
+        }
+        os.makedirs(os.path.dirname(os.path.abspath(args.record)), exist_ok=True)
+        with open(args.record, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+        print(f"\nRecorded to {args.record}")
+
+
+if __name__ == "__main__":
+    main()
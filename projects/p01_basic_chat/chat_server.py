@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+
+"""
+Project 01 : Basic Chat (CLI) - Headless multi-session chat server
+
+Runs many independent stateful conversations in one asyncio event loop using
+AsyncOpenAI. Each session has its own HistoryWindow (same memory rules as
+basic_chat_stateful.py) and its own bounded queue of pending turns, processed
+strictly in order by a per-session worker task.
+
+Transport (one JSON object per line, in both directions):
+- stdin/stdout (default), or
+- a local TCP socket with --listen HOST:PORT
+
+Request:
+    {"session": "s1", "input": "Hello!", "id": 1}
+
+Responses (echo `session` and `id`):
+    {"type": "reply",   "content": "...", "latency_ms": 812, "usage": {...}, "finish_reason": "stop"}
+    {"type": "command", "content": "..."}           # /help, /history, /clear, /config
+    {"type": "closed",  "content": "Goodbye!"}      # /exit ends the session
+    {"type": "error",   "error": "SESSION_BUSY", "detail": "..."}
+
+Backpressure:
+- per session: at most --session-queue pending turns; extra turns are rejected
+  with SESSION_BUSY instead of stalling other sessions
+- globally: at most --max-concurrency requests in flight upstream
+
+Load test offline with fake_chat_server.py and load_chat_server.py.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+if __package__:
+    from .basic_chat_stateful import run_command
+    from .history_window import HistoryWindow
+else:  # run as a script: python projects/p01_basic_chat/chat_server.py
+    from basic_chat_stateful import run_command
+    from history_window import HistoryWindow
+
+SYSTEM_PROMPT = "You are a helpful assistant in a terminal chat session."
+
+Reply = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+def parse_args():
+    """Parse command-line arguments for the headless chat server."""
+    parser = argparse.ArgumentParser(
+        description="Project 01 - Headless multi-session chat server (AsyncOpenAI, JSONL protocol)."
+    )
+
+    parser.add_argument("--model", type=str, default="gpt-4o-mini", help="OpenAI model ID (default: gpt-4o-mini)")
+    parser.add_argument("--temperature", type=float, default=0.7, help="Sampling temperature (default: 0.7)")
+    parser.add_argument("--top-p", type=float, default=1.0, help="Nucleus sampling top_p (default: 1.0)")
+    parser.add_argument("--max-tokens", type=int, default=None, help="Maximum output tokens (min 16)")
+    parser.add_argument(
+        "--history-budget",
+        type=int,
+        default=None,
+        help="Per-session history token budget (default: unbounded)",
+    )
+    parser.add_argument(
+        "--listen",
+        type=str,
+        default=None,
+        help="Serve JSONL over TCP on HOST:PORT instead of stdin/stdout",
+    )
+    parser.add_argument(
+        "--base-url",
+        type=str,
+        default=None,
+        help="Override the API base URL (e.g. http://127.0.0.1:8001/v1 for fake_chat_server.py)",
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=64,
+        help="Maximum upstream requests in flight across all sessions (default: 64)",
+    )
+    parser.add_argument(
+        "--session-queue",
+        type=int,
+        default=4,
+        help="Maximum pending turns per session before SESSION_BUSY (default: 4)",
+    )
+    parser.add_argument(
+        "--idle-timeout",
+        type=float,
+        default=600.0,
+        help="Drop sessions idle for this many seconds (default: 600)",
+    )
+
+    return parser.parse_args()
+
+
+@dataclass
+class Turn:
+    text: str
+    request_id: Any
+    reply: Reply
+
+
+@dataclass
+class Session:
+    session_id: str
+    history: HistoryWindow
+    queue: "asyncio.Queue[Turn]"
+    task: Optional["asyncio.Task[None]"] = None
+
+
+@dataclass
+class ServerStats:
+    sessions_opened: int = 0
+    turns: int = 0
+    commands: int = 0
+    rejected: int = 0
+    errors: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    started_at: float = field(default_factory=time.perf_counter)
+
+
+class ChatServer:
+    """Session manager: routes JSONL requests to per-session workers."""
+
+    def __init__(self, args, client):
+        self.args = args
+        self.client = client
+        self.sessions: Dict[str, Session] = {}
+        self.inflight = asyncio.Semaphore(args.max_concurrency)
+        self.stats = ServerStats()
+
+        max_tokens = args.max_tokens
+        if max_tokens is not None and max_tokens < 16:
+            max_tokens = 16
+        self.max_tokens = max_tokens
+        self.effective_max = max_tokens if max_tokens is not None else "model default"
+
+    # --- Routing ----------------------------------------------------
+
+    async def submit(self, line: str, reply: Reply) -> None:
+        """Parse one JSONL request and enqueue it on its session."""
+        try:
+            request = json.loads(line)
+            session_id = str(request["session"])
+            text = str(request["input"])
+        except (ValueError, KeyError, TypeError) as e:
+            await reply({"type": "error", "error": "BAD_REQUEST", "detail": str(e)})
+            return
+
+        request_id = request.get("id")
+
+        async def reply_to_session(payload: Dict[str, Any]) -> None:
+            await reply({"session": session_id, "id": request_id, **payload})
+
+        if not text.strip():
+            await reply_to_session({"type": "error", "error": "EMPTY_INPUT", "detail": "input is empty"})
+            return
+
+        session = self._get_or_open(session_id)
+        try:
+            session.queue.put_nowait(Turn(text=text, request_id=request_id, reply=reply_to_session))
+        except asyncio.QueueFull:
+            self.stats.rejected += 1
+            await reply_to_session(
+                {
+                    "type": "error",
+                    "error": "SESSION_BUSY",
+                    "detail": f"session has {session.queue.qsize()} pending turns",
+                }
+            )
+
+    def _get_or_open(self, session_id: str) -> Session:
+        session = self.sessions.get(session_id)
+        if session is None:
+            session = Session(
+                session_id=session_id,
+                history=HistoryWindow(SYSTEM_PROMPT, model=self.args.model, budget_tokens=self.args.history_budget),
+                queue=asyncio.Queue(maxsize=self.args.session_queue),
+            )
+            session.task = asyncio.create_task(self._session_worker(session))
+            self.sessions[session_id] = session
+            self.stats.sessions_opened += 1
+        return session
+
+    async def drain(self) -> None:
+        """Wait until every queued turn has been answered."""
+        await asyncio.gather(*(s.queue.join() for s in list(self.sessions.values())))
+
+    async def close(self) -> None:
+        for session in list(self.sessions.values()):
+            if session.task is not None:
+                session.task.cancel()
+        await asyncio.gather(*(s.task for s in self.sessions.values() if s.task), return_exceptions=True)
+        self.sessions.clear()
+
+    # --- Per-session worker -----------------------------------------
+
+    async def _session_worker(self, session: Session) -> None:
+        reason = "session ended by /exit"
+        try:
+            while True:
+                try:
+                    turn = await asyncio.wait_for(session.queue.get(), timeout=self.args.idle_timeout)
+                except asyncio.TimeoutError:
+                    if session.queue.empty():
+                        self.sessions.pop(session.session_id, None)
+                        return
+                    continue
+
+                try:
+                    done = await self._handle_turn(session, turn)
+                except Exception as e:
+                    self.stats.errors += 1
+                    # The failure may be the reply itself (client gone, drain() error):
+                    # then this connection is dead and the session ends here.
+                    if not await self._reply_safely(turn, {"type": "error", "error": "INTERNAL", "detail": str(e)}):
+                        reason = "session closed after a failed reply"
+                        done = True
+                    else:
+                        done = False
+                finally:
+                    session.queue.task_done()
+
+                if done:
+                    break
+        except Exception as e:
+            # Never leave a registered session without a worker: later turns would
+            # queue up until SESSION_BUSY and drain() would wait forever.
+            self.stats.errors += 1
+            reason = f"session worker failed: {e}"
+
+        await self._close_session(session, reason)
+
+    async def _close_session(self, session: Session, reason: str) -> None:
+        """Unregister a session and answer anything still queued on it."""
+        if self.sessions.get(session.session_id) is session:
+            del self.sessions[session.session_id]
+        # Answer anything queued behind the end instead of dropping it silently.
+        while not session.queue.empty():
+            pending = session.queue.get_nowait()
+            await self._reply_safely(pending, {"type": "error", "error": "SESSION_CLOSED", "detail": reason})
+            session.queue.task_done()
+
+    async def _reply_safely(self, turn: Turn, payload: Dict[str, Any]) -> bool:
+        """Reply to a turn; returns False instead of raising if the client is gone."""
+        try:
+            await turn.reply(payload)
+            return True
+        except Exception:
+            return False
+
+    async def _handle_turn(self, session: Session, turn: Turn) -> bool:
+        """Process one turn. Returns True when the session should end."""
+        text = turn.text.strip()
+
+        if text.lower() == "/exit":
+            await turn.reply({"type": "closed", "content": "Goodbye!"})
+            return True
+
+        if text.startswith("/"):
+            self.stats.commands += 1
+            output = run_command(text, session.history, self.args, self.effective_max)
+            if output is None:
+                await turn.reply(
+                    {
+                        "type": "error",
+                        "error": "UNKNOWN_COMMAND",
+                        "detail": "Available: /help, /history, /clear, /config, /exit",
+                    }
+                )
+            else:
+                await turn.reply({"type": "command", "content": output})
+            return False
+
+        session.history.append("user", turn.text)
+
+        start = time.perf_counter()
+        try:
+            async with self.inflight:
+                completion = await self.client.chat.completions.create(
+                    model=self.args.model,
+                    messages=session.history.messages,
+                    temperature=self.args.temperature,
+                    top_p=self.args.top_p,
+                    max_tokens=self.max_tokens,
+                )
+        except Exception as e:
+            # Keep history consistent: the user turn was never answered.
+            session.history.pop()
+            self.stats.errors += 1
+            await turn.reply({"type": "error", "error": "UPSTREAM", "detail": str(e)})
+            return False
+        elapsed = time.perf_counter() - start
+
+        choice = completion.choices[0]
+        assistant_text = choice.message.content or ""
+        session.history.append("assistant", assistant_text)
+
+        usage = completion.usage
+        self.stats.turns += 1
+        if usage is not None:
+            self.stats.prompt_tokens += usage.prompt_tokens
+            self.stats.completion_tokens += usage.completion_tokens
+
+        await turn.reply(
+            {
+                "type": "reply",
+                "content": assistant_text,
+                "latency_ms": int(round(elapsed * 1000)),
+                "usage": {
+                    "prompt_tokens": usage.prompt_tokens if usage else None,
+                    "completion_tokens": usage.completion_tokens if usage else None,
+                    "total_tokens": usage.total_tokens if usage else None,
+                },
+                "finish_reason": choice.finish_reason,
+            }
+        )
+        return False
+
+    def describe_stats(self) -> str:
+        s = self.stats
+        elapsed = time.perf_counter() - s.started_at
+        return (
+            f"[chat_server] sessions: {s.sessions_opened} · turns: {s.turns} · commands: {s.commands} · "
+            f"rejected: {s.rejected} · errors: {s.errors} · tokens in/out: "
+            f"{s.prompt_tokens}/{s.completion_tokens} · uptime: {elapsed:.1f}s"
+        )
+
+
+# ─────────────────────────────────────────────────────────────
+# Transports
+# ─────────────────────────────────────────────────────────────
+
+async def serve_stdin(server: ChatServer) -> None:
+    """Read JSONL requests from stdin, write JSONL responses to stdout."""
+    loop = asyncio.get_running_loop()
+
+    async def reply(payload: Dict[str, Any]) -> None:
+        sys.stdout.write(json.dumps(payload, ensure_ascii=False) + "\n")
+        sys.stdout.flush()
+
+    while True:
+        # readline in a thread works for pipes, files and terminals alike.
+        line = await loop.run_in_executor(None, sys.stdin.readline)
+        if not line:
+            break
+        if line.strip():
+            await server.submit(line, reply)
+
+    await server.drain()
+
+
+async def serve_socket(server: ChatServer, host: str, port: int) -> None:
+    """Serve JSONL over TCP; replies go back on the connection that sent the request."""
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        lock = asyncio.Lock()
+
+        async def reply(payload: Dict[str, Any]) -> None:
+            async with lock:
+                writer.write((json.dumps(payload, ensure_ascii=False) + "\n").encode("utf-8"))
+                await writer.drain()
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if line.strip():
+                    await server.submit(line.decode("utf-8"), reply)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    tcp = await asyncio.start_server(handle, host, port, limit=1 << 20)
+    print(f"[chat_server] listening on {host}:{port}", file=sys.stderr)
+    async with tcp:
+        await tcp.serve_forever()
+
+
+async def _main(args) -> None:
+    # SDK imported lazily, like the CLIs, so --help stays fast.
+    from dotenv import load_dotenv
+    from openai import AsyncOpenAI
+
+    load_dotenv()
+    client = AsyncOpenAI(api_key=os.environ.get("OPENAI_API_KEY"), base_url=args.base_url)
+    server = ChatServer(args, client)
+    try:
+        if args.listen:
+            host, _, port = args.listen.rpartition(":")
+            await serve_socket(server, host or "127.0.0.1", int(port))
+        else:
+            await serve_stdin(server)
+    finally:
+        await server.close()
+        await client.close()
+        print(server.describe_stats(), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(_main(parse_args()))
+    except KeyboardInterrupt:
+        pass
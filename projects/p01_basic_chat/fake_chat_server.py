@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+
+"""
+Project 01 : Basic Chat (CLI) - Local fake Chat Completions endpoint
+
+A tiny asyncio HTTP/1.1 server that answers POST /v1/chat/completions with a
+deterministic "echo" completion after a configurable delay. It exists for
+offline load tests of chat_server.py and the CLIs (point them at it with
+`--base-url http://127.0.0.1:PORT/v1`).
+
+It only implements what the OpenAI SDK needs for non-streaming chat
+completions: keep-alive connections, Content-Length bodies and a JSON reply
+with `choices` and `usage`. No API key is checked.
+
+Prompt caching is simulated like the real service: once a message-list prefix
+of at least 1024 tokens has been seen, later requests sharing it report it
+(rounded down to 128-token blocks) as `usage.prompt_tokens_details.cached_tokens`.
+
+Usage:
+    python projects/p01_basic_chat/fake_chat_server.py --port 8001 --latency-ms 200
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import time
+import uuid
+
+CHARS_PER_TOKEN = 4
+PROMPT_CACHE_MIN_TOKENS = 1024
+PROMPT_CACHE_BLOCK_TOKENS = 128
+
+# Hashes of message-list prefixes seen so far (simulated prompt cache)
+_seen_prefixes = set()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Local fake Chat Completions endpoint for load tests.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--latency-ms", type=float, default=100.0, help="Simulated model latency (default: 100)")
+    return parser.parse_args()
+
+
+def _estimate_tokens(text: str) -> int:
+    return max(1, (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN)
+
+
+def build_completion(body: dict) -> dict:
+    """Build a Chat Completions response that echoes the last user message."""
+    messages = body.get("messages", [])
+    last_user = next((m.get("content", "") for m in reversed(messages) if m.get("role") == "user"), "")
+    text = f"echo: {last_user}"
+
+    prompt_tokens = 0
+    cached_tokens = 0
+    prefix = hashlib.sha256()
+    for m in messages:
+        prompt_tokens += _estimate_tokens(m.get("content", "") or "") + 4
+        prefix.update(json.dumps(m, sort_keys=True).encode("utf-8"))
+        digest = prefix.copy().hexdigest()
+        if digest in _seen_prefixes:
+            cached_tokens = prompt_tokens
+        _seen_prefixes.add(digest)
+    if cached_tokens < PROMPT_CACHE_MIN_TOKENS:
+        cached_tokens = 0
+    cached_tokens -= cached_tokens % PROMPT_CACHE_BLOCK_TOKENS
+    completion_tokens = _estimate_tokens(text)
+
+    return {
+        "id": f"chatcmpl-fake-{uuid.uuid4().hex[:12]}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "fake-model"),
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": text},
+                "finish_reason": "stop",
+            }
+        ],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            "prompt_tokens_details": {"cached_tokens": cached_tokens},
+        },
+    }
+
+
+async def _read_request(reader: asyncio.StreamReader):
+    """Read one HTTP request. Returns (method, path, body_bytes) or None on EOF."""
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except (asyncio.IncompleteReadError, ConnectionError):
+        return None
+
+    lines = head.decode("latin-1").split("\r\n")
+    method, path, _ = lines[0].split(" ", 2)
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            k, v = line.split(":", 1)
+            headers[k.strip().lower()] = v.strip()
+
+    length = int(headers.get("content-length", "0") or 0)
+    body = await reader.readexactly(length) if length else b""
+    return method, path, body
+
+
+def _response(status: str, payload: dict) -> bytes:
+    data = json.dumps(payload).encode("utf-8")
+    head = (
+        f"HTTP/1.1 {status}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(data)}\r\n"
+        "Connection: keep-alive\r\n"
+        "\r\n"
+    )
+    return head.encode("latin-1") + data
+
+
+def make_handler(latency_s: float):
+    """Return a connection handler for asyncio.start_server."""
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request = await _read_request(reader)
+                if request is None:
+                    break
+                method, path, body = request
+
+                if method == "POST" and path.rstrip("/").endswith("/chat/completions"):
+                    await asyncio.sleep(latency_s)
+                    writer.write(_response("200 OK", build_completion(json.loads(body or b"{}"))))
+                else:
+                    writer.write(_response("404 Not Found", {"error": {"message": f"no route {path}"}}))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    return handle
+
+
+async def serve(host: str, port: int, latency_s: float) -> asyncio.AbstractServer:
+    """Start the fake server and return it (caller owns its lifetime)."""
+    return await asyncio.start_server(make_handler(latency_s), host, port)
+
+
+async def _main(args) -> None:
+    server = await serve(args.host, args.port, args.latency_ms / 1000.0)
+    print(f"fake chat completions listening on http://{args.host}:{args.port}/v1 (latency {args.latency_ms} ms)")
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(_main(parse_args()))
+    except KeyboardInterrupt:
+        pass
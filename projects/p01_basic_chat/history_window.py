@@ -0,0 +1,170 @@
+"""
+Project 01 : Basic Chat (CLI) - Token-budgeted history window
+
+The stateful client resends the full `messages` list on every request, so
+prompt tokens (and latency) grow with the session. HistoryWindow keeps the
+same `messages` list the API expects, plus a parallel list of per-message
+token counts, and evicts the oldest turns once a configurable budget is
+exceeded.
+
+Rules:
+- The system message (index 0) is pinned and never evicted.
+- Each message is tokenized exactly once, when it is appended.
+- Eviction removes whole turns (user + following assistant) oldest first.
+- The newest user message is always kept, even if it alone exceeds the budget.
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+# Fixed per-message overhead of the chat format (role + separators).
+# Matches the approximation used in the OpenAI cookbook for chat models.
+MESSAGE_OVERHEAD_TOKENS = 4
+
+# Heuristic used when tiktoken is not installed (~4 characters per token).
+CHARS_PER_TOKEN = 4
+
+
+def _get_encoder(model: str):
+    """Return a tiktoken encoder for the model, or None if unavailable."""
+    # Imported here (not at module import) to keep CLI startup fast.
+    try:
+        import tiktoken
+    except ImportError:  # optional dependency: fall back to a character heuristic
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+
+
+class HistoryWindow:
+    """
+    Conversation memory bounded by a prompt token budget.
+
+    `messages` is a plain list of {"role", "content"} dicts and can be passed
+    directly to client.chat.completions.create.
+    """
+
+    def __init__(self, system_prompt: str, model: str, budget_tokens: Optional[int] = None):
+        """
+        Parameters:
+            system_prompt: Pinned system message content.
+            model: Model ID, used to pick the tokenizer.
+            budget_tokens: Maximum estimated prompt tokens kept in history
+                (None = unbounded, the original behavior).
+        """
+        self.budget_tokens = budget_tokens
+        self._encoder = _get_encoder(model)
+        self.tokenizer = "tiktoken" if self._encoder is not None else "heuristic"
+
+        self.messages: List[Dict[str, str]] = []
+        self._token_counts: List[int] = []
+        self.used_tokens = 0
+
+        # Eviction counters for /config
+        self.evicted_messages = 0
+        self.evicted_tokens = 0
+
+        self._push("system", system_prompt)
+
+    # --- Public API -------------------------------------------------
+
+    def append(self, role: str, content: str) -> int:
+        """
+        Append a message and enforce the budget.
+
+        Returns:
+            Number of messages evicted by this append.
+        """
+        self._push(role, content)
+        return self._enforce_budget()
+
+    def pop(self) -> Dict[str, str]:
+        """Remove and return the newest message (e.g. a user turn whose request failed)."""
+        if len(self.messages) <= 1:
+            raise IndexError("cannot pop the pinned system message")
+        self.used_tokens -= self._token_counts.pop()
+        return self.messages.pop()
+
+    def restore(self, newest_first: Iterable[Tuple[str, str]]) -> int:
+        """
+        Load saved (role, content) messages, given newest first (session resume).
+
+        Only the newest messages that fit the budget are consumed from the
+        iterable, so a long saved session is not read in full. Returns the
+        number of messages restored.
+        """
+        kept: List[Tuple[str, str, int]] = []
+        used = self.used_tokens
+        for role, content in newest_first:
+            n = self._count_tokens(content)
+            if self.budget_tokens is not None and kept and used + n > self.budget_tokens:
+                break
+            kept.append((role, content, n))
+            used += n
+
+        # Same invariant as eviction: never start with an orphan assistant reply.
+        while kept and kept[-1][0] == "assistant":
+            kept.pop()
+
+        for role, content, n in reversed(kept):
+            self.messages.append({"role": role, "content": content})
+            self._token_counts.append(n)
+            self.used_tokens += n
+        return len(kept)
+
+    def clear(self) -> None:
+        """Reset history to the pinned system message."""
+        del self.messages[1:]
+        del self._token_counts[1:]
+        self.used_tokens = self._token_counts[0]
+
+    def describe_usage(self) -> str:
+        """Human-readable budget usage, e.g. '812 / 4000 tokens (20.3%)'."""
+        if self.budget_tokens is None:
+            return f"{self.used_tokens} tokens (no budget)"
+        pct = 100.0 * self.used_tokens / self.budget_tokens if self.budget_tokens else 0.0
+        return f"{self.used_tokens} / {self.budget_tokens} tokens ({pct:.1f}%)"
+
+    # --- Internals --------------------------------------------------
+
+    def _count_tokens(self, content: str) -> int:
+        if self._encoder is not None:
+            n = len(self._encoder.encode(content))
+        else:
+            n = (len(content) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+        return n + MESSAGE_OVERHEAD_TOKENS
+
+    def _push(self, role: str, content: str) -> None:
+        n = self._count_tokens(content)
+        self.messages.append({"role": role, "content": content})
+        self._token_counts.append(n)
+        self.used_tokens += n
+
+    def _pop_oldest(self) -> None:
+        # Index 0 is the pinned system message.
+        self.messages.pop(1)
+        n = self._token_counts.pop(1)
+        self.used_tokens -= n
+        self.evicted_messages += 1
+        self.evicted_tokens += n
+
+    def _enforce_budget(self) -> int:
+        if self.budget_tokens is None:
+            return 0
+
+        evicted = 0
+        # Keep the system message and the newest message at minimum.
+        while self.used_tokens > self.budget_tokens and len(self.messages) > 2:
+            role = self.messages[1]["role"]
+            self._pop_oldest()
+            evicted += 1
+
+            # Evict a whole turn: a user message drags its assistant reply along,
+            # so the retained history never starts with an orphan assistant message.
+            if role == "user" and len(self.messages) > 2 and self.messages[1]["role"] == "assistant":
+                self._pop_oldest()
+                evicted += 1
+
+        return evicted
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+
+"""
+Project 01 : Basic Chat (CLI) - Load generator for chat_server.py
+
+Opens --connections TCP connections to a running chat_server.py (--listen mode)
+and drives --sessions independent conversations of --turns turns each. Every
+session is closed-loop: it sends its next turn only after the previous reply
+arrives, like a human at a terminal. A final /config exercises the shared
+slash-command path.
+
+Offline example (three terminals):
+    python projects/p01_basic_chat/fake_chat_server.py --port 8001 --latency-ms 200
+    OPENAI_API_KEY=fake python projects/p01_basic_chat/chat_server.py \\
+        --listen 127.0.0.1:8765 --base-url http://127.0.0.1:8001/v1 --max-concurrency 512
+    python projects/p01_basic_chat/load_chat_server.py --sessions 2000 --turns 3
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import time
+from typing import Any, Dict, List, Tuple
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Load generator for chat_server.py (TCP JSONL).")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--connections", type=int, default=8, help="TCP connections to share (default: 8)")
+    parser.add_argument("--sessions", type=int, default=1000, help="Concurrent conversations (default: 1000)")
+    parser.add_argument("--turns", type=int, default=3, help="Chat turns per session (default: 3)")
+    return parser.parse_args()
+
+
+def _percentile(sorted_values: List[float], p: float) -> float:
+    """Nearest-rank percentile (same method as the p04 summarizer)."""
+    if not sorted_values:
+        return 0.0
+    k = max(0, min(math.ceil((p / 100.0) * len(sorted_values)) - 1, len(sorted_values) - 1))
+    return float(sorted_values[k])
+
+
+class Connection:
+    """One TCP connection multiplexing many sessions; replies are matched by (session, id)."""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.pending: Dict[Tuple[str, int], "asyncio.Future[Dict[str, Any]]"] = {}
+        self.ids = itertools.count()
+        self.reader_task = asyncio.create_task(self._read_loop())
+
+    async def _read_loop(self) -> None:
+        while True:
+            line = await self.reader.readline()
+            if not line:
+                break
+            payload = json.loads(line)
+            fut = self.pending.pop((payload.get("session"), payload.get("id")), None)
+            if fut is not None and not fut.done():
+                fut.set_result(payload)
+
+    async def request(self, session: str, text: str) -> Dict[str, Any]:
+        request_id = next(self.ids)
+        fut = asyncio.get_running_loop().create_future()
+        self.pending[(session, request_id)] = fut
+        self.writer.write((json.dumps({"session": session, "input": text, "id": request_id}) + "\n").encode("utf-8"))
+        await self.writer.drain()
+        return await fut
+
+
+async def run_session(conn: Connection, session: str, turns: int, latencies: List[float], outcomes: Dict[str, int]):
+    for t in range(turns):
+        start = time.perf_counter()
+        reply = await conn.request(session, f"turn {t} from {session}")
+        latencies.append(time.perf_counter() - start)
+        outcomes[reply.get("type", "unknown")] = outcomes.get(reply.get("type", "unknown"), 0) + 1
+
+    reply = await conn.request(session, "/config")
+    outcomes[reply.get("type", "unknown")] = outcomes.get(reply.get("type", "unknown"), 0) + 1
+    await conn.request(session, "/exit")
+
+
+async def _main(args) -> None:
+    conns = []
+    for _ in range(args.connections):
+        reader, writer = await asyncio.open_connection(args.host, args.port, limit=1 << 20)
+        conns.append(Connection(reader, writer))
+
+    latencies: List[float] = []
+    outcomes: Dict[str, int] = {}
+
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(
+            run_session(conns[i % len(conns)], f"load-{i}", args.turns, latencies, outcomes)
+            for i in range(args.sessions)
+        )
+    )
+    elapsed = time.perf_counter() - start
+
+    for conn in conns:
+        conn.writer.close()
+        conn.reader_task.cancel()
+
+    latencies.sort()
+    n = len(latencies)
+    print(f"sessions: {args.sessions} · turns/session: {args.turns} · connections: {args.connections}")
+    print(f"outcomes: {outcomes}")
+    print(f"elapsed: {elapsed:.2f}s · throughput: {n / elapsed:.1f} turns/s")
+    print(
+        f"turn latency ms: p50 {_percentile(latencies, 50) * 1000:.0f} · "
+        f"p95 {_percentile(latencies, 95) * 1000:.0f} · p99 {_percentile(latencies, 99) * 1000:.0f} · "
+        f"max {latencies[-1] * 1000 if n else 0:.0f}"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(_main(parse_args()))
@@ -0,0 +1,129 @@
+"""
+Project 01 : Basic Chat (CLI) - Prompt-cache telemetry
+
+The stateful client resends a growing, stable prefix (system prompt + earlier
+turns) on every request, so OpenAI's automatic prompt caching decides most of
+the input cost and part of the latency. The API reports the reused part as
+`usage.prompt_tokens_details.cached_tokens`.
+
+PromptCacheStats accumulates cached vs uncached prompt tokens per session and
+prices them with a small static table (same idea as the p04 benchmark):
+cached input tokens are billed at the discounted cached-input rate.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+
+@dataclass(frozen=True)
+class Pricing:
+    """
+    USD cost per 1M tokens for a model.
+    Rates are intentionally static to keep reports reproducible.
+    """
+    input_rate_per_million: float
+    cached_input_rate_per_million: float
+    output_rate_per_million: float
+
+
+# Estimates for educational comparison; unknown models are reported without cost.
+PRICING_TABLE: Dict[str, Pricing] = {
+    "gpt-4o-mini": Pricing(0.15, 0.075, 0.60),
+    "gpt-4o": Pricing(2.50, 1.25, 10.00),
+    "gpt-4.1": Pricing(2.00, 0.50, 8.00),
+    "gpt-4.1-mini": Pricing(0.40, 0.10, 1.60),
+    "gpt-4.1-nano": Pricing(0.10, 0.025, 0.40),
+}
+
+
+def get_pricing(model: str) -> Optional[Pricing]:
+    """Return pricing for a model, or None if it is not in the table."""
+    return PRICING_TABLE.get(model)
+
+
+@dataclass
+class TurnUsage:
+    """Prompt-cache view of one request's usage."""
+
+    prompt_tokens: int
+    cached_tokens: int
+    completion_tokens: int
+    cost_usd: Optional[float]
+    uncached_cost_usd: Optional[float]  # same request with no prompt caching
+
+    @property
+    def uncached_tokens(self) -> int:
+        return self.prompt_tokens - self.cached_tokens
+
+    @property
+    def hit_ratio(self) -> float:
+        return self.cached_tokens / self.prompt_tokens if self.prompt_tokens else 0.0
+
+    def describe(self) -> str:
+        """One-line summary for the turn footer and the session log."""
+        return (
+            f"prompt cache: {self.cached_tokens}/{self.prompt_tokens} input tokens cached "
+            f"({100.0 * self.hit_ratio:.1f}%) · cost: {_format_cost(self.cost_usd)}"
+            f"{_format_saved(self.cost_usd, self.uncached_cost_usd)}"
+        )
+
+
+class PromptCacheStats:
+    """Per-session totals of cached vs uncached prompt tokens and effective cost."""
+
+    def __init__(self, model: str):
+        self.model = model
+        self.pricing = get_pricing(model)
+
+        self.requests = 0
+        self.prompt_tokens = 0
+        self.cached_tokens = 0
+        self.completion_tokens = 0
+        self.cost_usd = 0.0
+        self.uncached_cost_usd = 0.0
+
+    def record(self, prompt_tokens: int, cached_tokens: int, completion_tokens: int) -> TurnUsage:
+        """Add one billed request to the session totals and return its turn view."""
+        cost = uncached_cost = None
+        if self.pricing is not None:
+            p = self.pricing
+            uncached_cost = (prompt_tokens * p.input_rate_per_million + completion_tokens * p.output_rate_per_million) / 1_000_000
+            cost = (
+                (prompt_tokens - cached_tokens) * p.input_rate_per_million
+                + cached_tokens * p.cached_input_rate_per_million
+                + completion_tokens * p.output_rate_per_million
+            ) / 1_000_000
+            self.cost_usd += cost
+            self.uncached_cost_usd += uncached_cost
+
+        self.requests += 1
+        self.prompt_tokens += prompt_tokens
+        self.cached_tokens += cached_tokens
+        self.completion_tokens += completion_tokens
+
+        return TurnUsage(prompt_tokens, cached_tokens, completion_tokens, cost, uncached_cost)
+
+    @property
+    def hit_ratio(self) -> float:
+        return self.cached_tokens / self.prompt_tokens if self.prompt_tokens else 0.0
+
+    def describe(self) -> str:
+        """One-line session summary, for /config and the exit summary."""
+        cost = self.cost_usd if self.pricing is not None else None
+        uncached = self.uncached_cost_usd if self.pricing is not None else None
+        return (
+            f"requests: {self.requests} · input tokens: {self.prompt_tokens} "
+            f"({self.cached_tokens} cached, {self.prompt_tokens - self.cached_tokens} uncached) · "
+            f"hit ratio: {100.0 * self.hit_ratio:.1f}% · output tokens: {self.completion_tokens} · "
+            f"cost: {_format_cost(cost)}{_format_saved(cost, uncached)}"
+        )
+
+
+def _format_cost(cost: Optional[float]) -> str:
+    return f"${cost:.6f}" if cost is not None else "n/a (model not in pricing table)"
+
+
+def _format_saved(cost: Optional[float], uncached: Optional[float]) -> str:
+    if cost is None or uncached is None or uncached <= cost:
+        return ""
+    return f" (saved ${uncached - cost:.6f})"
@@ -0,0 +1,289 @@
+"""
+Project 01 : Basic Chat (CLI) - Deterministic response cache
+
+Scripted regression runs with `--temperature 0` resend identical message lists
+again and again. ResponseCache stores completions keyed by a stable hash of
+(model, messages, temperature, top_p, max_tokens) so repeated turns skip the
+network entirely.
+
+Two tiers:
+- memory: an LRU of the most recent entries (OrderedDict)
+- disk:   one JSON file per entry under `cache_dir`, evicted least recently
+          used first once the directory exceeds `max_disk_bytes`
+
+Only temperature-0 requests are cached; anything else bypasses the cache,
+because a sampled completion is not a valid answer for the next identical call.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+DEFAULT_CACHE_DIR = os.path.join(".cache", "project01-responses")
+DEFAULT_MEMORY_ENTRIES = 256
+DEFAULT_MAX_DISK_MB = 64
+
+
+@dataclass
+class ChatResult:
+    """Normalized completion result, from the API or from the cache."""
+
+    text: str
+    finish_reason: Optional[str]
+    prompt_tokens: int
+    completion_tokens: int
+    total_tokens: int
+    cache_hit: Optional[str] = None  # None (network), "memory" or "disk"
+    cached_tokens: int = 0  # usage.prompt_tokens_details.cached_tokens (server-side prompt cache)
+
+
+def make_cache_key(
+    model: str,
+    messages: List[Dict[str, str]],
+    temperature: float,
+    top_p: float,
+    max_tokens: Optional[int],
+) -> str:
+    """Stable SHA-256 of the request parameters that determine the output."""
+    payload = {
+        "model": model,
+        "messages": messages,
+        "temperature": temperature,
+        "top_p": top_p,
+        "max_tokens": max_tokens,
+    }
+    canonical = json.dumps(payload, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Two-tier (memory LRU + size-bounded disk) cache of chat completions."""
+
+    def __init__(
+        self,
+        cache_dir: str = DEFAULT_CACHE_DIR,
+        memory_entries: int = DEFAULT_MEMORY_ENTRIES,
+        max_disk_bytes: int = DEFAULT_MAX_DISK_MB * 1024 * 1024,
+    ):
+        self.cache_dir = cache_dir
+        self.memory_entries = memory_entries
+        self.max_disk_bytes = max_disk_bytes
+
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # key -> file size, ordered least recently used first
+        self._disk_index: "OrderedDict[str, int]" = OrderedDict()
+        self.disk_bytes = 0
+
+        # Counters for /config
+        self.hits_memory = 0
+        self.hits_disk = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.evictions = 0
+
+        # get/put may be called from batch worker threads (basic_chat.py --batch)
+        self._lock = threading.Lock()
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load_disk_index()
+
+    # --- Public API -------------------------------------------------
+
+    def get(self, key: str) -> Optional[ChatResult]:
+        with self._lock:
+            return self._get(key)
+
+    def put(self, key: str, result: ChatResult) -> None:
+        with self._lock:
+            self._put(key, result)
+
+    def record_bypass(self) -> None:
+        """Count a request that skipped the cache (temperature != 0)."""
+        with self._lock:
+            self.bypassed += 1
+
+    def describe(self) -> str:
+        """One-line summary of cache counters, for /config and exit summaries."""
+        lookups = self.hits_memory + self.hits_disk + self.misses
+        hit_rate = 100.0 * (self.hits_memory + self.hits_disk) / lookups if lookups else 0.0
+        return (
+            f"hits: {self.hits_memory} memory / {self.hits_disk} disk · misses: {self.misses} · "
+            f"hit rate: {hit_rate:.1f}% · bypassed (temperature != 0): {self.bypassed} · "
+            f"disk: {len(self._disk_index)} entries, {self.disk_bytes / 1024:.1f} KiB "
+            f"(evicted {self.evictions})"
+        )
+
+    # --- Internals --------------------------------------------------
+
+    def _get(self, key: str) -> Optional[ChatResult]:
+        entry = self._memory.get(key)
+        if entry is not None:
+            self._memory.move_to_end(key)
+            self.hits_memory += 1
+            return ChatResult(**{**entry, "cache_hit": "memory"})
+
+        if key in self._disk_index:
+            path = self._path(key)
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    entry = json.load(f)
+            except (OSError, ValueError):
+                self._forget_disk(key)
+            else:
+                # Refresh recency on disk (mtime) and in the index.
+                os.utime(path, None)
+                self._disk_index.move_to_end(key)
+                self._remember(key, entry)
+                self.hits_disk += 1
+                return ChatResult(**{**entry, "cache_hit": "disk"})
+
+        self.misses += 1
+        return None
+
+    def _put(self, key: str, result: ChatResult) -> None:
+        entry = asdict(result)
+        entry["cache_hit"] = None
+        self._remember(key, entry)
+
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        data = json.dumps(entry, ensure_ascii=False)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+        size = os.path.getsize(path)
+        self.disk_bytes += size - self._disk_index.pop(key, 0)
+        self._disk_index[key] = size
+        self._evict_disk()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def _remember(self, key: str, entry: Dict[str, Any]) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _load_disk_index(self) -> None:
+        found = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith(".json"):
+                    continue
+                st = os.stat(os.path.join(root, name))
+                found.append((st.st_mtime, name[: -len(".json")], st.st_size))
+        for _, key, size in sorted(found):
+            self._disk_index[key] = size
+            self.disk_bytes += size
+        self._evict_disk()
+
+    def _forget_disk(self, key: str) -> None:
+        self.disk_bytes -= self._disk_index.pop(key, 0)
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def _evict_disk(self) -> None:
+        while self.disk_bytes > self.max_disk_bytes and self._disk_index:
+            oldest = next(iter(self._disk_index))
+            self._forget_disk(oldest)
+            self._memory.pop(oldest, None)
+            self.evictions += 1
+
+
+def add_cache_args(parser):
+    """Register the opt-in response cache flags (used by basic_chat.py and basic_chat_stateful.py)."""
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Cache temperature-0 responses (memory LRU + disk) and reuse them for identical requests.",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=DEFAULT_CACHE_DIR,
+        help=f"Directory of the on-disk cache tier (default: {DEFAULT_CACHE_DIR})",
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=float,
+        default=DEFAULT_MAX_DISK_MB,
+        help=f"Size limit of the on-disk cache tier in MB (default: {DEFAULT_MAX_DISK_MB})",
+    )
+    parser.add_argument(
+        "--cache-memory-entries",
+        type=int,
+        default=DEFAULT_MEMORY_ENTRIES,
+        help=f"Entries kept in the in-memory LRU tier (default: {DEFAULT_MEMORY_ENTRIES})",
+    )
+
+
+def init_response_cache(args):
+    """Build the response cache if --cache is set, else return None."""
+    if not args.cache:
+        return None
+    return ResponseCache(
+        cache_dir=args.cache_dir,
+        memory_entries=args.cache_memory_entries,
+        max_disk_bytes=int(args.cache_max_mb * 1024 * 1024),
+    )
+
+
+def cached_chat_completion(
+    get_client: Callable[[], Any],
+    cache: Optional[ResponseCache],
+    *,
+    model: str,
+    messages: List[Dict[str, str]],
+    temperature: float,
+    top_p: float,
+    max_tokens: Optional[int],
+) -> ChatResult:
+    """
+    Call client.chat.completions.create, consulting the cache first when enabled.
+
+    The cache is only used for temperature-0 requests; other calls go straight
+    to the API (counted as `bypassed`). `get_client` is only called on a miss,
+    so a hit needs neither the SDK nor an API key.
+    """
+    key = None
+    if cache is not None:
+        if temperature == 0:
+            key = make_cache_key(model, messages, temperature, top_p, max_tokens)
+            hit = cache.get(key)
+            if hit is not None:
+                return hit
+        else:
+            cache.record_bypass()
+
+    completion = get_client().chat.completions.create(
+        model=model,
+        messages=messages,
+        temperature=temperature,
+        top_p=top_p,
+        max_tokens=max_tokens,
+    )
+
+    choice = completion.choices[0]
+    usage = completion.usage
+    details = usage.prompt_tokens_details if usage else None
+    result = ChatResult(
+        text=choice.message.content or "",
+        finish_reason=choice.finish_reason,
+        prompt_tokens=usage.prompt_tokens if usage else 0,
+        completion_tokens=usage.completion_tokens if usage else 0,
+        total_tokens=usage.total_tokens if usage else 0,
+        cached_tokens=(details.cached_tokens or 0) if details else 0,
+    )
+
+    if key is not None:
+        cache.put(key, result)
+    return result
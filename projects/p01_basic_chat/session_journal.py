@@ -0,0 +1,231 @@
+"""
+Project 01 : Basic Chat (CLI) - Append-only session journal
+
+The text log in logs/ is for humans and cannot be reloaded. The journal is a
+compact binary file that `basic_chat_stateful.py --resume SESSION` can rebuild
+`messages` from after a crash or a normal exit.
+
+File layout (little-endian):
+
+    header:  b"P01J" | version (uint8)
+    record:  length (uint32) | type (uint8) | payload (UTF-8, `length` bytes) | length (uint32)
+
+The first record is always the SYSTEM prompt. A CLEAR record marks /clear:
+everything before it (except the system prompt) is dead. The trailing copy of
+the length lets a reader walk the file backwards from the end, so resuming
+only touches the records after the last CLEAR (and, with a history budget,
+only the newest ones that fit), without decoding JSON or scanning the whole
+file. Writes are a single unbuffered os-level append per call, so a crash can
+at worst leave one torn record at the tail, which is detected and truncated.
+"""
+
+import mmap
+import os
+import secrets
+import struct
+from datetime import datetime
+from typing import Iterator, List, Optional, Tuple
+
+MAGIC = b"P01J"
+VERSION = 1
+FILE_HEADER = MAGIC + bytes([VERSION])
+
+REC_SYSTEM = 1
+REC_USER = 2
+REC_ASSISTANT = 3
+REC_CLEAR = 4
+
+ROLE_BY_TYPE = {REC_SYSTEM: "system", REC_USER: "user", REC_ASSISTANT: "assistant"}
+TYPE_BY_ROLE = {role: rec_type for rec_type, role in ROLE_BY_TYPE.items()}
+
+_HEAD = struct.Struct("<IB")
+_TAIL = struct.Struct("<I")
+RECORD_OVERHEAD = _HEAD.size + _TAIL.size
+
+DEFAULT_SESSION_DIR = os.path.join("logs", "sessions")
+JOURNAL_SUFFIX = ".journal"
+
+
+def new_session_id() -> str:
+    """
+    Timestamped session ID, matching the text log naming.
+
+    The random suffix keeps two sessions started in the same second from
+    appending to the same journal.
+    """
+    return f"project01-stateful-{datetime.now().strftime('%Y%m%d-%H%M%S')}-{secrets.token_hex(3)}"
+
+
+def resolve_journal_path(session: str, session_dir: str = DEFAULT_SESSION_DIR) -> str:
+    """Accept a session ID or a path to a .journal file."""
+    if session.endswith(JOURNAL_SUFFIX) or os.sep in session:
+        return session
+    return os.path.join(session_dir, session + JOURNAL_SUFFIX)
+
+
+def encode_record(rec_type: int, content: str = "") -> bytes:
+    payload = content.encode("utf-8")
+    return _HEAD.pack(len(payload), rec_type) + payload + _TAIL.pack(len(payload))
+
+
+class JournalError(ValueError):
+    """Raised when a file is not a readable session journal."""
+
+
+class SessionJournal:
+    """Append-only writer for one session journal."""
+
+    def __init__(self, path: str, system_prompt: Optional[str] = None):
+        """
+        Open (or create) a journal for appending.
+
+        A new journal needs `system_prompt`; an existing one is reopened as is,
+        after truncating a torn record left by a crash.
+        """
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            reader = JournalReader(path)
+            end = reader.valid_end
+            reader.close()
+            if end < os.path.getsize(path):
+                os.truncate(path, end)
+            self._fd = os.open(path, os.O_WRONLY | os.O_APPEND)
+        else:
+            if system_prompt is None:
+                raise JournalError(f"{path}: new journal needs a system prompt")
+            self._fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            os.write(self._fd, FILE_HEADER + encode_record(REC_SYSTEM, system_prompt))
+
+    def append(self, role: str, content: str) -> None:
+        self._write(encode_record(TYPE_BY_ROLE[role], content))
+
+    def append_turn(self, user_text: str, assistant_text: str) -> None:
+        """Record a completed turn in one write (an unanswered user message is never journaled)."""
+        self._write(encode_record(REC_USER, user_text) + encode_record(REC_ASSISTANT, assistant_text))
+
+    def clear(self) -> None:
+        self._write(encode_record(REC_CLEAR))
+
+    def close(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def _write(self, data: bytes) -> None:
+        # O_APPEND + one write per call: no userspace buffer to lose on a crash.
+        os.write(self._fd, data)
+
+
+class JournalReader:
+    """Memory-mapped reader that walks records backwards from the end."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < len(FILE_HEADER) + RECORD_OVERHEAD:
+                raise JournalError(f"{path}: too short to be a session journal")
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._mm[: len(MAGIC)] != MAGIC:
+            raise JournalError(f"{path}: not a session journal (bad magic)")
+        if self._mm[len(MAGIC)] != VERSION:
+            raise JournalError(f"{path}: unsupported journal version {self._mm[len(MAGIC)]}")
+
+        self._first = len(FILE_HEADER)
+        length, rec_type = _HEAD.unpack_from(self._mm, self._first)
+        if rec_type != REC_SYSTEM:
+            raise JournalError(f"{path}: first record is not the system prompt")
+        self._after_system = self._first + _HEAD.size + length + _TAIL.size
+        if self._after_system > size:
+            self._mm.close()
+            raise JournalError(f"{path}: truncated system prompt record")
+        self.valid_end = self._find_valid_end()
+
+    def close(self) -> None:
+        self._mm.close()
+
+    @property
+    def system_prompt(self) -> str:
+        return self._payload(self._first)
+
+    def iter_live_reversed(self) -> Iterator[Tuple[str, str]]:
+        """
+        Yield (role, content) of the live messages, newest first.
+
+        Stops at the most recent CLEAR. Payloads are decoded only when the
+        caller pulls them, so a budgeted resume never touches older records.
+        """
+        pos = self.valid_end
+        while pos > self._after_system:
+            (length,) = _TAIL.unpack_from(self._mm, pos - _TAIL.size)
+            start = pos - _TAIL.size - length - _HEAD.size
+            _, rec_type = _HEAD.unpack_from(self._mm, start)
+            if rec_type == REC_CLEAR:
+                return
+            if rec_type in (REC_USER, REC_ASSISTANT):
+                yield ROLE_BY_TYPE[rec_type], self._payload(start)
+            pos = start
+
+    def _payload(self, start: int) -> str:
+        length, _ = _HEAD.unpack_from(self._mm, start)
+        begin = start + _HEAD.size
+        return self._mm[begin : begin + length].decode("utf-8")
+
+    def _record_ok(self, start: int, end: int) -> bool:
+        if start < self._after_system or end - start < RECORD_OVERHEAD:
+            return False
+        length, rec_type = _HEAD.unpack_from(self._mm, start)
+        (tail,) = _TAIL.unpack_from(self._mm, end - _TAIL.size)
+        return length == tail and start + RECORD_OVERHEAD + length == end and rec_type in (
+            REC_USER,
+            REC_ASSISTANT,
+            REC_CLEAR,
+        )
+
+    def _find_valid_end(self) -> int:
+        size = len(self._mm)
+        if size == self._after_system:
+            return size
+
+        # Fast path: the last record is intact (the normal case).
+        (length,) = _TAIL.unpack_from(self._mm, size - _TAIL.size)
+        start = size - RECORD_OVERHEAD - length
+        if self._record_ok(start, size):
+            return size
+
+        # Torn tail after a crash: find the end of the last complete record.
+        pos = self._after_system
+        while pos + RECORD_OVERHEAD <= size:
+            length, _ = _HEAD.unpack_from(self._mm, pos)
+            end = pos + RECORD_OVERHEAD + length
+            if end > size or not self._record_ok(pos, end):
+                break
+            pos = end
+        return pos
+
+
+def load_session(path: str, history_factory) -> Tuple[object, int]:
+    """
+    Rebuild a HistoryWindow from a journal.
+
+    `history_factory(system_prompt)` returns an empty HistoryWindow; its
+    budget (if any) limits how many of the newest messages are decoded.
+    Returns (history, restored_message_count).
+    """
+    reader = JournalReader(path)
+    try:
+        history = history_factory(reader.system_prompt)
+        restored = history.restore(reader.iter_live_reversed())
+    finally:
+        reader.close()
+    return history, restored
+
+
+def list_sessions(session_dir: str = DEFAULT_SESSION_DIR) -> List[str]:
+    """Session IDs available for --resume, oldest first."""
+    if not os.path.isdir(session_dir):
+        return []
+    return sorted(name[: -len(JOURNAL_SUFFIX)] for name in os.listdir(session_dir) if name.endswith(JOURNAL_SUFFIX))
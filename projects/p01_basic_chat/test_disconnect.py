@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+
+"""
+Project 01 : Basic Chat (CLI) - Manual test: client disconnects mid-turn
+
+This file is NOT part of the project deliverables.
+It exists only to manually verify that chat_server.py survives a client that
+goes away while its turn is still waiting on the model:
+- the failed reply does not kill the worker silently: the session is closed
+  and unregistered, and turns queued behind it get SESSION_CLOSED
+- drain() still returns (no turn is left un-acknowledged)
+- the same session id can be used again afterwards
+
+Runs offline against an in-process fake upstream (no API key needed):
+    python projects/p01_basic_chat/test_disconnect.py
+"""
+
+import asyncio
+import json
+import socket
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+if __package__:
+    from .chat_server import ChatServer, serve_socket
+else:  # run as a script: python projects/p01_basic_chat/test_disconnect.py
+    from chat_server import ChatServer, serve_socket
+
+UPSTREAM_DELAY_S = 0.3
+
+
+class FakeCompletions:
+    """Async stand-in for client.chat.completions with a fixed latency."""
+
+    async def create(self, **kwargs):
+        await asyncio.sleep(UPSTREAM_DELAY_S)
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content="pong"), finish_reason="stop")],
+            usage=SimpleNamespace(prompt_tokens=10, completion_tokens=1, total_tokens=11),
+        )
+
+
+def make_server() -> ChatServer:
+    args = SimpleNamespace(
+        model="gpt-4o-mini",
+        temperature=0.7,
+        top_p=1.0,
+        max_tokens=None,
+        history_budget=None,
+        max_concurrency=8,
+        session_queue=4,
+        idle_timeout=60.0,
+    )
+    return ChatServer(args, SimpleNamespace(chat=SimpleNamespace(completions=FakeCompletions())))
+
+
+async def check_failed_reply() -> None:
+    print("=== TEST 1: reply raises (client gone) ===")
+    server = make_server()
+    received: List[Dict[str, Any]] = []
+
+    async def gone(payload: Dict[str, Any]) -> None:
+        raise ConnectionResetError("client disconnected")
+
+    async def alive(payload: Dict[str, Any]) -> None:
+        received.append(payload)
+
+    await server.submit(json.dumps({"session": "s1", "input": "hello", "id": 1}), gone)
+    await server.submit(json.dumps({"session": "s1", "input": "queued", "id": 2}), alive)
+    await asyncio.wait_for(server.drain(), timeout=5)
+
+    print("queued turn got:", received)
+    assert received and received[0]["error"] == "SESSION_CLOSED", received
+    assert "s1" not in server.sessions, "dead session must be unregistered"
+    assert server.stats.errors == 1
+
+    received.clear()
+    await server.submit(json.dumps({"session": "s1", "input": "again", "id": 3}), alive)
+    await asyncio.wait_for(server.drain(), timeout=5)
+    print("reopened session got:", received)
+    assert received and received[0]["type"] == "reply", received
+    await server.close()
+
+
+async def check_tcp_disconnect() -> None:
+    print("\n=== TEST 2: TCP client disconnects mid-turn ===")
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+
+    server = make_server()
+    serving = asyncio.create_task(serve_socket(server, "127.0.0.1", port))
+    await asyncio.sleep(0.1)
+
+    # Send a turn and hang up before the fake upstream answers.
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(b'{"session": "s2", "input": "hello", "id": 1}\n')
+    await writer.drain()
+    writer.close()
+    await writer.wait_closed()
+
+    await asyncio.sleep(UPSTREAM_DELAY_S * 2)
+    await asyncio.wait_for(server.drain(), timeout=5)
+    print("sessions after disconnect:", list(server.sessions), "· errors:", server.stats.errors)
+
+    # The session must still be usable from a new connection.
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(b'{"session": "s2", "input": "still there?", "id": 2}\n')
+    await writer.drain()
+    reply = json.loads(await asyncio.wait_for(reader.readline(), timeout=5))
+    print("new connection got:", reply)
+    assert reply["type"] == "reply" and reply["id"] == 2, reply
+    writer.close()
+    await writer.wait_closed()
+
+    serving.cancel()
+    await asyncio.gather(serving, return_exceptions=True)
+    await server.close()
+    print(server.describe_stats())
+
+
+async def main() -> None:
+    await check_failed_reply()
+    await check_tcp_disconnect()
+    print("\nOK")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Project 02 - Streaming Chat Client - Renderer benchmark
+
+Measures rendering throughput (tokens/s) of:
+
+- per-delta:  print(delta, end="", flush=True)  (the original loop)
+- coalesced:  renderer.CoalescingRenderer
+
+for two sinks:
+
+- file: stdout redirected to a file (not a TTY, renderer fully buffered)
+- pty:  a pseudo-terminal drained by a reader thread (TTY, frame budget)
+
+Deltas are synthetic and written back to back, so this isolates the cost of
+rendering from the network. No API calls are made.
+"""
+
+import argparse
+import io
+import os
+import pty
+import tempfile
+import threading
+import time
+
+if __package__:
+    from .renderer import DEFAULT_FRAME_INTERVAL, CoalescingRenderer
+else:  # run as a script: python projects/p02_streaming_chat/bench_renderer.py
+    from renderer import DEFAULT_FRAME_INTERVAL, CoalescingRenderer
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark per-delta printing vs the coalescing renderer.")
+    parser.add_argument("--tokens", type=int, default=50_000, help="Deltas per run (default: 50000)")
+    parser.add_argument("--frame-ms", type=float, default=DEFAULT_FRAME_INTERVAL * 1000, help="Renderer frame budget")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement; the best is reported (default: 3)")
+    return parser.parse_args()
+
+
+def make_deltas(n: int):
+    words = "streaming lets the client render tokens as soon as they are generated".split()
+    return [" " + words[i % len(words)] for i in range(n)]
+
+
+def render_per_delta(out, deltas) -> int:
+    for delta in deltas:
+        print(delta, end="", flush=True, file=out)
+    return len(deltas)
+
+
+def render_coalesced(out, deltas, frame_interval: float) -> int:
+    renderer = CoalescingRenderer(out, frame_interval=frame_interval)
+    for delta in deltas:
+        renderer.write(delta)
+    renderer.close()
+    return renderer.frames
+
+
+def _best_tokens_per_s(fn, n: int, repeat: int):
+    best, frames = 0.0, 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        frames = fn()
+        elapsed = time.perf_counter() - start
+        best = max(best, n / elapsed)
+    return best, frames
+
+
+def bench_file(deltas, frame_interval, repeat):
+    with tempfile.TemporaryFile("w+", encoding="utf-8") as raw:
+        # Same buffering as a redirected sys.stdout.
+        out = io.TextIOWrapper(io.BufferedWriter(io.FileIO(os.dup(raw.fileno()), "w")), encoding="utf-8")
+        per_delta = _best_tokens_per_s(lambda: render_per_delta(out, deltas), len(deltas), repeat)
+        coalesced = _best_tokens_per_s(lambda: render_coalesced(out, deltas, frame_interval), len(deltas), repeat)
+        out.close()
+    return per_delta, coalesced
+
+
+def bench_pty(deltas, frame_interval, repeat):
+    master, slave = pty.openpty()
+    stop = threading.Event()
+
+    def drain():
+        while not stop.is_set():
+            try:
+                if not os.read(master, 65536):
+                    break
+            except OSError:
+                break
+
+    reader = threading.Thread(target=drain, daemon=True)
+    reader.start()
+    out = open(slave, "w", encoding="utf-8", closefd=False)
+    try:
+        assert out.isatty()
+        per_delta = _best_tokens_per_s(lambda: render_per_delta(out, deltas), len(deltas), repeat)
+        coalesced = _best_tokens_per_s(lambda: render_coalesced(out, deltas, frame_interval), len(deltas), repeat)
+    finally:
+        out.close()
+        stop.set()
+        os.close(slave)
+        os.close(master)
+    return per_delta, coalesced
+
+
+def main():
+    args = parse_args()
+    deltas = make_deltas(args.tokens)
+    frame_interval = args.frame_ms / 1000.0
+
+    print(f"{args.tokens} deltas · frame budget {args.frame_ms:.0f} ms · best of {args.repeat}")
+    for sink, bench in (("file", bench_file), ("pty", bench_pty)):
+        (pd_rate, pd_writes), (co_rate, co_frames) = bench(deltas, frame_interval, args.repeat)
+        print(
+            f"  {sink:<5} per-delta: {pd_rate:>12,.0f} tokens/s ({pd_writes} flushes) · "
+            f"coalesced: {co_rate:>12,.0f} tokens/s ({co_frames} frames) · {co_rate / pd_rate:.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
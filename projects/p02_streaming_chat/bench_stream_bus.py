@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Project 02 - Streaming Chat Client - Stream bus benchmark
+
+Publishes --deltas synthetic deltas (yielding to the event loop every
+--batch deltas, like a network read loop) to:
+
+- no subscribers (baseline)
+- one fast subscriber
+- one fast + one slow subscriber (sleeps --slow-ms per event)
+
+and reports the publisher throughput, what each subscriber received or
+dropped, and the peak backlog. The same scenario with one unbounded
+asyncio.Queue per subscriber is shown for comparison: it loses nothing but
+its backlog (memory) grows with the slow consumer.
+"""
+
+import argparse
+import asyncio
+import time
+
+if __package__:
+    from .stream_bus import DEFAULT_CAPACITY, StreamBus
+else:  # run as a script: python projects/p02_streaming_chat/bench_stream_bus.py
+    from stream_bus import DEFAULT_CAPACITY, StreamBus
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the fan-out stream bus with slow subscribers.")
+    parser.add_argument("--deltas", type=int, default=200_000, help="Deltas published (default: 200000)")
+    parser.add_argument("--batch", type=int, default=16, help="Deltas per event-loop yield (default: 16)")
+    parser.add_argument("--capacity", type=int, default=DEFAULT_CAPACITY, help="Bus ring capacity")
+    parser.add_argument("--slow-ms", type=float, default=1.0, help="Per-event delay of the slow subscriber (default: 1)")
+    return parser.parse_args()
+
+
+async def run_bus(args, subscribers: int, slow: bool):
+    bus = StreamBus(capacity=args.capacity)
+    subs = [bus.subscribe(f"fast-{i}") for i in range(subscribers)]
+    if slow:
+        subs.append(bus.subscribe("slow"))
+    peak = {"lag": 0}
+
+    async def consume(sub):
+        async for event in sub:
+            if sub.name == "slow":
+                await asyncio.sleep(args.slow_ms / 1000.0)
+
+    tasks = [asyncio.create_task(consume(s)) for s in subs]
+    start = time.perf_counter()
+    for i in range(args.deltas):
+        bus.publish_delta(0, "tok")
+        if i % args.batch == 0:
+            peak["lag"] = max([peak["lag"]] + [min(s.lag, bus.capacity) for s in subs])
+            await asyncio.sleep(0)
+    elapsed = time.perf_counter() - start
+    bus.close()
+    if tasks:
+        # Let subscribers drain what is left in the ring.
+        await asyncio.wait(tasks, timeout=args.capacity * args.slow_ms / 1000.0 + 1.0)
+    for t in tasks:
+        t.cancel()
+    return elapsed, subs, peak["lag"]
+
+
+async def run_queues(args):
+    queues = {"fast": asyncio.Queue(), "slow": asyncio.Queue()}
+    peak = 0
+
+    async def consume(name, q):
+        while True:
+            await q.get()
+            if name == "slow":
+                await asyncio.sleep(args.slow_ms / 1000.0)
+
+    tasks = [asyncio.create_task(consume(n, q)) for n, q in queues.items()]
+    start = time.perf_counter()
+    for i in range(args.deltas):
+        for q in queues.values():
+            q.put_nowait("tok")
+        if i % args.batch == 0:
+            peak = max(peak, queues["slow"].qsize())
+            await asyncio.sleep(0)
+    elapsed = time.perf_counter() - start
+    for t in tasks:
+        t.cancel()
+    return elapsed, peak
+
+
+async def main(args):
+    print(f"{args.deltas} deltas · ring capacity {args.capacity} · slow subscriber {args.slow_ms} ms/event")
+    for label, subscribers, slow in (("no subscribers", 0, False), ("1 fast", 1, False), ("1 fast + 1 slow", 1, True)):
+        elapsed, subs, peak = await run_bus(args, subscribers, slow)
+        detail = " · ".join(f"{s.name}: {s.delivered} delivered, {s.dropped} dropped" for s in subs) or "-"
+        print(
+            f"  bus    {label:<16} publish {args.deltas / elapsed:>10,.0f} deltas/s · "
+            f"peak backlog {peak} events · {detail}"
+        )
+    elapsed, peak = await run_queues(args)
+    print(
+        f"  queues {'1 fast + 1 slow':<16} publish {args.deltas / elapsed:>10,.0f} deltas/s · "
+        f"peak backlog {peak} events (unbounded)"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
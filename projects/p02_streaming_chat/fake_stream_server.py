@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Project 02 - Streaming Chat Client - Local fake streaming endpoint
+
+A tiny asyncio HTTP/1.1 server that answers POST /v1/chat/completions with a
+Server-Sent Events stream, the way the OpenAI SDK expects for stream=True:
+one `data: {chat.completion.chunk}` event per token, then `data: [DONE]`.
+With `stream_options: {"include_usage": true}` a final chunk with empty
+`choices` and a `usage` object is sent, like the real API.
+
+Timing is configurable (time to first token, then one token every
+--token-interval-ms), so latency, cancellation and concurrency can be tested
+offline. A client that disconnects mid-stream is counted as "aborted": the
+server stops generating, exactly what cancellation should cause.
+
+Mid-response disconnects can be injected with --drop-at: `--drop-at 20,15`
+makes the first stream die after 20 tokens and the second after 15 (the
+connection is aborted without the closing chunk). A continuation request,
+i.e. one ending with the partial assistant text and a "continue" user turn,
+streams the rest of the original reply, so resumed answers can be checked
+for seamless stitching.
+
+Usage:
+    python projects/p02_streaming_chat/fake_stream_server.py --port 8002 --ttft-ms 300 --token-interval-ms 20
+    OPENAI_API_KEY=fake OPENAI_BASE_URL=http://127.0.0.1:8002/v1 python projects/p02_streaming_chat/streaming_chat.py
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+from dataclasses import dataclass
+
+CHARS_PER_TOKEN = 4
+
+FILLER = (
+    "Streaming lets the client render tokens as soon as they are generated , "
+    "which improves perceived latency even when the total time is the same ."
+).split()
+
+
+class InjectedDisconnect(ConnectionResetError):
+    """A --drop-at disconnect (counted as dropped, not as a client abort)."""
+
+
+@dataclass
+class StreamConfig:
+    ttft_s: float = 0.3
+    token_interval_s: float = 0.02
+    reply_tokens: int = 60
+    slow_start_rate: float = 0.0  # fraction of streams with a slow first token
+    slow_start_s: float = 2.0
+    drop_at: tuple = ()  # token offsets at which the 1st, 2nd, ... stream is dropped
+
+
+@dataclass
+class ServerStats:
+    streams_started: int = 0
+    streams_completed: int = 0
+    streams_aborted: int = 0
+    streams_dropped: int = 0
+    tokens_sent: int = 0
+
+    def describe(self) -> str:
+        return (
+            f"streams: {self.streams_started} started · {self.streams_completed} completed · "
+            f"{self.streams_aborted} aborted by client · {self.streams_dropped} dropped (injected) · "
+            f"tokens sent: {self.tokens_sent}"
+        )
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Local fake streaming Chat Completions endpoint.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8002)
+    parser.add_argument("--ttft-ms", type=float, default=300.0, help="Delay before the first token (default: 300)")
+    parser.add_argument("--token-interval-ms", type=float, default=20.0, help="Delay between tokens (default: 20)")
+    parser.add_argument("--reply-tokens", type=int, default=60, help="Tokens per reply (default: 60)")
+    parser.add_argument(
+        "--slow-start-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of streams whose first token is delayed by --slow-start-ms (tail latency, default: 0)",
+    )
+    parser.add_argument("--slow-start-ms", type=float, default=2000.0, help="Extra first-token delay of slow starts")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for reproducible slow starts")
+    parser.add_argument(
+        "--drop-at",
+        type=str,
+        default="",
+        help="Comma-separated token offsets: the Nth stream is disconnected after the Nth offset (e.g. 20,15)",
+    )
+    return parser.parse_args()
+
+
+def _estimate_tokens(text: str) -> int:
+    return max(1, (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN)
+
+
+def build_reply_tokens(body: dict, reply_tokens: int) -> list:
+    """
+    Deterministic reply: echo of the last user message, padded with filler words.
+
+    For a continuation request (last messages: partial assistant text, then a
+    user turn), the reply to the first user message is rebuilt and only the
+    part after the partial text is returned.
+    """
+    messages = body.get("messages", [])
+    if len(messages) >= 3 and messages[-2].get("role") == "assistant" and messages[-1].get("role") == "user":
+        partial = messages[-2].get("content", "") or ""
+        original = {**body, "messages": [m for m in messages[:-2]], "max_tokens": None}
+        full = build_reply_tokens(original, reply_tokens)
+        sent = 0
+        for i, token in enumerate(full):
+            if sent >= len(partial):
+                return full[i:]
+            sent += len(token)
+        return []
+
+    last_user = next((m.get("content", "") for m in reversed(messages) if m.get("role") == "user"), "")
+    words = ["echo:"] + last_user.split()
+    i = 0
+    while len(words) < reply_tokens:
+        words.append(FILLER[i % len(FILLER)])
+        i += 1
+    words = words[:reply_tokens]
+    max_tokens = body.get("max_tokens") or body.get("max_completion_tokens")
+    if max_tokens:
+        words = words[:max_tokens]
+    return [w if j == 0 else " " + w for j, w in enumerate(words)]
+
+
+def _chunk(completion_id: str, model: str, delta: dict, finish_reason=None, usage=None, choices=True) -> bytes:
+    payload = {
+        "id": completion_id,
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}] if choices else [],
+    }
+    if usage is not None:
+        payload["usage"] = usage
+    return _sse(f"data: {json.dumps(payload)}\n\n")
+
+
+def _sse(event: str) -> bytes:
+    """Wrap one SSE event in an HTTP/1.1 chunked-encoding frame."""
+    data = event.encode("utf-8")
+    return f"{len(data):X}\r\n".encode("latin-1") + data + b"\r\n"
+
+
+async def _read_request(reader: asyncio.StreamReader):
+    """Read one HTTP request. Returns (method, path, body_bytes) or None on EOF."""
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except (asyncio.IncompleteReadError, ConnectionError):
+        return None
+
+    lines = head.decode("latin-1").split("\r\n")
+    method, path, _ = lines[0].split(" ", 2)
+    headers = {}
+    for line in lines[1:]:
+        if ":" in line:
+            k, v = line.split(":", 1)
+            headers[k.strip().lower()] = v.strip()
+
+    length = int(headers.get("content-length", "0") or 0)
+    body = await reader.readexactly(length) if length else b""
+    return method, path, body
+
+
+def _json_response(status: str, payload: dict) -> bytes:
+    data = json.dumps(payload).encode("utf-8")
+    head = (
+        f"HTTP/1.1 {status}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(data)}\r\n"
+        "Connection: keep-alive\r\n"
+        "\r\n"
+    )
+    return head.encode("latin-1") + data
+
+
+async def write_stream(writer: asyncio.StreamWriter, body: dict, config: StreamConfig, stats: ServerStats) -> None:
+    """Send one streamed completion. Raises ConnectionError if the client goes away."""
+    completion_id = f"chatcmpl-fake-{uuid.uuid4().hex[:12]}"
+    model = body.get("model", "fake-model")
+    tokens = build_reply_tokens(body, config.reply_tokens)
+    include_usage = bool((body.get("stream_options") or {}).get("include_usage"))
+
+    writer.write(
+        b"HTTP/1.1 200 OK\r\n"
+        b"Content-Type: text/event-stream\r\n"
+        b"Transfer-Encoding: chunked\r\n"
+        b"Connection: keep-alive\r\n"
+        b"\r\n"
+    )
+    await writer.drain()
+    drop_after = config.drop_at[stats.streams_started] if stats.streams_started < len(config.drop_at) else None
+    stats.streams_started += 1
+
+    ttft = config.ttft_s
+    if config.slow_start_rate and random.random() < config.slow_start_rate:
+        ttft += config.slow_start_s
+    await asyncio.sleep(ttft)
+    writer.write(_chunk(completion_id, model, {"role": "assistant", "content": ""}))
+    for i, token in enumerate(tokens):
+        if i == drop_after:
+            stats.streams_dropped += 1
+            writer.transport.abort()  # no closing chunk: the client sees a broken stream
+            raise InjectedDisconnect(f"dropped after {i} tokens")
+        if i:
+            await asyncio.sleep(config.token_interval_s)
+        writer.write(_chunk(completion_id, model, {"content": token}))
+        await writer.drain()
+        if writer.is_closing() or writer.transport.is_closing():
+            raise ConnectionResetError("client closed the stream")
+        stats.tokens_sent += 1
+
+    writer.write(_chunk(completion_id, model, {}, finish_reason="stop"))
+    if include_usage:
+        prompt_tokens = sum(_estimate_tokens(m.get("content", "") or "") + 4 for m in body.get("messages", []))
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": len(tokens),
+            "total_tokens": prompt_tokens + len(tokens),
+        }
+        writer.write(_chunk(completion_id, model, {}, usage=usage, choices=False))
+    writer.write(_sse("data: [DONE]\n\n"))
+    writer.write(b"0\r\n\r\n")
+    await writer.drain()
+    stats.streams_completed += 1
+
+
+def make_handler(config: StreamConfig, stats: ServerStats):
+    """Return a connection handler for asyncio.start_server."""
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request = await _read_request(reader)
+                if request is None:
+                    break
+                method, path, body = request
+
+                if method == "POST" and path.rstrip("/").endswith("/chat/completions"):
+                    payload = json.loads(body or b"{}")
+                    if payload.get("stream"):
+                        try:
+                            await write_stream(writer, payload, config, stats)
+                        except InjectedDisconnect:
+                            break
+                        except ConnectionError:
+                            stats.streams_aborted += 1
+                            break
+                        continue
+                    await asyncio.sleep(config.ttft_s)
+                    tokens = build_reply_tokens(payload, config.reply_tokens)
+                    writer.write(
+                        _json_response(
+                            "200 OK",
+                            {
+                                "id": f"chatcmpl-fake-{uuid.uuid4().hex[:12]}",
+                                "object": "chat.completion",
+                                "created": int(time.time()),
+                                "model": payload.get("model", "fake-model"),
+                                "choices": [
+                                    {
+                                        "index": 0,
+                                        "message": {"role": "assistant", "content": "".join(tokens)},
+                                        "finish_reason": "stop",
+                                    }
+                                ],
+                            },
+                        )
+                    )
+                else:
+                    writer.write(_json_response("404 Not Found", {"error": {"message": f"no route {path}"}}))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    return handle
+
+
+async def serve(host: str, port: int, config: StreamConfig, stats: ServerStats) -> asyncio.AbstractServer:
+    """Start the fake server and return it (caller owns its lifetime)."""
+    return await asyncio.start_server(make_handler(config, stats), host, port)
+
+
+async def _main(args) -> None:
+    config = StreamConfig(
+        ttft_s=args.ttft_ms / 1000.0,
+        token_interval_s=args.token_interval_ms / 1000.0,
+        reply_tokens=args.reply_tokens,
+        slow_start_rate=args.slow_start_rate,
+        slow_start_s=args.slow_start_ms / 1000.0,
+        drop_at=tuple(int(x) for x in args.drop_at.split(",") if x.strip()),
+    )
+    if args.seed is not None:
+        random.seed(args.seed)
+    stats = ServerStats()
+    server = await serve(args.host, args.port, config, stats)
+    print(
+        f"fake streaming chat completions on http://{args.host}:{args.port}/v1 "
+        f"(ttft {args.ttft_ms} ms, {args.token_interval_ms} ms/token, {args.reply_tokens} tokens)",
+        flush=True,
+    )
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        print(f"[fake_stream_server] {stats.describe()}", flush=True)
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(_main(parse_args()))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,294 @@
+"""
+Project 02 - Streaming Chat Client - Load-test mode
+
+`streaming_chat.py --load CORPUS` replays a prompt corpus through the
+streaming engine instead of reading prompts from the terminal:
+
+- closed loop (default): `--concurrency N` streams are kept in flight; each
+  one starts as soon as a previous one finishes
+- open loop: `--rate R` requests/s arrive on a fixed schedule (or Poisson
+  with `--arrival poisson`), whether or not earlier ones have finished, so
+  queueing shows up in the latencies instead of slowing the test down
+
+Each request becomes one JSONL record with the fields of the p04 run record
+(model, prompt_id, trial_index, is_warmup, latency_e2e_ms, token usage,
+estimated cost, status...), so `p04_benchmark.summarize` can aggregate it,
+plus the streaming timings: TTFT, inter-token gap p50/p95/p99, max stall and
+decode tokens/s. Records are appended as requests finish.
+
+Corpus formats:
+- .jsonl: one object per line with "prompt" (or "messages"), optional "id"
+- anything else: one prompt per non-empty line
+"""
+
+import asyncio
+import json
+import os
+import random
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+if __package__:
+    from .stream_engine import StreamEngine, StreamRequest, StreamResult
+    from .stream_metrics import SessionMetrics, timing_from_result
+else:  # run as a script: python projects/p02_streaming_chat/load_test.py
+    from stream_engine import StreamEngine, StreamRequest, StreamResult
+    from stream_metrics import SessionMetrics, timing_from_result
+
+# USD per 1M tokens (input, output). Static estimates for comparability,
+# like the p04 pricing table; unknown models are costed at 0.
+PRICING_LABEL = "p02_static_estimates"
+PRICING = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4.1": (2.00, 8.00),
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1-nano": (0.10, 0.40),
+}
+
+
+@dataclass
+class LoadPrompt:
+    prompt_id: str
+    messages: List[Dict[str, str]]
+
+
+@dataclass
+class LoadItem:
+    """One planned request: which prompt, and when it is due (open loop)."""
+
+    index: int
+    prompt: LoadPrompt
+    trial_index: int
+    is_warmup: bool
+    due_s: Optional[float] = None  # seconds after the test start; None = closed loop
+
+
+def load_corpus(path: str, build_messages) -> List[LoadPrompt]:
+    """Read prompts; plain prompts go through build_messages (adds the system prompt)."""
+    prompts: List[LoadPrompt] = []
+    with open(path, "r", encoding="utf-8") as f:
+        for n, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            if path.endswith(".jsonl"):
+                obj = json.loads(line)
+                messages = obj.get("messages") or build_messages(obj["prompt"])
+                prompts.append(LoadPrompt(str(obj.get("id", f"load_{n}")), messages))
+            else:
+                prompts.append(LoadPrompt(f"load_{n}", build_messages(line)))
+    if not prompts:
+        raise ValueError(f"empty load corpus: {path}")
+    return prompts
+
+
+def build_plan(prompts: List[LoadPrompt], requests: int, warmup: int, rate: Optional[float], arrival: str, seed: int) -> List[LoadItem]:
+    """
+    Warm-up requests first, then `requests` measured ones, cycling through the
+    corpus. With a rate, each item gets its arrival time.
+    """
+    rng = random.Random(seed)
+    plan: List[LoadItem] = []
+    t = 0.0
+    for i in range(warmup + requests):
+        prompt = prompts[i % len(prompts)]
+        is_warmup = i < warmup
+        trial = 0 if is_warmup else (i - warmup) // len(prompts) + 1
+        due = None
+        if rate:
+            due = t
+            t += rng.expovariate(rate) if arrival == "poisson" else 1.0 / rate
+        plan.append(LoadItem(i, prompt, trial, is_warmup, due))
+    return plan
+
+
+def make_record(item: LoadItem, result: StreamResult, args, latency_s: float, start_lag_s: float, in_flight: int) -> dict:
+    """p04-compatible run record, plus streaming timings."""
+    timing = timing_from_result(result)
+    input_tokens = result.prompt_tokens or 0
+    output_tokens = result.completion_tokens if result.completion_tokens is not None else len(result.delta_times)
+    input_rate, output_rate = PRICING.get(args.model, (0.0, 0.0))
+    now = datetime.now(timezone.utc)
+    ok = result.status in ("ok", "stopped")
+
+    return {
+        # Identity
+        "run_id": f"{now.strftime('%Y%m%dT%H%M%SZ')}_{args.model}_{item.prompt.prompt_id}_t{item.trial_index}_"
+        f"{'w1' if item.is_warmup else 'w0'}_{uuid.uuid4().hex[:8]}",
+        "timestamp_utc": now.isoformat().replace("+00:00", "Z"),
+        "model": args.model,
+        "prompt_id": item.prompt.prompt_id,
+        "trial_index": item.trial_index,
+        "is_warmup": item.is_warmup,
+        # Request params
+        "temperature": float(args.temperature),
+        "top_p": float(args.top_p),
+        "max_tokens": int(args.max_tokens),
+        # Latency (open loop: from the scheduled arrival, so queueing is included)
+        "latency_e2e_ms": int(round(latency_s * 1000)),
+        # Token usage
+        "input_tokens": int(input_tokens),
+        "output_tokens": int(output_tokens),
+        "total_tokens": int(input_tokens + output_tokens),
+        # Pricing / Cost
+        "pricing_label": PRICING_LABEL,
+        "input_rate_per_million": input_rate,
+        "output_rate_per_million": output_rate,
+        "estimated_cost_usd": (input_tokens * input_rate + output_tokens * output_rate) / 1_000_000,
+        # Output observables
+        "output_chars": len(result.text),
+        "format_ok": ok and bool(result.text.strip()),
+        # Error handling
+        "status": "ok" if ok else "error",
+        "error_type": None if ok else "stream_error",
+        "error_message": (result.error or "")[:300] or None,
+        # Streaming
+        "stream_status": result.status,
+        "finish_reason": result.finish_reason,
+        "ttft_ms": round(timing.ttft_ms, 3) if timing.ttft_ms is not None else None,
+        "itl_p50_ms": round(timing.gap_percentile(50), 3),
+        "itl_p95_ms": round(timing.gap_percentile(95), 3),
+        "itl_p99_ms": round(timing.gap_percentile(99), 3),
+        "max_stall_ms": round(timing.max_stall_ms, 3),
+        "decode_tokens_per_s": round(timing.decode_tokens_per_s, 2) if timing.decode_tokens_per_s is not None else None,
+        "reconnects": result.reconnects,
+        "hedged": result.hedged,
+        # Load shape
+        "load_mode": "open" if args.rate else "closed",
+        "concurrency": None if args.rate else args.concurrency,
+        "rate_rps": args.rate,
+        "start_lag_ms": round(start_lag_s * 1000, 3),
+        "in_flight_at_start": in_flight,
+    }
+
+
+class LoadRunner:
+    """Drives a plan through a StreamEngine and appends records to a JSONL file."""
+
+    def __init__(self, engine: StreamEngine, args, out, metrics: SessionMetrics):
+        self.engine = engine
+        self.args = args
+        self.out = out
+        self.metrics = metrics
+        self.in_flight = 0
+        self.completed = 0
+        self.errors = 0
+        self.cancelled = 0
+
+    async def run(self, plan: List[LoadItem]) -> None:
+        self.t0 = time.perf_counter()
+        if self.args.rate:
+            tasks = []
+            try:
+                for item in plan:
+                    delay = self.t0 + item.due_s - time.perf_counter()
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                    tasks.append(asyncio.ensure_future(self._one(item, self.t0 + item.due_s)))
+                await asyncio.gather(*tasks)
+            except asyncio.CancelledError:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+            return
+
+        queue = list(reversed(plan))
+
+        async def worker():
+            # Streams absorb cancellation (status "cancelled"), so the worker stops on that.
+            while queue and await self._one(queue.pop(), None):
+                pass
+
+        workers = [asyncio.ensure_future(worker()) for _ in range(max(1, self.args.concurrency))]
+        try:
+            await asyncio.gather(*workers)
+        except asyncio.CancelledError:
+            for w in workers:
+                w.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+    async def _one(self, item: LoadItem, due: Optional[float]) -> bool:
+        """Run one planned request and write its record; False if it was cancelled."""
+        start = time.perf_counter()
+        origin = due if due is not None else start
+        request = StreamRequest(
+            model=self.args.model,
+            messages=item.prompt.messages,
+            temperature=self.args.temperature,
+            top_p=self.args.top_p,
+            max_tokens=self.args.max_tokens,
+            stop=self.args.stop_conditions,
+        )
+        in_flight = self.in_flight
+        self.in_flight += 1
+        try:
+            result = await self.engine.stream_one(request, item.index)
+        finally:
+            self.in_flight -= 1
+
+        if result.status == "cancelled":
+            self.cancelled += 1  # interrupted, not a measurement
+            return False
+        latency = time.perf_counter() - origin
+        if due is not None:
+            # Queueing before the request was sent counts towards TTFT as well.
+            result.ttft_s = result.ttft_s + (start - due) if result.ttft_s is not None else None
+            result.delta_times = [t + (start - due) for t in result.delta_times]
+        result.total_s = latency
+
+        record = make_record(item, result, self.args, latency, start - origin, in_flight)
+        self.out.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.out.flush()
+        self.completed += 1
+        if result.status == "error":
+            self.errors += 1
+        elif not item.is_warmup:
+            self.metrics.record(self.args.model, result.status, timing_from_result(result))
+            self.metrics.record_usage(self.args.model, result)
+        return True
+
+
+def run_load(args, build_messages, client_factory, log_dir: str) -> None:
+    """Entry point of --load: run the plan, write JSONL, print a summary."""
+    prompts = load_corpus(args.load, build_messages)
+    requests = args.requests or len(prompts)
+    plan = build_plan(prompts, requests, args.warmup, args.rate, args.arrival, args.seed)
+
+    path = args.load_out
+    if path is None:
+        ts = datetime.now().strftime("%Y%m%d-%H%M%S")
+        path = os.path.join(log_dir, f"project02-load-{ts}.jsonl")
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    shape = (
+        f"open loop · {args.rate:g} req/s ({args.arrival})" if args.rate else f"closed loop · concurrency {args.concurrency}"
+    )
+    print(f"Load test: {len(prompts)} prompts · {requests} requests + {args.warmup} warm-up · {shape}")
+
+    engine = StreamEngine(
+        client_factory,
+        concurrency=args.concurrency,
+        hedge_after_s=args.hedge_after_ms / 1000.0 if args.hedge_after_ms is not None else None,
+        max_reconnects=max(0, args.max_reconnects),
+        reconnect_backoff_s=args.reconnect_backoff_ms / 1000.0,
+    )
+    engine.client  # import the SDK and build the client now, not on the clock of the first request
+    metrics = SessionMetrics()
+    with open(path, "a", encoding="utf-8") as out:
+        runner = LoadRunner(engine, args, out, metrics)
+        try:
+            engine.run_cancellable(runner.run(plan))
+        finally:
+            engine.close()
+    elapsed = time.perf_counter() - runner.t0
+
+    print(
+        f"{runner.completed} requests in {elapsed:.2f}s ({runner.completed / elapsed:.2f} req/s) · "
+        f"{runner.errors} errors · {runner.cancelled} cancelled"
+    )
+    print(metrics.format_stats())
+    print(f"[load results → {path}]")
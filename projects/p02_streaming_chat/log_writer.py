@@ -0,0 +1,146 @@
+"""
+Project 02 - Streaming Chat Client - Background log writer
+
+The original `log_line` formatted a timestamp, wrote and flushed the file for
+every line on the interactive thread. BackgroundLogWriter moves that work off
+the hot path:
+
+- the caller only appends (timestamp, label, content) to a deque
+- a daemon thread wakes every `flush_interval` seconds, formats all pending
+  records and writes + flushes them as one batch
+- the queue is bounded: if the writer falls behind, callers block instead of
+  growing memory without limit
+- close() drains every pending record before closing the file
+- if a write fails (disk full, closed file), the writer stops, reports the
+  error once on stderr and later lines are dropped: logging never blocks or
+  crashes the chat loop
+"""
+
+import atexit
+import sys
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Deque, List, Optional, TextIO, Tuple
+
+DEFAULT_FLUSH_INTERVAL = 0.5
+DEFAULT_MAX_QUEUE = 10_000
+
+Record = Tuple[float, str, str]
+
+
+class BackgroundLogWriter:
+    """Queue-backed log sink that writes timestamped lines from a background thread."""
+
+    def __init__(
+        self,
+        f: TextIO,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        max_queue: int = DEFAULT_MAX_QUEUE,
+    ):
+        """
+        Parameters:
+            f: Open text file to write to (owned by the writer from now on).
+            flush_interval: Maximum seconds between file flushes.
+            max_queue: Maximum pending records before log() blocks.
+        """
+        self.f = f
+        self.path = getattr(f, "name", None)
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+
+        # deque.append/popleft are atomic, so the hot path takes no lock.
+        self._pending: Deque[Record] = deque()
+        self._wakeup = threading.Event()
+        self._drained = threading.Condition()
+        self._closed = False
+        self.error: Optional[Exception] = None  # set when a write failed; logging has stopped
+        self.dropped = 0  # records lost after that error
+
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+        # Guarantee a drain even if the caller never reaches close()
+        atexit.register(self.close)
+
+    def log(self, label: str, content: str) -> None:
+        """Enqueue one line. Timestamp is captured now, formatting happens later."""
+        if self._closed:
+            return
+        if len(self._pending) >= self.max_queue:
+            # Backpressure: wait for the writer instead of growing without bound,
+            # but only while it is alive to drain the queue.
+            self._wakeup.set()
+            with self._drained:
+                while len(self._pending) >= self.max_queue and self._thread.is_alive():
+                    self._drained.wait(self.flush_interval)
+        if self.error is not None or not self._thread.is_alive():
+            self.dropped += 1
+            return
+        self._pending.append((time.time(), label, content))
+
+    def close(self) -> None:
+        """Drain pending records, flush and close the file. Safe to call twice."""
+        if self._closed:
+            return
+        self._closed = True
+        self._wakeup.set()
+        self._thread.join()
+        try:
+            self.f.close()
+        except (OSError, ValueError):
+            if self.error is None:
+                raise
+            # The same failure was already reported by the writer thread.
+        atexit.unregister(self.close)
+
+    # --- Background thread ------------------------------------------
+
+    def _run(self) -> None:
+        try:
+            self._loop()
+        except (OSError, ValueError) as exc:  # disk full, file closed underneath us
+            self.error = exc
+            self.dropped += len(self._pending)
+            self._pending.clear()
+            print(f"[log-writer] logging to {self.path} stopped: {exc}", file=sys.stderr)
+        finally:
+            # Never leave log() waiting on a writer that is gone.
+            with self._drained:
+                self._drained.notify_all()
+
+    def _loop(self) -> None:
+        while True:
+            # Sleep until the flush interval elapses (or close()/backpressure wakes us).
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+
+            self._write_pending()
+            self.f.flush()
+
+            if self._closed:
+                # close() sets the flag before waking us: one last drain.
+                self._write_pending()
+                self.f.flush()
+                return
+
+    def _write_pending(self) -> None:
+        batch: List[str] = []
+        pending = self._pending
+        while pending:
+            batch.append(_format(pending.popleft()))
+        if batch:
+            try:
+                self.f.write("".join(batch))
+            except (OSError, ValueError):
+                self.dropped += len(batch)
+                raise
+            with self._drained:
+                self._drained.notify_all()
+
+
+def _format(record: Record) -> str:
+    ts, label, content = record
+    stamp = datetime.fromtimestamp(ts).isoformat(timespec="seconds")
+    return f"[{stamp}] {label.upper()}: {content}\n"
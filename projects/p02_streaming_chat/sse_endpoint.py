@@ -0,0 +1,95 @@
+"""
+Project 02 - Streaming Chat Client - Local SSE endpoint
+
+Re-publishes the stream bus as Server-Sent Events, so another terminal or a
+browser can watch responses live:
+
+    curl -N http://127.0.0.1:8765/events
+
+Each connection is an independent bus subscriber. A client that reads too
+slowly falls behind in the ring buffer and receives a `lag` event with the
+number of skipped deltas; it never slows down the chat client itself.
+
+Events:
+    event: delta   data: {"turn": 0, "stream": 0, "text": "Hel"}
+    event: end     data: {"turn": 0}
+    event: lag     data: {"dropped": 118}
+
+The server runs on the StreamEngine event loop, which is only running while
+a response streams; connections opened between turns are served as soon as
+the next turn starts.
+"""
+
+import asyncio
+import json
+from typing import Set
+
+if __package__:
+    from .stream_bus import StreamBus
+else:  # run as a script: python projects/p02_streaming_chat/sse_endpoint.py
+    from stream_bus import StreamBus
+
+
+def _sse(event: str, payload: dict) -> bytes:
+    return f"event: {event}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n".encode("utf-8")
+
+
+class SSEEndpoint:
+    """Serves GET /events as an SSE feed of a StreamBus."""
+
+    def __init__(self, bus: StreamBus):
+        self.bus = bus
+        self.server = None
+        self.clients: Set[asyncio.Task] = set()
+        self.connections = 0
+
+    async def start(self, host: str, port: int) -> None:
+        self.server = await asyncio.start_server(self._handle, host, port)
+
+    async def close(self) -> None:
+        if self.server is not None:
+            self.server.close()
+        for task in list(self.clients):
+            task.cancel()
+        await asyncio.gather(*self.clients, return_exceptions=True)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        task = asyncio.current_task()
+        self.clients.add(task)
+        try:
+            try:
+                head = await reader.readuntil(b"\r\n\r\n")
+            except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                return
+            request_line = head.split(b"\r\n", 1)[0].decode("latin-1")
+            parts = request_line.split(" ")
+            if len(parts) < 2 or parts[0] != "GET" or parts[1].split("?", 1)[0] != "/events":
+                writer.write(b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\nConnection: close\r\n\r\n")
+                await writer.drain()
+                return
+
+            self.connections += 1
+            subscription = self.bus.subscribe(f"sse-{self.connections}")
+            writer.write(
+                b"HTTP/1.1 200 OK\r\n"
+                b"Content-Type: text/event-stream\r\n"
+                b"Cache-Control: no-cache\r\n"
+                b"Connection: close\r\n"
+                b"\r\n"
+            )
+            await writer.drain()
+
+            async for event in subscription:
+                if event.kind == "delta":
+                    writer.write(_sse("delta", {"turn": event.turn, "stream": event.stream, "text": event.text}))
+                elif event.kind == "end":
+                    writer.write(_sse("end", {"turn": event.turn}))
+                elif event.kind == "lag":
+                    writer.write(_sse("lag", {"dropped": int(event.text)}))
+                # Backpressure stays local: only this subscriber waits here.
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self.clients.discard(task)
+            writer.close()
@@ -0,0 +1,172 @@
+"""
+Project 02 - Streaming Chat Client - Client-side stop conditions
+
+`max_tokens` is the only limit the API enforces by itself. These conditions
+end a stream early from the client side; the HTTP response is closed at that
+moment, so the server stops generating and no further output tokens are
+billed.
+
+Per stream (checked on every content delta, see StopConditions):
+- stop strings / a regex: the text is cut right after the first match
+- max characters: the text is cut at the limit
+
+Per turn (StopSignal, shared by all streams of the turn):
+- max wall time since the turn started
+- a keypress while the response streams (terminal only)
+
+A stopped stream is reported with status "stopped" and a stop_reason
+("stop_string", "regex", "max_chars", "max_time" or "keypress").
+"""
+
+import os
+import re
+import sys
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
+from typing import Optional, Pattern, Set, Tuple
+
+# How far back (in characters) a regex is re-checked when a delta arrives, so
+# a match spanning several deltas is still found without rescanning the text.
+REGEX_LOOKBACK = 256
+
+
+@dataclass(frozen=True)
+class StopConditions:
+    """Text-based stop rules of a stream."""
+
+    stop_strings: Tuple[str, ...] = ()
+    stop_regex: Optional[Pattern] = None
+    max_chars: Optional[int] = None
+
+    @classmethod
+    def from_args(cls, stop_strings=None, stop_regex: Optional[str] = None, max_chars: Optional[int] = None):
+        """Build from CLI values; None if no rule is set."""
+        strings = tuple(s for s in (stop_strings or ()) if s)
+        if not strings and not stop_regex and not max_chars:
+            return None
+        return cls(strings, re.compile(stop_regex) if stop_regex else None, max_chars or None)
+
+    def after(self, prefix: str) -> "StopConditions":
+        """Rules for a continuation of `prefix` (the character budget is shared)."""
+        if self.max_chars is None:
+            return self
+        return replace(self, max_chars=max(0, self.max_chars - len(prefix)))
+
+    def matcher(self) -> "StopMatcher":
+        return StopMatcher(self)
+
+
+class StopMatcher:
+    """Incremental check of StopConditions over a stream's deltas."""
+
+    def __init__(self, conditions: StopConditions):
+        self.conditions = conditions
+        self.length = 0  # characters accepted so far
+        self._tail = ""  # end of the accepted text, for matches spanning deltas
+        longest = max((len(s) for s in conditions.stop_strings), default=1)
+        self._keep = max(longest - 1, REGEX_LOOKBACK if conditions.stop_regex is not None else 0)
+
+    def feed(self, delta: str) -> Tuple[str, Optional[str]]:
+        """
+        Accept one delta. Returns (text_to_keep, reason): the part of the delta
+        up to the end of the first match, and the stop reason (None to go on).
+        """
+        window = self._tail + delta
+        base = self.length - len(self._tail)  # offset of `window` in the whole text
+        cut: Optional[int] = None  # end of the kept text, as an offset into window
+        reason: Optional[str] = None
+
+        for s in self.conditions.stop_strings:
+            i = window.find(s, max(0, len(self._tail) - len(s) + 1))
+            if i >= 0 and (cut is None or i + len(s) < cut):
+                cut, reason = i + len(s), "stop_string"
+        if self.conditions.stop_regex is not None:
+            # Matches ending inside the old tail were already seen (and missed);
+            # skip past them one start at a time, so an overlapping match that
+            # ends in the new delta is still found.
+            m = self.conditions.stop_regex.search(window)
+            while m and m.end() <= len(self._tail):
+                m = self.conditions.stop_regex.search(window, m.start() + 1)
+            if m and (cut is None or m.end() < cut):
+                cut, reason = m.end(), "regex"
+        limit = self.conditions.max_chars
+        if limit is not None and base + len(window) >= limit and (cut is None or limit - base < cut):
+            cut, reason = limit - base, "max_chars"
+
+        if cut is not None:
+            delta = window[len(self._tail):max(cut, len(self._tail))]
+        self.length += len(delta)
+        self._tail = (self._tail + delta)[-self._keep:] if self._keep else ""
+        return delta, reason
+
+
+class StopSignal:
+    """
+    Turn-wide stop request. fire(reason) cancels every registered stream task;
+    the streams see `reason` and report "stopped" instead of "cancelled".
+    """
+
+    def __init__(self):
+        self.reason: Optional[str] = None
+        self._tasks: Set = set()
+
+    def register(self, task) -> None:
+        self._tasks.add(task)
+        if self.reason is not None:
+            task.cancel()  # the turn was stopped before this stream started
+
+    def unregister(self, task) -> None:
+        self._tasks.discard(task)
+
+    def fire(self, reason: str) -> None:
+        if self.reason is not None:
+            return
+        self.reason = reason
+        for task in list(self._tasks):
+            task.cancel()
+
+
+@contextmanager
+def turn_stop(loop, max_time_s: Optional[float] = None, on_keypress: bool = False, stream=None):
+    """
+    Arm a StopSignal for one turn on `loop`: a timer for max_time_s and, if
+    on_keypress and `stream` (stdin) is a terminal, a reader that fires on
+    any key. The terminal is put in cbreak mode meanwhile, so keys arrive
+    without Enter and Ctrl-C still works.
+    """
+    signal = StopSignal()
+    timer = loop.call_later(max_time_s, signal.fire, "max_time") if max_time_s else None
+    restore = _watch_keypress(loop, signal, stream or sys.stdin) if on_keypress else None
+    try:
+        yield signal
+    finally:
+        if timer is not None:
+            timer.cancel()
+        if restore is not None:
+            restore()
+
+
+def _watch_keypress(loop, signal: StopSignal, stream):
+    try:
+        import termios
+        import tty
+
+        fd = stream.fileno()
+        if not os.isatty(fd):
+            return None
+        saved = termios.tcgetattr(fd)
+    except (ImportError, AttributeError, OSError, ValueError):
+        return None  # not a terminal (pipe, Windows, test harness)
+
+    def on_key():
+        os.read(fd, 1024)  # consume the key so it does not reach the next prompt
+        signal.fire("keypress")
+
+    tty.setcbreak(fd)
+    loop.add_reader(fd, on_key)
+
+    def restore():
+        loop.remove_reader(fd)
+        termios.tcsetattr(fd, termios.TCSADRAIN, saved)
+
+    return restore
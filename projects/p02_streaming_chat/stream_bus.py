@@ -0,0 +1,126 @@
+"""
+Project 02 - Streaming Chat Client - Fan-out streaming bus
+
+Streamed deltas are published once into a bounded ring buffer and consumed
+by any number of independent subscribers (terminal renderer, incremental log,
+local SSE endpoint, ...), each at its own pace:
+
+- publish() is synchronous and O(1): it never waits for a subscriber, so a
+  slow consumer can not stall the upstream read
+- memory is bounded by the ring capacity, whatever the subscribers do
+- a subscriber that falls more than `capacity` events behind skips ahead to
+  the oldest retained event; the skipped events are counted in `dropped`
+  (lossy, like a live video feed) and reported with a "lag" event
+
+Everything runs on one asyncio event loop (the StreamEngine loop).
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import List, Optional
+
+DEFAULT_CAPACITY = 1024
+
+
+@dataclass
+class BusEvent:
+    """One published item. kind is "delta", "end" (turn finished) or "lag" (synthetic)."""
+
+    seq: int
+    turn: int
+    stream: int
+    kind: str
+    text: str = ""
+    t: float = 0.0  # time.perf_counter() at publish
+
+
+class StreamBus:
+    """Bounded single-producer, multi-consumer ring buffer of stream events."""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self.capacity = max(1, capacity)
+        self._ring: List[Optional[BusEvent]] = [None] * self.capacity
+        self.seq = 0  # sequence number of the next event
+        self.turn = 0
+        self.closed = False
+        self._changed: Optional[asyncio.Event] = None
+
+    def publish(self, stream: int, kind: str, text: str = "") -> BusEvent:
+        """Append an event, overwriting the oldest one when full. Never blocks."""
+        event = BusEvent(self.seq, self.turn, stream, kind, text, time.perf_counter())
+        self._ring[self.seq % self.capacity] = event
+        self.seq += 1
+        self._notify()
+        return event
+
+    def publish_delta(self, stream: int, text: str) -> None:
+        self.publish(stream, "delta", text)
+
+    def end_turn(self) -> None:
+        """Mark the end of the current turn (all of its streams are done)."""
+        self.publish(-1, "end")
+        self.turn += 1
+
+    def close(self) -> None:
+        self.closed = True
+        self._notify()
+
+    def subscribe(self, name: str, from_start: bool = False) -> "Subscription":
+        """New subscription, starting at the next published event (or the oldest retained one)."""
+        start = max(0, self.seq - self.capacity) if from_start else self.seq
+        return Subscription(self, name, start)
+
+    # --- Internals --------------------------------------------------
+
+    def _notify(self) -> None:
+        if self._changed is not None:
+            self._changed.set()
+            self._changed = None
+
+    async def _wait(self) -> None:
+        if self._changed is None:
+            self._changed = asyncio.Event()
+        await self._changed.wait()
+
+
+class Subscription:
+    """A subscriber's cursor into the bus. Iterate with `async for`."""
+
+    def __init__(self, bus: StreamBus, name: str, cursor: int):
+        self.bus = bus
+        self.name = name
+        self.cursor = cursor
+        self.delivered = 0
+        self.dropped = 0
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> BusEvent:
+        bus = self.bus
+        while self.cursor >= bus.seq:
+            if bus.closed:
+                raise StopAsyncIteration
+            await bus._wait()
+
+        oldest = bus.seq - bus.capacity
+        if self.cursor < oldest:
+            # Overrun: the ring wrapped past us. Skip ahead and say so.
+            skipped = oldest - self.cursor
+            self.dropped += skipped
+            self.cursor = oldest
+            return BusEvent(-1, bus.turn, -1, "lag", str(skipped), time.perf_counter())
+
+        event = bus._ring[self.cursor % bus.capacity]
+        self.cursor += 1
+        self.delivered += 1
+        return event
+
+    @property
+    def lag(self) -> int:
+        """Events published but not yet consumed."""
+        return self.bus.seq - self.cursor
+
+    def describe(self) -> str:
+        return f"{self.name}: delivered {self.delivered} · dropped {self.dropped} · lag {self.lag}"
@@ -0,0 +1,474 @@
+"""
+Project 02 - Streaming Chat Client - Async streaming engine
+
+Runs Chat Completions streams on AsyncOpenAI inside one persistent event loop,
+so that:
+
+- the in-flight stream can be cancelled (Ctrl-C) without leaving the CLI;
+  cancelling closes the HTTP response, so the server stops generating and no
+  further tokens are billed
+- several streams can run side by side (bounded by a semaphore)
+- optionally, a slow start is hedged: if no token arrives within a deadline,
+  an identical second request is started and whichever stream produces a
+  token first wins, the other is closed immediately
+- a stream that breaks mid-response is resumed: the delivered prefix is
+  kept, and after a backoff the model is asked to continue from it; the
+  continuation is stitched into the same delta callback
+- client-side stop conditions (stop_conditions.py) close a stream early,
+  when its text matches or the turn is stopped (time limit, keypress)
+
+Every stream keeps its own first-token (TTFT) and total latency, plus the
+arrival time of each content delta and the usage reported at the end of the
+stream (see stream_metrics.py).
+"""
+
+import asyncio
+import random
+import signal
+import time
+from dataclasses import dataclass, field, replace
+from typing import Awaitable, Callable, Dict, List, Optional
+
+if __package__:
+    from .stop_conditions import StopConditions, StopSignal
+else:  # run as a script: python projects/p02_streaming_chat/stream_engine.py
+    from stop_conditions import StopConditions, StopSignal
+
+# on_delta(stream_index, text) is called for every content delta, in order.
+DeltaCallback = Callable[[int, str], None]
+
+
+@dataclass
+class StreamResult:
+    """Outcome of one streamed completion."""
+
+    index: int
+    status: str = "ok"  # "ok", "stopped" (client-side stop condition), "cancelled" or "error"
+    text: str = ""
+    finish_reason: Optional[str] = None
+    ttft_s: Optional[float] = None  # None if no content arrived
+    total_s: float = 0.0
+    chunks: int = 0
+    error: Optional[str] = None
+    delta_times: List[float] = field(default_factory=list)  # seconds since request start
+    prompt_tokens: Optional[int] = None  # from the final usage chunk, if any
+    completion_tokens: Optional[int] = None
+    # Hedging (see hedged_stream_completion)
+    hedged: bool = False  # a second request was started
+    hedge_won: bool = False  # ... and produced the first token
+    extra_prompt_tokens: int = 0  # estimated tokens spent on the losing request
+    extra_completion_tokens: int = 0
+    # Resume after disconnects (see resumable_stream_completion)
+    retryable: bool = False  # the error was a dropped/failed connection
+    reconnects: int = 0
+    reconnect_delay_s: float = 0.0  # time from each disconnect to the continuation's first token
+    stop_reason: Optional[str] = None  # set when status == "stopped"
+
+    def describe_latency(self) -> str:
+        if self.ttft_s is not None:
+            return f"(first token: {self.ttft_s:.3f}s · total: {self.total_s:.3f}s)"
+        return f"(total: {self.total_s:.3f}s)"
+
+
+@dataclass
+class StreamRequest:
+    """Parameters of one streamed chat completion."""
+
+    model: str
+    messages: List[Dict[str, str]]
+    temperature: float = 0.7
+    top_p: float = 1.0
+    max_tokens: Optional[int] = None
+    include_usage: bool = True  # ask for a final usage chunk (stream_options)
+    extra: Dict = field(default_factory=dict)  # passed through to create()
+    stop: Optional[StopConditions] = None  # checked on every delta
+    stop_signal: Optional[StopSignal] = None  # turn-wide stop (time limit, keypress)
+
+
+async def stream_completion(client, request: StreamRequest, index: int = 0, on_delta: Optional[DeltaCallback] = None) -> StreamResult:
+    """
+    Stream one completion. Never raises for API errors or cancellation:
+    the outcome is reported in StreamResult.status.
+
+    When a stop condition fires, the text is cut at the match and the stream
+    is closed right away (status "stopped").
+    """
+    result = StreamResult(index=index)
+    parts: List[str] = []
+    stream = None
+    matcher = request.stop.matcher() if request.stop is not None else None
+    task = asyncio.current_task()
+    if request.stop_signal is not None:
+        request.stop_signal.register(task)
+    t0 = time.perf_counter()
+
+    try:
+        stream = await client.chat.completions.create(
+            model=request.model,
+            messages=request.messages,
+            temperature=request.temperature,
+            top_p=request.top_p,
+            max_tokens=request.max_tokens,
+            stream=True,
+            **({"stream_options": {"include_usage": True}} if request.include_usage else {}),
+            **request.extra,
+        )
+        async for chunk in stream:
+            result.chunks += 1
+            usage = getattr(chunk, "usage", None)
+            if usage is not None:
+                result.prompt_tokens = usage.prompt_tokens
+                result.completion_tokens = usage.completion_tokens
+            if not chunk.choices:  # the trailing usage chunk has no choices
+                continue
+            choice = chunk.choices[0]
+            delta = getattr(choice.delta, "content", None)
+            stop_reason = None
+            if delta and matcher is not None:
+                delta, stop_reason = matcher.feed(delta)
+            if delta:
+                now = time.perf_counter() - t0
+                if result.ttft_s is None:
+                    result.ttft_s = now
+                result.delta_times.append(now)
+                parts.append(delta)
+                if on_delta is not None:
+                    on_delta(index, delta)
+            if stop_reason is not None:
+                result.status = "stopped"
+                result.stop_reason = stop_reason
+                break
+            if choice.finish_reason:
+                result.finish_reason = choice.finish_reason
+    except asyncio.CancelledError:
+        if request.stop_signal is not None and request.stop_signal.reason is not None:
+            result.status = "stopped"
+            result.stop_reason = request.stop_signal.reason
+        else:
+            result.status = "cancelled"
+    except Exception as e:
+        result.status = "error"
+        result.error = str(e) or e.__class__.__name__
+        result.retryable = _is_connection_error(e)
+    finally:
+        if request.stop_signal is not None:
+            request.stop_signal.unregister(task)
+        if stream is not None:
+            # Closing the response tells the server to stop generating.
+            await stream.close()
+        result.total_s = time.perf_counter() - t0
+        result.text = "".join(parts)
+
+    return result
+
+
+def _is_connection_error(error: Exception) -> bool:
+    """True for transport failures (dropped connection, timeout), not for API errors."""
+    import httpx
+    import openai
+
+    return isinstance(error, (httpx.TransportError, openai.APIConnectionError))
+
+
+def _estimate_prompt_tokens(messages: List[Dict[str, str]]) -> int:
+    # ~4 characters per token plus per-message overhead (used only if usage is missing)
+    return sum((len(m.get("content") or "") + 3) // 4 + 4 for m in messages)
+
+
+async def hedged_stream_completion(
+    client,
+    request: StreamRequest,
+    index: int = 0,
+    on_delta: Optional[DeltaCallback] = None,
+    hedge_after_s: float = 1.0,
+) -> StreamResult:
+    """
+    Stream one completion, hedging a slow start.
+
+    If no content delta arrives within `hedge_after_s`, an identical request
+    is started. The first stream to produce a token wins and is the only one
+    forwarded to on_delta; the loser is cancelled (its HTTP response closed)
+    at that moment. Latencies of a winning hedge are measured from the
+    original request start, i.e. as the user experiences them.
+    """
+    tasks: Dict[str, asyncio.Future] = {}
+    winner: Optional[str] = None
+    first_token = asyncio.Event()
+
+    def forward(who: str) -> DeltaCallback:
+        def on_stream_delta(_index: int, delta: str) -> None:
+            nonlocal winner
+            if winner is None:
+                winner = who
+                first_token.set()
+                loser = tasks.get("hedge" if who == "primary" else "primary")
+                if loser is not None:
+                    loser.cancel()
+            if winner == who and on_delta is not None:
+                on_delta(index, delta)
+
+        return on_stream_delta
+
+    t0 = time.perf_counter()
+    hedge_delay = 0.0
+    tasks["primary"] = asyncio.ensure_future(stream_completion(client, request, index, forward("primary")))
+    try:
+        waiter = asyncio.ensure_future(first_token.wait())
+        done, _ = await asyncio.wait(
+            {tasks["primary"], waiter}, timeout=hedge_after_s, return_when=asyncio.FIRST_COMPLETED
+        )
+        waiter.cancel()
+        if not done:
+            hedge_delay = time.perf_counter() - t0
+            tasks["hedge"] = asyncio.ensure_future(stream_completion(client, request, index, forward("hedge")))
+        results = dict(zip(tasks, await asyncio.gather(*tasks.values())))
+    except asyncio.CancelledError:
+        for task in tasks.values():
+            task.cancel()
+        await asyncio.gather(*tasks.values(), return_exceptions=True)
+        results = {who: task.result() for who, task in tasks.items() if not task.cancelled()}
+        if "primary" not in results:
+            return StreamResult(index=index, status="cancelled", total_s=time.perf_counter() - t0)
+
+    if winner is None:
+        # No stream produced a token: report the first successful one, else the primary.
+        winner = next((who for who, r in results.items() if r.status == "ok"), "primary")
+    result = results[winner]
+
+    if winner == "hedge":
+        result.ttft_s = result.ttft_s + hedge_delay if result.ttft_s is not None else None
+        result.total_s += hedge_delay
+        result.delta_times = [t + hedge_delay for t in result.delta_times]
+
+    if "hedge" in results:
+        result.hedged = True
+        result.hedge_won = winner == "hedge"
+        loser = results["primary" if winner == "hedge" else "hedge"]
+        # The loser's prompt was billed too; its output up to cancellation as well.
+        result.extra_prompt_tokens = result.prompt_tokens or _estimate_prompt_tokens(request.messages)
+        result.extra_completion_tokens = loser.completion_tokens or len(loser.delta_times)
+
+    return result
+
+
+CONTINUE_PROMPT = (
+    "Your previous answer was cut off. Continue exactly where it stopped, "
+    "without repeating any text and without any preamble."
+)
+
+# Characters of a continuation buffered to detect (and drop) repeated text;
+# shorter matches are treated as coincidence, not repetition.
+STITCH_WINDOW = 48
+MIN_OVERLAP = 8
+
+
+def continuation_request(request: StreamRequest, partial: str) -> StreamRequest:
+    """Same request, plus the partial answer and an instruction to continue it."""
+    return replace(
+        request,
+        messages=request.messages
+        + [{"role": "assistant", "content": partial}, {"role": "user", "content": CONTINUE_PROMPT}],
+        stop=request.stop.after(partial) if request.stop is not None else None,
+    )
+
+
+def _overlap(prefix: str, continuation: str) -> int:
+    """Length of the longest suffix of `prefix` that `continuation` starts with (0 if < MIN_OVERLAP)."""
+    for n in range(min(len(prefix), len(continuation)), MIN_OVERLAP - 1, -1):
+        if prefix.endswith(continuation[:n]):
+            return n
+    return 0
+
+
+async def resumable_stream_completion(
+    stream_fn: Callable[..., Awaitable[StreamResult]],
+    request: StreamRequest,
+    index: int = 0,
+    on_delta: Optional[DeltaCallback] = None,
+    max_reconnects: int = 3,
+    backoff_s: float = 0.25,
+) -> StreamResult:
+    """
+    Run stream_fn(request, index, on_delta) and resume it after disconnects.
+
+    Text already delivered is kept. After an exponential backoff (with
+    jitter) a continuation request is sent (see continuation_request); if
+    the model repeats the end of the prefix, the repeated part is dropped
+    before it reaches on_delta, so the caller sees one seamless stream.
+    Cancellation and API errors are never retried.
+    """
+    t0 = time.perf_counter()
+    attempt = await stream_fn(request, index, on_delta)
+    merged = attempt
+    text = attempt.text
+
+    while merged.status == "error" and merged.retryable and merged.reconnects < max_reconnects:
+        if request.stop_signal is not None and request.stop_signal.reason is not None:
+            break  # the turn was stopped: keep what was received
+        failed_at = time.perf_counter()
+        try:
+            await asyncio.sleep(backoff_s * (2 ** merged.reconnects) * (0.5 + random.random()))
+        except asyncio.CancelledError:
+            merged.status = "cancelled"
+            break
+
+        # Buffer the start of the continuation until overlap can be judged.
+        pending: List[str] = []
+        stitched = {"open": False, "skipped": 0}
+
+        def release() -> None:
+            head = "".join(pending)
+            stitched["open"] = True
+            stitched["skipped"] = _overlap(text, head)
+            rest = head[stitched["skipped"]:]
+            if rest and on_delta is not None:
+                on_delta(index, rest)
+
+        def stitch(_index: int, delta: str) -> None:
+            if stitched["open"]:
+                if on_delta is not None:
+                    on_delta(index, delta)
+                return
+            pending.append(delta)
+            if sum(map(len, pending)) >= STITCH_WINDOW:
+                release()
+
+        next_request = continuation_request(request, text) if text else request
+        offset = time.perf_counter() - t0
+        attempt = await stream_fn(next_request, index, stitch)
+
+        if not stitched["open"] and pending:
+            release()  # short continuation: it never filled the stitch window
+
+        merged = _merge_attempts(merged, attempt, offset, stitched["skipped"])
+        merged.reconnects += 1
+        if attempt.ttft_s is not None:
+            merged.reconnect_delay_s += (t0 + offset + attempt.ttft_s) - failed_at
+        text = merged.text
+
+    merged.index = index
+    merged.total_s = time.perf_counter() - t0
+    return merged
+
+
+def _merge_attempts(first: StreamResult, attempt: StreamResult, offset: float, skipped: int) -> StreamResult:
+    """Stitch a continuation attempt (started `offset` s after the first) onto `first`."""
+    merged = StreamResult(
+        index=first.index,
+        status=attempt.status,
+        text=first.text + attempt.text[skipped:],
+        finish_reason=attempt.finish_reason,
+        ttft_s=first.ttft_s if first.ttft_s is not None else (
+            offset + attempt.ttft_s if attempt.ttft_s is not None else None
+        ),
+        chunks=first.chunks + attempt.chunks,
+        error=attempt.error,
+        delta_times=first.delta_times + [offset + t for t in attempt.delta_times],
+        retryable=attempt.retryable,
+        reconnects=first.reconnects,
+        reconnect_delay_s=first.reconnect_delay_s,
+        stop_reason=attempt.stop_reason,
+        hedged=first.hedged or attempt.hedged,
+        hedge_won=first.hedge_won or attempt.hedge_won,
+        extra_prompt_tokens=first.extra_prompt_tokens + attempt.extra_prompt_tokens,
+        extra_completion_tokens=first.extra_completion_tokens + attempt.extra_completion_tokens,
+    )
+    # Usage is only reported by streams that finish; continuation prompts are billed too.
+    if attempt.prompt_tokens is not None:
+        merged.prompt_tokens = (first.prompt_tokens or 0) + attempt.prompt_tokens
+        merged.completion_tokens = len(first.delta_times) + (attempt.completion_tokens or 0)
+    return merged
+
+
+class StreamEngine:
+    """
+    Owns an event loop and an AsyncOpenAI client for a synchronous CLI.
+
+    The CLI keeps its blocking input() loop; each turn is run to completion
+    on the engine's loop with run(), and Ctrl-C during a turn cancels only
+    that turn's streams.
+    """
+
+    def __init__(
+        self,
+        client_factory: Callable[[], object],
+        concurrency: int = 4,
+        hedge_after_s: Optional[float] = None,
+        max_reconnects: int = 0,
+        reconnect_backoff_s: float = 0.25,
+    ):
+        self._client_factory = client_factory
+        self._client = None
+        self.concurrency = max(1, concurrency)
+        self.hedge_after_s = hedge_after_s  # None disables hedging
+        self.max_reconnects = max_reconnects  # 0 disables resuming
+        self.reconnect_backoff_s = reconnect_backoff_s
+        self.loop = asyncio.new_event_loop()
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = self._client_factory()
+        return self._client
+
+    async def stream_many(self, requests: List[StreamRequest], on_delta: Optional[DeltaCallback] = None) -> List[StreamResult]:
+        """Run several streams concurrently (at most `concurrency` at once), results in input order."""
+        limit = asyncio.Semaphore(self.concurrency)
+
+        async def run(index: int, request: StreamRequest) -> StreamResult:
+            async with limit:
+                return await self.stream_one(request, index, on_delta)
+
+        tasks = [asyncio.ensure_future(run(i, r)) for i, r in enumerate(requests)]
+        try:
+            return list(await asyncio.gather(*tasks))
+        except asyncio.CancelledError:
+            # Streams still waiting on the semaphore never started.
+            results = []
+            for i, task in enumerate(tasks):
+                if task.done() and not task.cancelled():
+                    results.append(task.result())
+                else:
+                    results.append(StreamResult(index=i, status="cancelled"))
+            return results
+
+    async def stream_one(self, request: StreamRequest, index: int = 0, on_delta: Optional[DeltaCallback] = None) -> StreamResult:
+        """One stream with the engine's hedging and reconnect policy (no concurrency limit)."""
+        if self.max_reconnects > 0:
+            return await resumable_stream_completion(
+                self._stream_once, request, index, on_delta, self.max_reconnects, self.reconnect_backoff_s
+            )
+        return await self._stream_once(request, index, on_delta)
+
+    async def _stream_once(self, request: StreamRequest, index: int, on_delta: Optional[DeltaCallback]) -> StreamResult:
+        if self.hedge_after_s is not None:
+            return await hedged_stream_completion(self.client, request, index, on_delta, self.hedge_after_s)
+        return await stream_completion(self.client, request, index, on_delta)
+
+    def run(self, requests: List[StreamRequest], on_delta: Optional[DeltaCallback] = None) -> List[StreamResult]:
+        """Run a turn on the engine loop; SIGINT cancels the turn instead of raising KeyboardInterrupt."""
+        return self.run_cancellable(self.stream_many(requests, on_delta))
+
+    def run_cancellable(self, coro):
+        """Run a coroutine on the engine loop; SIGINT cancels it (it must handle CancelledError)."""
+        task = self.loop.create_task(coro)
+        try:
+            self.loop.add_signal_handler(signal.SIGINT, task.cancel)
+            installed = True
+        except (NotImplementedError, RuntimeError):  # e.g. Windows, or not the main thread
+            installed = False
+
+        try:
+            return self.loop.run_until_complete(task)
+        except KeyboardInterrupt:
+            task.cancel()
+            return self.loop.run_until_complete(task)
+        finally:
+            if installed:
+                self.loop.remove_signal_handler(signal.SIGINT)
+
+    def close(self) -> None:
+        if self._client is not None:
+            self.loop.run_until_complete(self._client.close())
+        self.loop.run_until_complete(self.loop.shutdown_asyncgens())
+        self.loop.close()
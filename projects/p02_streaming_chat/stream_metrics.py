@@ -0,0 +1,398 @@
+"""
+Project 02 - Streaming Chat Client - Streaming timing metrics
+
+First-token and total latency hide most of a stream's behavior. This module
+derives the full timing profile of each response from the delta arrival
+times recorded by stream_engine:
+
+- inter-token gap p50 / p95 / p99 and the max stall (longest gap)
+- decode throughput in tokens/s, from `usage.completion_tokens` when the API
+  reports it (stream_options={"include_usage": True}), else from the number
+  of content deltas
+
+SessionMetrics keeps cumulative HDR-style histograms per model (log-linear
+buckets with ~1.5% relative error and constant memory), printed by /stats and
+exported to JSON on exit. It also counts hedged requests (see
+stream_engine.hedged_stream_completion) and the tokens they cost, and
+streams resumed after a disconnect (stream_engine.resumable_stream_completion)
+with the latency each reconnect added.
+
+Streams ended by a client-side stop condition (stop_conditions.py) are
+counted per reason, with an estimate of the output tokens saved: the mean
+length of the session's naturally finished responses minus what was received.
+Before any response has finished naturally there is no such baseline:
+--max-tokens minus what was received is then kept apart as an upper bound
+(or the saving is unknown without --max-tokens), never mixed into the estimate.
+"""
+
+import json
+import math
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+# Percentiles reported everywhere
+PERCENTILES = (50, 95, 99)
+
+# Log-linear bucketing (HdrHistogram layout with 2^SUB_BUCKET_BITS sub-buckets).
+SUB_BUCKET_BITS = 7
+SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS
+SUB_BUCKET_HALF = SUB_BUCKET_COUNT // 2
+
+
+def _percentile(sorted_values: List[float], p: float) -> float:
+    """Nearest-rank percentile (same method as the p04 summarizer)."""
+    if not sorted_values:
+        return 0.0
+    k = max(0, min(math.ceil((p / 100.0) * len(sorted_values)) - 1, len(sorted_values) - 1))
+    return float(sorted_values[k])
+
+
+class Histogram:
+    """
+    Sparse HDR-style histogram of non-negative values.
+
+    Values are stored as integers in units of 1/scale (e.g. scale=1000 keeps
+    milliseconds with microsecond resolution). Buckets are exact below
+    SUB_BUCKET_COUNT units and log-linear above, so memory stays small for any
+    range while percentiles keep ~1.5% relative precision.
+    """
+
+    def __init__(self, unit: str, scale: int = 1000):
+        self.unit = unit
+        self.scale = scale
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def record(self, value: float) -> None:
+        if value < 0:
+            value = 0.0
+        index = self._index(int(round(value * self.scale)))
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def percentile(self, p: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil((p / 100.0) * self.count))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(self._value(index), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def to_dict(self) -> dict:
+        return {
+            "unit": self.unit,
+            "count": self.count,
+            "min": self.min,
+            "max": self.max,
+            "mean": round(self.mean, 3),
+            **{f"p{p}": round(self.percentile(p), 3) for p in PERCENTILES},
+            # [bucket value, count] pairs, enough to rebuild the distribution
+            "buckets": [[round(self._value(i), 3), self.counts[i]] for i in sorted(self.counts)],
+        }
+
+    def describe(self) -> str:
+        if not self.count:
+            return "no data"
+        return (
+            f"n={self.count} · "
+            + " · ".join(f"p{p} {self.percentile(p):.1f}" for p in PERCENTILES)
+            + f" · max {self.max:.1f} {self.unit}"
+        )
+
+    @staticmethod
+    def _index(units: int) -> int:
+        if units < SUB_BUCKET_COUNT:
+            return units
+        shift = units.bit_length() - SUB_BUCKET_BITS
+        return shift * SUB_BUCKET_HALF + (units >> shift)
+
+    def _value(self, index: int) -> float:
+        """Midpoint of a bucket, in the histogram's unit."""
+        if index < SUB_BUCKET_COUNT:
+            return index / self.scale
+        shift = index // SUB_BUCKET_HALF - 1
+        sub = index - shift * SUB_BUCKET_HALF
+        low = sub << shift
+        high = ((sub + 1) << shift) - 1
+        return (low + high) / 2 / self.scale
+
+
+@dataclass
+class StreamTiming:
+    """Timing profile of one streamed response."""
+
+    ttft_ms: Optional[float]
+    total_ms: float
+    gaps_ms: List[float]
+    tokens: int
+    tokens_from_usage: bool
+    decode_tokens_per_s: Optional[float]
+
+    @property
+    def max_stall_ms(self) -> float:
+        return max(self.gaps_ms) if self.gaps_ms else 0.0
+
+    def gap_percentile(self, p: float) -> float:
+        return _percentile(sorted(self.gaps_ms), p)
+
+    def describe(self) -> str:
+        """One-line footer: gap percentiles, max stall and decode throughput."""
+        if not self.gaps_ms:
+            return "timing: fewer than two tokens"
+        gaps = " · ".join(f"p{p} {self.gap_percentile(p):.1f}" for p in PERCENTILES)
+        rate = f"{self.decode_tokens_per_s:.1f} tok/s" if self.decode_tokens_per_s is not None else "n/a"
+        source = "usage" if self.tokens_from_usage else "deltas"
+        return f"gaps ms: {gaps} · max stall {self.max_stall_ms:.1f} · decode {rate} ({self.tokens} tokens, {source})"
+
+
+def timing_from_result(result) -> StreamTiming:
+    """Build the timing profile of a stream_engine.StreamResult."""
+    times = result.delta_times
+    gaps = [(b - a) * 1000.0 for a, b in zip(times, times[1:])]
+
+    from_usage = result.completion_tokens is not None
+    tokens = result.completion_tokens if from_usage else len(times)
+
+    rate = None
+    if len(times) >= 2 and times[-1] > times[0] and tokens > 1:
+        # Decode phase only: tokens after the first one, over first → last token.
+        rate = (tokens - 1) / (times[-1] - times[0])
+
+    return StreamTiming(
+        ttft_ms=result.ttft_s * 1000.0 if result.ttft_s is not None else None,
+        total_ms=result.total_s * 1000.0,
+        gaps_ms=gaps,
+        tokens=tokens,
+        tokens_from_usage=from_usage,
+        decode_tokens_per_s=rate,
+    )
+
+
+class ModelMetrics:
+    """Cumulative histograms for one model."""
+
+    def __init__(self):
+        self.streams = 0
+        self.cancelled = 0
+        self.stopped: Dict[str, int] = {}  # stop reason -> streams
+        self.ttft = Histogram("ms")
+        self.total = Histogram("ms")
+        self.gap = Histogram("ms")
+        self.max_stall = Histogram("ms")
+        self.decode_rate = Histogram("tok/s", scale=100)
+
+        # Token spend and hedging
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.extra_prompt_tokens = 0
+        self.extra_completion_tokens = 0
+
+        # Resumed streams
+        self.resumed = 0
+        self.reconnects = 0
+        self.reconnect_delay = Histogram("ms")
+
+        # Client-side stops: natural response length, and estimated savings
+        self.natural_responses = 0
+        self.natural_tokens = 0
+        self.tokens_saved = 0  # against the session mean of natural responses
+        # Against max_tokens, for stops before any natural response; None once
+        # one of them had no max_tokens either (the saving is then unknown)
+        self.tokens_saved_upper_bound: Optional[int] = 0
+        self.stops_without_baseline = 0  # stops before any natural response (bounded or unknown)
+
+    def describe_hedging(self) -> str:
+        if not self.hedged:
+            return f"hedged 0/{self.streams}"
+        spent = self.prompt_tokens + self.completion_tokens
+        extra = self.extra_prompt_tokens + self.extra_completion_tokens
+        return (
+            f"hedged {self.hedged}/{self.streams} ({100.0 * self.hedged / self.streams:.1f}%) · "
+            f"hedge won {self.hedge_wins} ({100.0 * self.hedge_wins / self.hedged:.1f}%) · "
+            f"extra tokens {self.extra_prompt_tokens} in / {self.extra_completion_tokens} out"
+            + (f" (+{100.0 * extra / spent:.1f}%)" if spent else "")
+        )
+
+    def hedging_dict(self) -> dict:
+        return {
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "hedge_rate": round(self.hedged / self.streams, 4) if self.streams else 0.0,
+            "win_rate": round(self.hedge_wins / self.hedged, 4) if self.hedged else 0.0,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "extra_prompt_tokens": self.extra_prompt_tokens,
+            "extra_completion_tokens": self.extra_completion_tokens,
+        }
+
+    def describe_reconnects(self) -> str:
+        if not self.resumed:
+            return f"resumed 0/{self.streams}"
+        return (
+            f"resumed {self.resumed}/{self.streams} · {self.reconnects} reconnects · "
+            f"added latency {self.reconnect_delay.describe()}"
+        )
+
+    def reconnects_dict(self) -> dict:
+        return {
+            "resumed": self.resumed,
+            "reconnects": self.reconnects,
+            "reconnect_delay": self.reconnect_delay.to_dict(),
+        }
+
+    def describe_stops(self) -> str:
+        if not self.stopped:
+            return f"stopped 0/{self.streams}"
+        reasons = ", ".join(f"{reason} {n}" for reason, n in sorted(self.stopped.items()))
+        described = (
+            f"stopped {sum(self.stopped.values())}/{self.streams} ({reasons}) · "
+            f"~{self.tokens_saved} output tokens saved"
+        )
+        if self.stops_without_baseline:
+            bound = "unknown" if self.tokens_saved_upper_bound is None else f"≤ {self.tokens_saved_upper_bound} (upper bound)"
+            described += f" · {self.stops_without_baseline} stops before a natural completion: {bound}"
+        return described
+
+    def stops_dict(self) -> dict:
+        return {
+            "stopped": dict(self.stopped),
+            "tokens_saved_estimate": self.tokens_saved,
+            "tokens_saved_upper_bound": self.tokens_saved_upper_bound,
+            "stops_without_baseline": self.stops_without_baseline,
+            "natural_responses": self.natural_responses,
+            "natural_mean_tokens": round(self.natural_tokens / self.natural_responses, 1)
+            if self.natural_responses
+            else None,
+        }
+
+    def histograms(self) -> Dict[str, Histogram]:
+        return {
+            "ttft": self.ttft,
+            "total_latency": self.total,
+            "inter_token_gap": self.gap,
+            "max_stall": self.max_stall,
+            "decode_tokens_per_s": self.decode_rate,
+        }
+
+
+class SessionMetrics:
+    """Per-model streaming metrics across a CLI session."""
+
+    def __init__(self):
+        self.models: Dict[str, ModelMetrics] = {}
+
+    def record(self, model: str, status: str, timing: StreamTiming) -> None:
+        """
+        Add one response. Gaps and TTFT of cancelled streams are real samples;
+        their total latency and throughput are not, so those are skipped.
+        """
+        m = self.models.setdefault(model, ModelMetrics())
+        m.streams += 1
+        if timing.ttft_ms is not None:
+            m.ttft.record(timing.ttft_ms)
+        for gap in timing.gaps_ms:
+            m.gap.record(gap)
+
+        if status == "stopped":
+            # Cut short by the client: the decode rate is real, the total is not.
+            if timing.decode_tokens_per_s is not None:
+                m.decode_rate.record(timing.decode_tokens_per_s)
+            return
+        if status != "ok":
+            m.cancelled += status == "cancelled"
+            return
+        m.total.record(timing.total_ms)
+        if timing.gaps_ms:
+            m.max_stall.record(timing.max_stall_ms)
+        if timing.decode_tokens_per_s is not None:
+            m.decode_rate.record(timing.decode_tokens_per_s)
+
+    def record_usage(self, model: str, result) -> None:
+        """Add token spend, hedging and reconnect outcome of a stream_engine.StreamResult."""
+        m = self.models.setdefault(model, ModelMetrics())
+        m.prompt_tokens += result.prompt_tokens or 0
+        m.completion_tokens += result.completion_tokens or len(result.delta_times)
+        if result.hedged:
+            m.hedged += 1
+            m.hedge_wins += result.hedge_won
+            m.extra_prompt_tokens += result.extra_prompt_tokens
+            m.extra_completion_tokens += result.extra_completion_tokens
+        if result.status == "ok":
+            m.natural_responses += 1
+            m.natural_tokens += result.completion_tokens or len(result.delta_times)
+        if result.reconnects:
+            m.resumed += 1
+            m.reconnects += result.reconnects
+            m.reconnect_delay.record(result.reconnect_delay_s * 1000.0)
+
+    def record_stop(self, model: str, result, max_tokens: Optional[int]) -> str:
+        """
+        Count a stream ended by a client-side stop condition. Returns the
+        output tokens saved, labelled with what the figure is: an estimate
+        against the session mean, an upper bound against max_tokens (no
+        natural completion observed yet), or unknown.
+        """
+        m = self.models.setdefault(model, ModelMetrics())
+        m.stopped[result.stop_reason] = m.stopped.get(result.stop_reason, 0) + 1
+        received = result.completion_tokens or len(result.delta_times)
+        if m.natural_responses:
+            saved = max(0, int(round(m.natural_tokens / m.natural_responses - received)))
+            m.tokens_saved += saved
+            return f"~{saved} tokens saved (session mean)"
+        m.stops_without_baseline += 1
+        if max_tokens:
+            bound = max(0, max_tokens - received)
+            if m.tokens_saved_upper_bound is not None:
+                m.tokens_saved_upper_bound += bound
+            return f"≤ {bound} tokens saved (upper bound: max_tokens)"
+        m.tokens_saved_upper_bound = None
+        return "tokens saved unknown (no natural completion yet)"
+
+    def format_stats(self) -> str:
+        """Render the current distributions for /stats."""
+        if not self.models:
+            return "\n--- Streaming stats ---\n(no responses yet)\n-----------------------\n"
+        lines = ["", "--- Streaming stats ---"]
+        for model, m in self.models.items():
+            lines.append(f"{model}: {m.streams} streams ({m.cancelled} cancelled)")
+            for name, hist in m.histograms().items():
+                lines.append(f"  {name:<20} {hist.describe()}")
+            lines.append(f"  {'hedging':<20} {m.describe_hedging()}")
+            lines.append(f"  {'reconnects':<20} {m.describe_reconnects()}")
+            lines.append(f"  {'client stops':<20} {m.describe_stops()}")
+        lines += ["-----------------------", ""]
+        return "\n".join(lines)
+
+    def to_dict(self) -> dict:
+        return {
+            model: {
+                "streams": m.streams,
+                "cancelled": m.cancelled,
+                **{name: hist.to_dict() for name, hist in m.histograms().items()},
+                "hedging": m.hedging_dict(),
+                "reconnects": m.reconnects_dict(),
+                "client_stops": m.stops_dict(),
+            }
+            for model, m in self.models.items()
+        }
+
+    def export_json(self, path: str) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
@@ -7,31 +7,46 @@ This client implements streaming responses using:
 - OpenAI Python SDK 2.9.0
 - Chat Completions API
 - stream=True
+- AsyncOpenAI, driven by stream_engine.StreamEngine (Ctrl-C cancels the
+  in-flight stream only; --streams N runs N streams side by side)
+- a fan-out bus (stream_bus.StreamBus) feeding the terminal renderer, the
+  incremental log and an optional local SSE endpoint
 
 The design is stateless: each user input is sent as a fresh request.
 """
 
 import argparse
+import asyncio
 import os
+import re
 import sys
-import time
 from datetime import datetime
 
-from dotenv import load_dotenv
-from openai import OpenAI
+if __package__:
+    from .log_writer import DEFAULT_FLUSH_INTERVAL, BackgroundLogWriter
+    from .renderer import DEFAULT_FRAME_INTERVAL, DEFAULT_MAX_FRAME_BYTES, CoalescingRenderer, render_turn
+    from .sse_endpoint import SSEEndpoint
+    from .stop_conditions import StopConditions, turn_stop
+    from .stream_bus import DEFAULT_CAPACITY, StreamBus
+    from .stream_engine import StreamEngine, StreamRequest
+    from .stream_metrics import SessionMetrics, timing_from_result
+else:  # run as a script: python projects/p02_streaming_chat/streaming_chat.py
+    from log_writer import DEFAULT_FLUSH_INTERVAL, BackgroundLogWriter
+    from renderer import DEFAULT_FRAME_INTERVAL, DEFAULT_MAX_FRAME_BYTES, CoalescingRenderer, render_turn
+    from sse_endpoint import SSEEndpoint
+    from stop_conditions import StopConditions, turn_stop
+    from stream_bus import DEFAULT_CAPACITY, StreamBus
+    from stream_engine import StreamEngine, StreamRequest
+    from stream_metrics import SessionMetrics, timing_from_result
 
 
 # ─────────────────────────────────────────────────────────────
 # Environment & client
 # ─────────────────────────────────────────────────────────────
 
-load_dotenv()
-
-if not os.getenv("OPENAI_API_KEY"):
-    print("ERROR: OPENAI_API_KEY not set.")
-    sys.exit(1)
-
-client = OpenAI()
+# The OpenAI SDK is imported and the client built on the first request
+# (make_client), so --help, /config and import-only use (e.g. build_messages)
+# do not pay the SDK import and client construction cost.
 
 LOG_DIR = "logs"
 
@@ -43,6 +58,23 @@ GREY = "\033[90m"
 RESET = "\033[0m"
 
 
+def load_env():
+    """Load .env and fail fast if OPENAI_API_KEY is missing (no SDK import)."""
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+    if not os.getenv("OPENAI_API_KEY"):
+        print("ERROR: OPENAI_API_KEY not set.")
+        sys.exit(1)
+
+
+def make_client():
+    from openai import AsyncOpenAI
+
+    return AsyncOpenAI()
+
+
 # ─────────────────────────────────────────────────────────────
 # Logging (minimal)
 # ─────────────────────────────────────────────────────────────
@@ -59,7 +91,7 @@ def init_log_file(args):
         f.write(f"# Model: {args.model}\n")
         f.write("# -----------------------------------\n\n")
         f.flush()
-        return f
+        return BackgroundLogWriter(f, flush_interval=args.log_flush_interval)
     except Exception:
         return None
 
@@ -67,9 +99,7 @@ def init_log_file(args):
 def log_line(log_file, label, content):
     if not log_file:
         return
-    ts = datetime.now().isoformat(timespec="seconds")
-    log_file.write(f"[{ts}] {label.upper()}: {content}\n")
-    log_file.flush()
+    log_file.log(label, content)
 
 
 # ─────────────────────────────────────────────────────────────
@@ -87,9 +117,119 @@ def parse_args():
     parser.add_argument("--max-tokens", type=int, default=256)
     parser.add_argument("--system", type=str, default=None)
     parser.add_argument("--no-color", action="store_true")
+    parser.add_argument("--log-flush-interval", type=float, default=DEFAULT_FLUSH_INTERVAL)
+    parser.add_argument(
+        "--streams",
+        type=int,
+        default=1,
+        help="Concurrent streams per prompt; the first renders live, the rest when done (default: 1)",
+    )
+    parser.add_argument(
+        "--hedge-after-ms",
+        type=float,
+        default=None,
+        help="Hedge slow starts: if no token arrives within this many ms, send a second identical request "
+        "and keep whichever streams first (default: off)",
+    )
+    parser.add_argument(
+        "--stop",
+        action="append",
+        default=None,
+        metavar="TEXT",
+        help="Client-side stop string: close the stream once the text contains it (repeatable)",
+    )
+    parser.add_argument("--stop-regex", type=str, default=None, help="Client-side stop once the text matches this regex")
+    parser.add_argument("--max-chars", type=int, default=None, help="Client-side stop after this many characters")
+    parser.add_argument("--max-time", type=float, default=None, help="Client-side stop after this many seconds per turn")
+    parser.add_argument(
+        "--stop-on-key",
+        action="store_true",
+        help="Stop the response when any key is pressed while it streams (terminal only)",
+    )
+    parser.add_argument(
+        "--max-reconnects",
+        type=int,
+        default=3,
+        help="Resume a stream that drops mid-response up to this many times, continuing from the "
+        "text already received (0 disables; default: 3)",
+    )
+    parser.add_argument(
+        "--reconnect-backoff-ms",
+        type=float,
+        default=250.0,
+        help="Initial reconnect backoff, doubled on each attempt, with jitter (default: 250)",
+    )
+    parser.add_argument(
+        "--bus-capacity",
+        type=int,
+        default=DEFAULT_CAPACITY,
+        help=f"Deltas kept in the fan-out ring buffer; slower subscribers skip ahead (default: {DEFAULT_CAPACITY})",
+    )
+    parser.add_argument(
+        "--log-deltas",
+        action="store_true",
+        help="Log the response incrementally while it streams (in addition to the final text)",
+    )
+    parser.add_argument(
+        "--sse-port",
+        type=int,
+        default=None,
+        help="Serve live deltas as Server-Sent Events on http://127.0.0.1:PORT/events",
+    )
+    parser.add_argument(
+        "--stats-out",
+        type=str,
+        default=None,
+        help="Write per-model streaming stats JSON here on exit (default: logs/project02-stats-<timestamp>.json)",
+    )
+    parser.add_argument(
+        "--load",
+        type=str,
+        default=None,
+        metavar="CORPUS",
+        help="Load-test mode: replay prompts from CORPUS (.jsonl or one prompt per line) instead of chatting",
+    )
+    parser.add_argument("--concurrency", type=int, default=4, help="--load: streams kept in flight (default: 4)")
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=None,
+        help="--load: open loop, start this many requests per second regardless of completions",
+    )
+    parser.add_argument(
+        "--arrival",
+        choices=("uniform", "poisson"),
+        default="uniform",
+        help="--load --rate: arrival process (default: uniform)",
+    )
+    parser.add_argument("--requests", type=int, default=None, help="--load: measured requests (default: corpus size)")
+    parser.add_argument("--warmup", type=int, default=0, help="--load: warm-up requests, recorded but flagged (default: 0)")
+    parser.add_argument("--seed", type=int, default=0, help="--load: seed for Poisson arrivals (default: 0)")
+    parser.add_argument(
+        "--load-out",
+        type=str,
+        default=None,
+        help="--load: results JSONL (default: logs/project02-load-<timestamp>.jsonl)",
+    )
+    parser.add_argument(
+        "--frame-ms",
+        type=float,
+        default=DEFAULT_FRAME_INTERVAL * 1000,
+        help=f"Terminal frame budget: coalesce deltas for up to this long (default: {DEFAULT_FRAME_INTERVAL * 1000:.0f})",
+    )
+    parser.add_argument(
+        "--frame-bytes",
+        type=int,
+        default=DEFAULT_MAX_FRAME_BYTES,
+        help=f"Flush a frame early once this many characters are pending (default: {DEFAULT_MAX_FRAME_BYTES})",
+    )
 
     args = parser.parse_args()
     args.use_colors = not args.no_color
+    try:
+        args.stop_conditions = StopConditions.from_args(args.stop, args.stop_regex, args.max_chars)
+    except re.error as e:
+        parser.error(f"--stop-regex: {e}")
     return args
 
 
@@ -107,11 +247,13 @@ def print_header(args):
     print(f"Model: {args.model}")
     print(f"Temperature: {args.temperature} · top_p: {args.top_p}")
     print(f"Max tokens: {args.max_tokens}")
+    if args.streams > 1:
+        print(f"Streams per prompt: {args.streams}")
     if args.system:
         print(f"System: {args.system}")
     else:
         print("System: (none)")
-    print("Commands: /help · /config · /exit")
+    print("Commands: /help · /config · /stats · /exit  (Ctrl-C cancels a running response)")
     print()
 
 
@@ -127,57 +269,130 @@ def build_messages(user_input, args):
     return messages
 
 
-def stream_chat_once(user_input, args, log_file):
-    messages = build_messages(user_input, args)
+async def log_deltas(subscription, log_file, flush_chars=200):
+    """Bus subscriber: write the response to the log in pieces while it streams."""
+    pending = {}
+    async for event in subscription:
+        if event.kind == "lag":
+            log_line(log_file, "delta", f"[{event.text} deltas skipped]")
+            continue
+        if event.kind == "end":
+            break
+        text = pending.get(event.stream, "") + event.text
+        if len(text) >= flush_chars:
+            log_line(log_file, f"delta {event.stream + 1}", text)
+            text = ""
+        pending[event.stream] = text
+    for stream, text in sorted(pending.items()):
+        if text:
+            log_line(log_file, f"delta {stream + 1}", text)
 
-    t0 = time.perf_counter()
-    first_token_time = None
-    chunks = []
 
-    try:
-        stream = client.chat.completions.create(
+def stream_chat_once(user_input, args, log_file, engine, metrics, bus):
+    with turn_stop(engine.loop, args.max_time, args.stop_on_key) as stop_signal:
+        _stream_turn(user_input, args, log_file, engine, metrics, bus, stop_signal)
+
+
+def _stream_turn(user_input, args, log_file, engine, metrics, bus, stop_signal):
+    messages = build_messages(user_input, args)
+    requests = [
+        StreamRequest(
             model=args.model,
             messages=messages,
             temperature=args.temperature,
             top_p=args.top_p,
             max_tokens=args.max_tokens,
-            stream=True,
+            stop=args.stop_conditions,
+            stop_signal=stop_signal,
         )
+        for _ in range(max(1, args.streams))
+    ]
 
-        print(f"\n{c('Assistant', CYAN, args.use_colors)} (streaming...)\n")
-
-        for chunk in stream:
-            choice = chunk.choices[0]
-            delta = getattr(choice.delta, "content", None)
+    hint = " · any key stops" if args.stop_on_key and sys.stdin.isatty() else ""
+    print(f"\n{c('Assistant', CYAN, args.use_colors)} (streaming...{hint})\n")
 
-            if delta:
-                if first_token_time is None:
-                    first_token_time = time.perf_counter()
-                print(delta, end="", flush=True)
-                chunks.append(delta)
+    # Deltas are coalesced into frames (one write per frame, not per token);
+    # fully buffered when stdout is not a terminal.
+    renderer = CoalescingRenderer(frame_interval=args.frame_ms / 1000.0, max_frame_bytes=args.frame_bytes)
 
-        print()
+    # Deltas go through the bus; each subscriber consumes it at its own pace.
+    # Only the first stream renders live; the others are printed when done.
+    subscribers = [engine.loop.create_task(render_turn(bus.subscribe("renderer"), renderer, stream=0))]
+    if args.log_deltas and log_file:
+        subscribers.append(engine.loop.create_task(log_deltas(bus.subscribe("log"), log_file)))
 
-        t1 = time.perf_counter()
-        total_latency = t1 - t0
-        ft_latency = (
-            first_token_time - t0 if first_token_time else None
-        )
+    results = engine.run(requests, on_delta=bus.publish_delta)
+    bus.end_turn()
+    engine.loop.run_until_complete(asyncio.gather(*subscribers))
+    print()
 
-        if ft_latency:
-            latency = f"(first token: {ft_latency:.3f}s · total: {total_latency:.3f}s)"
+    for result in results:
+        label = f"stream {result.index + 1}/{len(results)}"
+        if result.index > 0:
+            print(f"\n{c(f'[{label}]', CYAN, args.use_colors)}")
+            print(result.text)
+
+        latency = result.describe_latency()
+        if result.status == "cancelled":
+            status = f"[cancelled after {len(result.text)} chars] {latency}"
+        elif result.status == "stopped":
+            saved = metrics.record_stop(args.model, result, args.max_tokens)
+            status = f"[stopped: {result.stop_reason} after {len(result.text)} chars · {saved}] {latency}"
+        elif result.status == "error":
+            status = f"[ERROR] {result.error}"
         else:
-            latency = f"(total: {total_latency:.3f}s)"
-
-        print(c(f"  {latency}", GREY, args.use_colors))
+            status = latency
+        prefix = f"{label} " if len(results) > 1 else ""
+        print(c(f"  {prefix}{status}", GREY, args.use_colors))
+
+        timing = timing_from_result(result)
+        if result.status != "error":
+            metrics.record(args.model, result.status, timing)
+            metrics.record_usage(args.model, result)
+            print(c(f"  {prefix}{timing.describe()}", GREY, args.use_colors))
+        if result.hedged:
+            hedge = (
+                f"hedged after {args.hedge_after_ms:.0f} ms · {'hedge' if result.hedge_won else 'original'} won · "
+                f"extra ~{result.extra_prompt_tokens} in / {result.extra_completion_tokens} out tokens"
+            )
+            print(c(f"  {prefix}{hedge}", GREY, args.use_colors))
+            log_line(log_file, "hedge", f"{prefix}{hedge}")
+        if result.reconnects:
+            resumed = (
+                f"resumed after {result.reconnects} reconnect{'s' if result.reconnects > 1 else ''} · "
+                f"+{result.reconnect_delay_s:.3f}s"
+            )
+            print(c(f"  {prefix}{resumed}", GREY, args.use_colors))
+            log_line(log_file, "reconnect", f"{prefix}{resumed}")
+
+        if result.status == "error":
+            log_line(log_file, "error", f"{prefix}{result.error}")
+            continue
+        log_line(log_file, "assistant", f"{prefix}{result.text}")
+        log_line(
+            log_file,
+            "latency",
+            f"{prefix}{latency}"
+            + (" cancelled" if result.status == "cancelled" else "")
+            + (f" stopped:{result.stop_reason}" if result.status == "stopped" else ""),
+        )
+        log_line(log_file, "timing", f"{prefix}{timing.describe()}")
 
-        text = "".join(chunks)
-        log_line(log_file, "assistant", text)
-        log_line(log_file, "latency", latency)
 
-    except Exception as e:
-        print(f"\n[ERROR] {e}")
-        log_line(log_file, "error", str(e))
+def export_stats(metrics, args, log_file):
+    if not metrics.models:
+        return
+    path = args.stats_out
+    if path is None:
+        ts = datetime.now().strftime("%Y%m%d-%H%M%S")
+        path = os.path.join(LOG_DIR, f"project02-stats-{ts}.json")
+    try:
+        metrics.export_json(path)
+    except OSError as e:
+        print(f"[stats] export failed: {e}")
+        return
+    print(c(f"[stats → {path}]", GREY, args.use_colors))
+    log_line(log_file, "stats", path)
 
 
 # ─────────────────────────────────────────────────────────────
@@ -188,6 +403,7 @@ def print_help():
     print("Commands:")
     print("  /help   Show this help")
     print("  /config Show current configuration")
+    print("  /stats  Show inter-token latency and throughput distributions")
     print("  /exit   Exit the client")
 
 
@@ -197,12 +413,29 @@ def print_config(args):
     print(f"Temperature: {args.temperature}")
     print(f"top_p: {args.top_p}")
     print(f"Max tokens: {args.max_tokens}")
+    print(f"Streams per prompt: {args.streams}")
+    print(f"Hedge after: {f'{args.hedge_after_ms:.0f} ms' if args.hedge_after_ms is not None else 'off'}")
+    print(f"Client stops: {describe_stops(args)}")
+    print(f"Reconnects: {args.max_reconnects} (backoff {args.reconnect_backoff_ms:.0f} ms)")
     print(f"System: {args.system}")
     print(f"Colors: {args.use_colors}")
     print("---------------------\n")
 
 
-def handle_command(cmd, args):
+def describe_stops(args):
+    rules = [f"stop {s!r}" for s in (args.stop or ())]
+    if args.stop_regex:
+        rules.append(f"regex {args.stop_regex!r}")
+    if args.max_chars:
+        rules.append(f"{args.max_chars} chars")
+    if args.max_time:
+        rules.append(f"{args.max_time:g} s")
+    if args.stop_on_key:
+        rules.append("keypress")
+    return ", ".join(rules) or "off"
+
+
+def handle_command(cmd, args, metrics):
     cmd = cmd.lower().strip()
     if cmd == "/help":
         print_help()
@@ -210,6 +443,9 @@ def handle_command(cmd, args):
     if cmd == "/config":
         print_config(args)
         return True
+    if cmd == "/stats":
+        print(metrics.format_stats())
+        return True
     if cmd == "/exit":
         print("Goodbye!")
         sys.exit(0)
@@ -223,35 +459,68 @@ def handle_command(cmd, args):
 
 def main():
     args = parse_args()
+    load_env()
+    if args.load:
+        if __package__:
+            from .load_test import run_load
+        else:
+            from load_test import run_load
+
+        run_load(args, lambda prompt: build_messages(prompt, args), make_client, LOG_DIR)
+        return
     print_header(args)
 
     log_file = init_log_file(args)
     log_line(log_file, "info", "session started")
 
-    user_label = c("You", YELLOW, args.use_colors)
+    engine = StreamEngine(
+        make_client,
+        concurrency=args.streams,
+        hedge_after_s=args.hedge_after_ms / 1000.0 if args.hedge_after_ms is not None else None,
+        max_reconnects=max(0, args.max_reconnects),
+        reconnect_backoff_s=args.reconnect_backoff_ms / 1000.0,
+    )
+    metrics = SessionMetrics()
+    bus = StreamBus(capacity=args.bus_capacity)
 
-    while True:
-        try:
-            user_input = input(f"{user_label}: ")
-        except (EOFError, KeyboardInterrupt):
-            print("\nExiting.")
-            break
+    sse = None
+    if args.sse_port:
+        sse = SSEEndpoint(bus)
+        engine.loop.run_until_complete(sse.start("127.0.0.1", args.sse_port))
+        print(c(f"[live SSE feed → http://127.0.0.1:{args.sse_port}/events]", GREY, args.use_colors))
 
-        if not user_input.strip():
-            print("Empty input. Type a message or /exit.")
-            continue
+    user_label = c("You", YELLOW, args.use_colors)
 
-        if user_input.startswith("/"):
-            handled = handle_command(user_input, args)
-            if handled:
+    try:
+        while True:
+            try:
+                user_input = input(f"{user_label}: ")
+            except (EOFError, KeyboardInterrupt):
+                print("\nExiting.")
+                break
+
+            if not user_input.strip():
+                print("Empty input. Type a message or /exit.")
                 continue
 
-        log_line(log_file, "user", user_input)
-        stream_chat_once(user_input, args, log_file)
-
-    log_line(log_file, "info", "session closed")
-    if log_file:
-        log_file.close()
+            if user_input.startswith("/"):
+                handled = handle_command(user_input, args, metrics)
+                if handled:
+                    continue
+
+            log_line(log_file, "user", user_input)
+            stream_chat_once(user_input, args, log_file, engine, metrics, bus)
+    finally:
+        bus.close()
+        if sse is not None:
+            engine.loop.run_until_complete(sse.close())
+        engine.close()
+        export_stats(metrics, args, log_file)
+
+        # /exit raises SystemExit; drain queued log records on every exit path
+        log_line(log_file, "info", "session closed")
+        if log_file:
+            log_file.close()
 
 
 if __name__ == "__main__":
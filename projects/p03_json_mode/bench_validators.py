@@ -0,0 +1,250 @@
+"""
+Microbenchmark: the former handwritten StructuredAnswerLite validator vs. the
+schema-compiled one (src/validators.compile_schema).
+
+This file is NOT part of the project deliverables.
+It exists only to verify that the compiled validator:
+- never accepts a payload the handwritten code rejected (on the valid
+  payload and on a corpus of mutated ones, whitespace-only strings included)
+- is at least as fast, in payloads/sec (best of interleaved runs, so one noisy
+  sample does not decide)
+
+Known, intended differences are counted and shown:
+- booleans are not numbers (JSON Schema), so `"confidence": true` is rejected
+- a missing or non-object field no longer also reports its children
+
+Run from the repository root:
+    python -m projects.p03_json_mode.bench_validators
+"""
+
+import argparse
+import copy
+import random
+import time
+from typing import Any, Callable, Dict, List
+
+from .src.schemas import SCHEMA_VERSION, get_structured_answer_lite_schema
+from .src.validators import ValidationResult, compile_schema
+
+VALID_PAYLOAD: Dict[str, Any] = {
+    "task": {"type": "qa", "user_intent": "Explain JSON mode"},
+    "answer": {"text": "JSON mode constrains the output to a JSON object."},
+    "quality": {"confidence": 0.9, "assumptions": ["SDK 2.x"], "risks": []},
+    "debug": {"schema_version": "1.0", "model": "gpt-4.1-mini"},
+}
+
+# Replacement values tried at every position of the payload
+MUTATIONS: List[Any] = [None, "", "  ", "x", "other", 0, 1, -1, 2.5, 0.5, True, [], ["a", 1], {}, {"k": 1}]
+
+
+# --- Baseline: the handwritten validator this project used before ---
+
+
+def _is_non_empty_str(value: Any) -> bool:
+    return isinstance(value, str) and len(value.strip()) > 0
+
+
+def _check_required_keys(obj: Dict[str, Any], required: List[str], path: str, errors: List[str]) -> None:
+    for key in required:
+        if key not in obj:
+            errors.append(f"{path}.{key} is missing")
+
+
+def _check_no_extra_keys(obj: Dict[str, Any], allowed: List[str], path: str, errors: List[str]) -> None:
+    for key in obj.keys():
+        if key not in allowed:
+            errors.append(f"{path} has unexpected key '{key}'")
+
+
+def handwritten_validate(payload: Any) -> ValidationResult:
+    schema = get_structured_answer_lite_schema()
+    errors: List[str] = []
+
+    if not isinstance(payload, dict):
+        return ValidationResult(ok=False, errors=["payload must be an object"])
+
+    _check_required_keys(payload, schema["required"], "payload", errors)
+    _check_no_extra_keys(payload, list(schema["properties"].keys()), "payload", errors)
+
+    task = payload.get("task")
+    answer = payload.get("answer")
+    quality = payload.get("quality")
+    debug = payload.get("debug")
+
+    task_schema = schema["properties"]["task"]
+    allowed_task_types = task_schema["properties"]["type"]["enum"]
+    if not isinstance(task, dict):
+        errors.append("task must be an object")
+        task = {}
+    _check_required_keys(task, task_schema["required"], "task", errors)
+    _check_no_extra_keys(task, list(task_schema["properties"].keys()), "task", errors)
+    if task.get("type") not in allowed_task_types:
+        errors.append(f"task.type must be one of {allowed_task_types}")
+    if not _is_non_empty_str(task.get("user_intent")):
+        errors.append("task.user_intent must be a non-empty string")
+
+    answer_schema = schema["properties"]["answer"]
+    if not isinstance(answer, dict):
+        errors.append("answer must be an object")
+        answer = {}
+    _check_required_keys(answer, answer_schema["required"], "answer", errors)
+    _check_no_extra_keys(answer, list(answer_schema["properties"].keys()), "answer", errors)
+    if not _is_non_empty_str(answer.get("text")):
+        errors.append("answer.text must be a non-empty string")
+
+    quality_schema = schema["properties"]["quality"]
+    if not isinstance(quality, dict):
+        errors.append("quality must be an object")
+        quality = {}
+    _check_required_keys(quality, quality_schema["required"], "quality", errors)
+    _check_no_extra_keys(quality, list(quality_schema["properties"].keys()), "quality", errors)
+    confidence = quality.get("confidence")
+    if not isinstance(confidence, (int, float)):
+        errors.append("quality.confidence must be a number")
+    elif confidence < 0.0 or confidence > 1.0:
+        errors.append("quality.confidence must be between 0.0 and 1.0")
+    for name in ("assumptions", "risks"):
+        items = quality.get(name)
+        if not isinstance(items, list):
+            errors.append(f"quality.{name} must be an array")
+        else:
+            for i, item in enumerate(items):
+                if not isinstance(item, str):
+                    errors.append(f"quality.{name}[{i}] must be a string")
+
+    debug_schema = schema["properties"]["debug"]
+    if not isinstance(debug, dict):
+        errors.append("debug must be an object")
+        debug = {}
+    _check_required_keys(debug, debug_schema["required"], "debug", errors)
+    _check_no_extra_keys(debug, list(debug_schema["properties"].keys()), "debug", errors)
+    if debug.get("schema_version") != SCHEMA_VERSION:
+        errors.append(f"debug.schema_version must be '{SCHEMA_VERSION}'")
+    if not _is_non_empty_str(debug.get("model")):
+        errors.append("debug.model must be a non-empty string")
+
+    return ValidationResult(ok=(len(errors) == 0), errors=errors)
+
+
+# --- Corpus ---
+
+
+def _paths(obj: Any, prefix=()) -> List[tuple]:
+    paths = []
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            paths.append(prefix + (key,))
+            paths.extend(_paths(value, prefix + (key,)))
+    elif isinstance(obj, list):
+        for i, value in enumerate(obj):
+            paths.append(prefix + (i,))
+    return paths
+
+
+def _set(obj: Any, path: tuple, value: Any) -> None:
+    for key in path[:-1]:
+        obj = obj[key]
+    obj[path[-1]] = value
+
+
+def mutated_corpus(valid: Dict[str, Any], extra: int, seed: int) -> List[Any]:
+    """Valid payload, every single-field mutation and deletion, extra keys, then random multi-mutations."""
+    rng = random.Random(seed)
+    corpus: List[Any] = [valid, [], "text", None]
+    paths = _paths(valid)
+    for path in paths:
+        for value in MUTATIONS:
+            payload = copy.deepcopy(valid)
+            _set(payload, path, value)
+            corpus.append(payload)
+        if not isinstance(path[-1], int):
+            payload = copy.deepcopy(valid)
+            parent = payload
+            for key in path[:-1]:
+                parent = parent[key]
+            del parent[path[-1]]
+            corpus.append(payload)
+            payload = copy.deepcopy(valid)
+            parent = payload
+            for key in path[:-1]:
+                parent = parent[key]
+            parent["unexpected"] = 1
+            corpus.append(payload)
+    for _ in range(extra):
+        payload = copy.deepcopy(valid)
+        for path in rng.sample(paths, k=3):
+            try:
+                _set(payload, path, rng.choice(MUTATIONS))
+            except (KeyError, IndexError, TypeError):
+                pass  # an earlier mutation replaced the parent
+        corpus.append(payload)
+    return corpus
+
+
+def payloads_per_sec(validate: Callable, payloads: List[Any], seconds: float) -> float:
+    n = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while True:
+        for payload in payloads:
+            validate(payload)
+        n += len(payloads)
+        now = time.perf_counter()
+        if now >= deadline:
+            return n / (now - start)
+
+
+def best_rates(variants: Dict[str, Callable], payloads: List[Any], seconds: float, repeats: int) -> Dict[str, float]:
+    """Best payloads/sec per variant over `repeats` rounds, the variants interleaved within each round."""
+    best = {name: 0.0 for name in variants}
+    for _ in range(repeats):
+        for name, validate in variants.items():
+            best[name] = max(best[name], payloads_per_sec(validate, payloads, seconds))
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare the handwritten and compiled StructuredAnswerLite validators.")
+    parser.add_argument("--seconds", type=float, default=0.2, help="Timing budget per measurement (default: 0.2)")
+    parser.add_argument("--repeats", type=int, default=5, help="Rounds per timing; best run is kept (default: 5)")
+    parser.add_argument("--random", type=int, default=2000, help="Random multi-field mutations")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    compiled = compile_schema(get_structured_answer_lite_schema())
+    corpus = mutated_corpus(VALID_PAYLOAD, args.random, args.seed)
+
+    verdict_diffs: List[Any] = []
+    message_diffs = 0
+    for payload in corpus:
+        before, after = handwritten_validate(payload), compiled(payload)
+        if before.ok != after.ok:
+            verdict_diffs.append((payload, before.errors, after.errors))
+        elif before.errors != after.errors:
+            message_diffs += 1
+    print(
+        f"StructuredAnswerLite: {len(corpus)} payloads · verdict differs on {len(verdict_diffs)} · "
+        f"same verdict, different error list on {message_diffs}"
+    )
+    for payload, before, after in verdict_diffs[:5]:
+        print(f"  {payload!r}\n    handwritten: {before}\n    compiled:    {after}")
+
+    loosened = [diff for diff in verdict_diffs if not diff[2]]
+    if loosened:
+        raise SystemExit(f"compiled validator accepts {len(loosened)} payloads the handwritten one rejected")
+
+    invalid = [p for p in corpus if not handwritten_validate(p).ok]
+    slower = False
+    print(f"  best of {args.repeats} interleaved runs of {args.seconds}s")
+    for label, payloads in (("valid", [VALID_PAYLOAD]), ("invalid mix", invalid)):
+        rates = best_rates({"handwritten": handwritten_validate, "compiled": compiled}, payloads, args.seconds, args.repeats)
+        before, after = rates["handwritten"], rates["compiled"]
+        slower = slower or after < before
+        print(f"  {label:<12} handwritten {before:>12,.0f}/s · compiled {after:>12,.0f}/s · {after / before:.2f}x")
+
+    if slower:
+        raise SystemExit("compiled validator is slower than the handwritten one")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,6 @@
 import os
+from typing import Any, Dict, Optional
+
 from openai import OpenAI
 
 
@@ -32,3 +34,27 @@ def get_default_params() -> dict:
         "temperature": 0.2,
         "top_p": 1.0,
     }
+
+
+# Response format backends:
+# - "json_object": JSON Mode; any JSON object, the schema is enforced by validation + retries
+# - "json_schema": Structured Outputs; decoding is constrained to a strict JSON Schema
+RESPONSE_BACKENDS = ("json_object", "json_schema")
+
+
+def get_response_format(backend: str, json_schema: Optional[Dict[str, Any]] = None) -> dict:
+    """
+    Return the response_format for a backend.
+
+    Parameters:
+        backend: One of RESPONSE_BACKENDS.
+        json_schema: {"name", "strict", "schema"} object, required for "json_schema"
+            (see schemas.to_strict_json_schema).
+    """
+    if backend == "json_object":
+        return get_default_params()["response_format"]
+    if backend == "json_schema":
+        if json_schema is None:
+            raise ValueError('backend "json_schema" needs a strict JSON Schema')
+        return {"type": "json_schema", "json_schema": json_schema}
+    raise ValueError(f"Unknown backend: {backend} (expected one of {', '.join(RESPONSE_BACKENDS)})")
@@ -3,9 +3,12 @@ from typing import Any, Dict, List, Optional, Tuple
 
 from openai import OpenAI
 
-from .config import get_default_params
+from .config import get_default_params, get_response_format
+from .json_repair import RepairStats, repair_json
 from .prompts import DEFAULT_SYSTEM_PROMPT
-from .validators import ValidationResult, validate_structured_answer_lite
+from .schemas import get_structured_answer_lite_schema, to_strict_json_schema
+from .stream_json import IncrementalJsonParser, JsonStreamError
+from .validators import ValidationResult, compile_event_checks, compile_schema
 
 
 def _parse_json(raw_text: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
@@ -36,6 +39,10 @@ class JsonModeChatClient:
         system_prompt: Optional[str] = None,
         max_retries: int = 2,
         debug: bool = False,
+        schema: Optional[Dict[str, Any]] = None,
+        stream: bool = False,
+        repair: bool = True,
+        backend: str = "json_object",
     ):
         """
         Initialize the client.
@@ -45,6 +52,13 @@ class JsonModeChatClient:
             model: Optional model override.
             system_prompt: Optional system prompt override. If not provided, DEFAULT_SYSTEM_PROMPT is used.
             max_retries: Number of corrective retries (default: 1).
+            schema: JSON Schema the answers are validated against (default: StructuredAnswerLite).
+            stream: Stream responses and check them while they arrive; the first
+                definite violation closes the stream and starts the corrective retry.
+            repair: Try local fixes (markdown fences, stray prose, trailing commas,
+                missing closing braces) on unparseable responses before a retry.
+            backend: "json_object" (JSON Mode) or "json_schema" (Structured Outputs with
+                the strict form of `schema`; the local validator still checks the bounds).
         """
         self.client = client
         self.default_params = get_default_params()
@@ -56,6 +70,23 @@ class JsonModeChatClient:
 
         self.debug = debug
 
+        # Compiled once per schema (cached in validators.compile_schema)
+        self.schema = schema or get_structured_answer_lite_schema()
+        self._validate = compile_schema(self.schema)
+        self._check_event = compile_event_checks(self.schema)
+
+        self.backend = backend
+        self.response_format = get_response_format(
+            backend, to_strict_json_schema(self.schema, self.schema.get("title", "response"))
+        )
+
+        self.stream = stream
+        # Streamed attempts closed before the end of the response
+        self.stream_aborts = 0
+
+        self.repair = repair
+        self.repair_stats = RepairStats()
+
         # Message history for multi-turn conversations
         self.messages: List[Dict[str, str]] = []
 
@@ -79,15 +110,73 @@ class JsonModeChatClient:
         completion = self.client.chat.completions.create(
             model=self.default_params["model"],
             messages=self.messages,
-            response_format=self.default_params["response_format"],  # {"type":"json_object"}
+            response_format=self.response_format,  # {"type":"json_object"} or the strict json_schema
             temperature=self.default_params["temperature"],
             top_p=self.default_params.get("top_p", 1.0),
         )
 
         # Chat Completions: assistant text is in choices[0].message.content
-        raw_text = completion.choices[0].message.content or ""
+        message = completion.choices[0].message
+        if getattr(message, "refusal", None):
+            # Structured Outputs: a refusal comes instead of content (it fails parsing and is retried)
+            self._debug(f"Model refused: {message.refusal}")
+        raw_text = message.content or ""
         return raw_text
 
+    def _stream_model(self) -> Tuple[str, Optional[Tuple[str, List[str]]]]:
+        """
+        Stream a Chat Completions call, parsing and checking the JSON as it arrives.
+
+        Returns:
+            (raw_text, failure): failure is (error_code, details) if the stream
+            was closed early on a syntax error or a contract violation, else
+            None and raw_text is the complete response.
+        """
+        stream = self.client.chat.completions.create(
+            model=self.default_params["model"],
+            messages=self.messages,
+            response_format=self.response_format,  # {"type":"json_object"} or the strict json_schema
+            temperature=self.default_params["temperature"],
+            top_p=self.default_params.get("top_p", 1.0),
+            stream=True,
+        )
+
+        parser: Optional[IncrementalJsonParser] = IncrementalJsonParser()
+        parts: List[str] = []
+        failure: Optional[Tuple[str, List[str]]] = None
+        with stream:
+            for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if not delta:
+                    continue
+                parts.append(delta)
+                if parser is None:
+                    continue
+                try:
+                    events = parser.feed(delta)
+                except JsonStreamError as e:
+                    if self.repair:
+                        # Read to the end: the local repair stage may still fix it.
+                        self._debug(f"Stream is not plain JSON ({e}); checks stop, reading on for repair.")
+                        parser = None
+                        continue
+                    failure = ("INVALID_JSON", [f"JSON parse error: {e}"])
+                    break
+                for event in events:
+                    errors = self._check_event(event)
+                    if errors:
+                        failure = ("SCHEMA_VALIDATION_FAILED", errors)
+                        break
+                if failure:
+                    break
+        # Leaving the `with` block closes the HTTP response: no more tokens are generated.
+
+        raw_text = "".join(parts)
+        if failure:
+            self.stream_aborts += 1
+            self._debug(f"Stream closed after {len(raw_text)} chars: {failure[0]} {failure[1]}")
+        return raw_text, failure
+
     def send(self, user_input: str) -> Dict[str, Any]:
         """
         Send user input, enforce JSON-only output, validate the contract, and optionally retry once.
@@ -104,10 +193,42 @@ class JsonModeChatClient:
 
         for attempt in range(self.max_retries + 1):
             self._debug(f"Attempt {attempt + 1}/{self.max_retries + 1}")
-            last_raw = self._call_model()
+            if self.stream:
+                last_raw, failure = self._stream_model()
+            else:
+                last_raw, failure = self._call_model(), None
+
+            # Streaming: a violation was found before the response was complete
+            if failure:
+                error_code, details = failure
+                if attempt < self.max_retries:
+                    self._inject_corrective_system_message(
+                        error_code=error_code,
+                        details=details,
+                        raw_response=last_raw,
+                    )
+                    continue
+
+                return {
+                    "error": error_code,
+                    "raw_response": last_raw,
+                    "details": details if error_code == "SCHEMA_VALIDATION_FAILED" else details[0],
+                    "stream_aborted": True,
+                }
 
             # Attempt to parse JSON
             data, parse_error = _parse_json(last_raw)
+            repaired = None
+            if parse_error and self.repair:
+                # Mechanical failures are fixed locally instead of spending a round-trip
+                self.repair_stats.attempts += 1
+                repaired = repair_json(last_raw)
+                if repaired.data is not None:
+                    self._debug(f"Local repair ({', '.join(repaired.fixes)}) made the response parse.")
+                    data, parse_error = repaired.data, None
+                else:
+                    repaired = None
+
             if parse_error:
                 last_parse_error = parse_error
 
@@ -128,10 +249,15 @@ class JsonModeChatClient:
                 }
 
             # Manual contract validation
-            result: ValidationResult = validate_structured_answer_lite(data)
+            result: ValidationResult = self._validate(data)
             if result.ok:
                 self._debug("Validation passed. Returning final JSON response.")
-                # Store assistant message in history (as the raw JSON string)
+                if repaired is not None:
+                    self.repair_stats.successes += 1
+                    if attempt < self.max_retries:
+                        self.repair_stats.saved_round_trips += 1
+                    last_raw = repaired.text
+                # Store assistant message in history (as the raw JSON string, or its repaired form)
                 self.messages.append({"role": "assistant", "content": last_raw})
                 return data
 
@@ -0,0 +1,187 @@
+"""
+Local, deterministic repair of almost-JSON responses.
+
+No external libraries are used on purpose (learning clarity).
+When a response does not parse, a few mechanical fixes are tried before a
+corrective retry is spent on the model. Each fix is applied only if it is
+needed, in this order:
+
+- fences: keep the body of a ```json ... ``` block
+- prose: keep the text from the first "{" to the matching "}", dropping
+  sentences around the object
+- trailing_commas: remove commas right before "}" or "]"
+- closers: append the "}" missing at the end of a truncated object
+
+Repairs never invent content: only objects cut right after a complete string
+or container are closed (a cut number or array is left alone), and a repaired
+object still goes through contract validation like any other.
+"""
+
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+_FENCE = re.compile(r"```[a-zA-Z]*[ \t]*\n?(.*?)(?:```|$)", re.DOTALL)
+
+
+@dataclass
+class RepairResult:
+    """
+    Attributes:
+        data: The parsed object, or None if no repair made the text parse.
+        text: The repaired JSON text (when data is set).
+        fixes: Names of the fixes that were applied, in order.
+    """
+    data: Optional[Dict[str, Any]]
+    text: str = ""
+    fixes: List[str] = field(default_factory=list)
+
+
+@dataclass
+class RepairStats:
+    """Counters of the repair stage of a client."""
+    attempts: int = 0  # responses that failed to parse and went through repair_json
+    successes: int = 0  # repaired responses that also passed contract validation
+    saved_round_trips: int = 0  # successes that made a corrective retry unnecessary
+
+    def as_dict(self) -> Dict[str, int]:
+        return {"attempts": self.attempts, "successes": self.successes, "saved_round_trips": self.saved_round_trips}
+
+
+def _scan(text: str) -> Tuple[List[str], bool, str, bool]:
+    """
+    String-aware scan. Returns (open brackets, inside a string, last significant
+    character outside strings ('"' after a string), whether that string was a key).
+    """
+    stack: List[str] = []
+    in_string = escape = is_key = False
+    last = ""
+    for c in text:
+        if in_string:
+            if escape:
+                escape = False
+            elif c == "\\":
+                escape = True
+            elif c == '"':
+                in_string = False
+                last = '"'
+        elif c == '"':
+            in_string = True
+            is_key = bool(stack) and stack[-1] == "{" and last in ("{", ",")
+        elif c in "{[":
+            stack.append(c)
+            last = c
+        elif c in "}]":
+            if stack:
+                stack.pop()
+            last = c
+        elif not c.isspace():
+            last = c
+    return stack, in_string, last, is_key
+
+
+def _strip_fences(text: str) -> Optional[str]:
+    m = _FENCE.search(text)
+    brace = text.find("{")
+    # A fence after the first "{" is part of a string value (e.g. code in an answer).
+    if m is None or (brace >= 0 and m.start() > brace):
+        return None
+    return m.group(1).strip()
+
+
+def _extract_object(text: str) -> Optional[str]:
+    start = text.find("{")
+    if start < 0:
+        return None
+    # The end of the first balanced object, if it closes; else everything after "{"
+    depth, in_string, escape = 0, False, False
+    for i in range(start, len(text)):
+        c = text[i]
+        if in_string:
+            if escape:
+                escape = False
+            elif c == "\\":
+                escape = True
+            elif c == '"':
+                in_string = False
+        elif c == '"':
+            in_string = True
+        elif c in "{[":
+            depth += 1
+        elif c in "}]":
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return text[start:].rstrip()
+
+
+def _remove_trailing_commas(text: str) -> str:
+    out: List[str] = []
+    in_string = escape = False
+    pending_comma: Optional[int] = None  # index in `out` of a comma not yet followed by a value
+    for c in text:
+        if in_string:
+            if escape:
+                escape = False
+            elif c == "\\":
+                escape = True
+            elif c == '"':
+                in_string = False
+            out.append(c)
+            continue
+        if c.isspace():
+            out.append(c)
+            continue
+        if c in "}]" and pending_comma is not None:
+            out[pending_comma] = ""
+        pending_comma = len(out) if c == "," else None
+        if c == '"':
+            in_string = True
+        out.append(c)
+    return "".join(out)
+
+
+def _close_truncated(text: str) -> Optional[str]:
+    # Only objects are closed, and only after a complete string or container:
+    # a cut number ("0.8" of "0.85") or an open array (more items may have
+    # followed) would silently change the data. A closed object that misses
+    # keys is caught by contract validation.
+    stack, in_string, last, is_key = _scan(text)
+    if not stack or in_string or "[" in stack:
+        return None
+    if last not in ('"', "}", "]") or (last == '"' and is_key):
+        return None
+    return text.rstrip() + "}" * len(stack)
+
+
+def _loads_object(text: str) -> Optional[Dict[str, Any]]:
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def repair_json(raw_text: str) -> RepairResult:
+    """
+    Try the fixes in order, keeping each one that applies, until the text
+    parses as a JSON object.
+    """
+    text = raw_text.strip()
+    fixes: List[str] = []
+    for name, fix in (
+        ("fences", _strip_fences),
+        ("prose", _extract_object),
+        ("trailing_commas", _remove_trailing_commas),
+        ("closers", _close_truncated),
+    ):
+        fixed = fix(text)
+        if fixed is None or fixed == text:
+            continue
+        text = fixed
+        fixes.append(name)
+        data = _loads_object(text)
+        if data is not None:
+            return RepairResult(data, text, fixes)
+    return RepairResult(None, text, fixes)
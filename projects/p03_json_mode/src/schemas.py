@@ -115,6 +115,42 @@ STRUCTURED_ANSWER_SCHEMA: Dict[str, Any] = {
 }
 
 
+# Keywords dropped for Structured Outputs strict mode: annotations, and bounds
+# the decoder does not enforce. The local validator still checks the bounds.
+_STRICT_DROPPED = {"$schema", "$id", "title", "minLength", "minimum", "maximum"}
+
+
+def to_strict_json_schema(schema: Dict[str, Any], name: str) -> Dict[str, Any]:
+    """
+    Return the `json_schema` object of a strict Structured Outputs response_format
+    for one of the schemas above.
+
+    Every object lists all its properties as required and forbids extra keys
+    (strict mode needs both), and `const` becomes a one-value `enum`.
+    """
+
+    def convert(node: Dict[str, Any]) -> Dict[str, Any]:
+        out: Dict[str, Any] = {}
+        for key, value in node.items():
+            if key in _STRICT_DROPPED:
+                continue
+            if key == "properties":
+                out[key] = {prop: convert(sub) for prop, sub in value.items()}
+            elif key == "items":
+                out[key] = convert(value)
+            elif key == "const":
+                out["enum"] = [value]
+            else:
+                out[key] = value
+        if out.get("type") == "object":
+            out["required"] = list(out.get("properties", {}))
+            out["additionalProperties"] = False
+        return out
+
+    strict = convert(schema)
+    return {"name": name, "strict": True, "schema": strict}
+
+
 def get_structured_answer_lite_schema() -> Dict[str, Any]:
     """
     Return the JSON Schema for the StructuredAnswerLite contract (v1.0).
@@ -0,0 +1,230 @@
+"""
+Incremental JSON parsing for streamed JSON Mode responses.
+
+No external libraries are used on purpose (learning clarity).
+IncrementalJsonParser is a push parser: feed() takes response deltas as they
+arrive and returns what they completed, as events:
+
+- ("open", path, "object" | "array"): a container starts at `path`
+- ("key", path, key): an object at `path` received the key `key`
+- ("value", path, value): the value at `path` is complete (scalars, and
+  containers once closed, as Python objects)
+
+Paths are tuples of keys and array indexes, () for the top-level object.
+Syntax errors raise JsonStreamError as soon as they are certain, so a stream
+that is not going to parse can be closed early.
+"""
+
+import json
+from dataclasses import dataclass
+from typing import Any, List, Optional, Tuple, Union
+
+Path = Tuple[Union[str, int], ...]
+
+_WHITESPACE = " \t\n\r"
+_NUMBER_CHARS = "0123456789+-.eE"
+_LITERALS = {"true": True, "false": False, "null": None}
+
+
+class JsonStreamError(ValueError):
+    """The streamed text can no longer become valid JSON."""
+
+
+@dataclass
+class JsonEvent:
+    kind: str  # "open", "key" or "value"
+    path: Path
+    value: Any = None
+
+
+class _Frame:
+    __slots__ = ("container", "path", "key")
+
+    def __init__(self, container: Any, path: Path):
+        self.container = container
+        self.path = path
+        self.key: Optional[str] = None  # pending key (objects)
+
+
+class IncrementalJsonParser:
+    """
+    Push parser for one JSON object, fed in arbitrary chunks.
+
+    Attributes:
+        done: True once the top-level object is closed.
+        result: The parsed object when done.
+    """
+
+    def __init__(self):
+        self._stack: List[_Frame] = []
+        # What the next significant character may be:
+        # root, value, value_or_end, key, key_or_end, colon, after_value, end
+        self._expect = "root"
+        self._token: Optional[List[str]] = None  # partial string / number / literal
+        self._token_kind: Optional[str] = None  # "string", "key", "number", "literal"
+        self._escape = False
+        self.done = False
+        self.result: Any = None
+
+    def feed(self, chunk: str) -> List[JsonEvent]:
+        """Consume `chunk` and return the events it completed."""
+        events: List[JsonEvent] = []
+        i, n = 0, len(chunk)
+        while i < n:
+            kind = self._token_kind
+            if kind == "string" or kind == "key":
+                i = self._read_string(chunk, i, events)
+                continue
+            c = chunk[i]
+            if kind == "number":
+                if c in _NUMBER_CHARS:
+                    self._token.append(c)
+                    i += 1
+                    continue
+                self._finish_number(events)  # `c` is handled below
+            elif kind == "literal":
+                self._read_literal(c, events)
+                i += 1
+                continue
+
+            if c in _WHITESPACE:
+                i += 1
+                continue
+            self._significant(c, events)
+            i += 1
+        return events
+
+    # --- Tokens ----------------------------------------------------
+
+    def _read_string(self, chunk: str, i: int, events: List[JsonEvent]) -> int:
+        token = self._token
+        n = len(chunk)
+        while i < n:
+            c = chunk[i]
+            i += 1
+            if self._escape:
+                self._escape = False
+                token.append(c)
+            elif c == "\\":
+                self._escape = True
+                token.append(c)
+            elif c == '"':
+                try:
+                    text = json.loads('"' + "".join(token) + '"')
+                except ValueError as e:
+                    raise JsonStreamError(f"invalid string: {e}") from None
+                kind = self._token_kind
+                self._token, self._token_kind = None, None
+                if kind == "key":
+                    frame = self._stack[-1]
+                    frame.key = text
+                    events.append(JsonEvent("key", frame.path, text))
+                    self._expect = "colon"
+                else:
+                    self._complete(text, events)
+                return i
+            else:
+                token.append(c)
+        return i
+
+    def _finish_number(self, events: List[JsonEvent]) -> None:
+        text = "".join(self._token)
+        self._token, self._token_kind = None, None
+        try:
+            value = json.loads(text)
+        except ValueError:
+            raise JsonStreamError(f"invalid number {text!r}") from None
+        self._complete(value, events)
+
+    def _read_literal(self, c: str, events: List[JsonEvent]) -> None:
+        self._token.append(c)
+        text = "".join(self._token)
+        if text in _LITERALS:
+            self._token, self._token_kind = None, None
+            self._complete(_LITERALS[text], events)
+        elif not any(literal.startswith(text) for literal in _LITERALS):
+            raise JsonStreamError(f"invalid literal {text!r}")
+
+    # --- Structure -------------------------------------------------
+
+    def _significant(self, c: str, events: List[JsonEvent]) -> None:
+        expect = self._expect
+        if expect == "root":
+            if c != "{":
+                raise JsonStreamError("Top-level JSON value must be an object (dict).")
+            self._open({}, (), "object", events)
+        elif expect == "value" or expect == "value_or_end":
+            if expect == "value_or_end" and c == "]":
+                self._close("]", events)
+            else:
+                self._start_value(c, events)
+        elif expect == "key_or_end" or expect == "key":
+            if c == '"':
+                self._token, self._token_kind = [], "key"
+            elif expect == "key_or_end" and c == "}":
+                self._close("}", events)
+            else:
+                raise JsonStreamError(f"expected a key, got {c!r}")
+        elif expect == "colon":
+            if c != ":":
+                raise JsonStreamError(f"expected ':', got {c!r}")
+            self._expect = "value"
+        elif expect == "after_value":
+            frame = self._stack[-1]
+            if c == ",":
+                self._expect = "key" if isinstance(frame.container, dict) else "value"
+            elif c in "}]":
+                self._close(c, events)
+            else:
+                raise JsonStreamError(f"expected ',' or a closing bracket, got {c!r}")
+        else:  # end
+            raise JsonStreamError(f"extra data after the JSON object: {c!r}")
+
+    def _child_path(self) -> Path:
+        frame = self._stack[-1]
+        if isinstance(frame.container, dict):
+            return frame.path + (frame.key,)
+        return frame.path + (len(frame.container),)
+
+    def _start_value(self, c: str, events: List[JsonEvent]) -> None:
+        if c == "{":
+            self._open({}, self._child_path(), "object", events)
+        elif c == "[":
+            self._open([], self._child_path(), "array", events)
+        elif c == '"':
+            self._token, self._token_kind = [], "string"
+        elif c == "-" or c.isdigit():
+            self._token, self._token_kind = [c], "number"
+        elif c in "tfn":
+            self._token, self._token_kind = [c], "literal"
+        else:
+            raise JsonStreamError(f"expected a value, got {c!r}")
+
+    def _open(self, container: Any, path: Path, kind: str, events: List[JsonEvent]) -> None:
+        self._stack.append(_Frame(container, path))
+        events.append(JsonEvent("open", path, kind))
+        self._expect = "key_or_end" if kind == "object" else "value_or_end"
+
+    def _close(self, c: str, events: List[JsonEvent]) -> None:
+        frame = self._stack[-1]
+        if (c == "}") != isinstance(frame.container, dict):
+            raise JsonStreamError(f"mismatched {c!r}")
+        self._stack.pop()
+        self._complete(frame.container, events, frame.path)
+
+    def _complete(self, value: Any, events: List[JsonEvent], path: Optional[Path] = None) -> None:
+        """A value is finished: attach it to its parent and emit it."""
+        if not self._stack:
+            self.done, self.result = True, value
+            self._expect = "end"
+            events.append(JsonEvent("value", (), value))
+            return
+        frame = self._stack[-1]
+        if path is None:
+            path = self._child_path()
+        if isinstance(frame.container, dict):
+            frame.container[frame.key] = value
+        else:
+            frame.container.append(value)
+        events.append(JsonEvent("value", path, value))
+        self._expect = "after_value"
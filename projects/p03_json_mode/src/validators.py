@@ -2,19 +2,27 @@
 Strict validators for Project 03 JSON Mode.
 
 No external libraries are used on purpose (learning clarity).
-We enforce the StructuredAnswerLite contract strictly:
-- required fields present at every level
-- no extra fields (additionalProperties is forbidden)
-- correct data types
-- numeric bounds (confidence)
-- enum constraints (task.type)
-- exact schema_version
+The JSON Schemas in schemas.py are the single source of truth: compile_schema
+turns the draft 2020-12 subset they use into a Python validator closure,
+built once per schema and cached. Supported keywords:
+- type (object, array, string, number, integer, boolean, null)
+- properties, required, additionalProperties: false
+- items
+- enum, const
+- minLength (counted after stripping surrounding whitespace, so a
+  whitespace-only string is not "non-empty")
+- minimum, maximum
+
+compile_event_checks does the same for a response that is still streaming:
+it checks each key and value as stream_json reports it, so a violation is
+found without waiting for the rest of the object.
 """
 
 from dataclasses import dataclass, field
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
-from .schemas import SCHEMA_VERSION, get_structured_answer_lite_schema
+from .schemas import get_structured_answer_lite_schema
+from .stream_json import JsonEvent
 
 
 @dataclass
@@ -23,25 +31,219 @@ class ValidationResult:
     errors: List[str] = field(default_factory=list)
 
 
-def _is_non_empty_str(value: Any) -> bool:
-    return isinstance(value, str) and len(value.strip()) > 0
+class SchemaCompileError(ValueError):
+    """Raised when a schema uses a keyword outside the supported subset."""
+
+
+# check(value, errors) appends human-readable errors for one schema node.
+# Paths and messages are fixed when the node is compiled, so a valid value
+# costs only the checks themselves.
+Check = Callable[[Any, List[str]], None]
+
+# Keywords that carry no validation rule
+_ANNOTATIONS = {"$schema", "$id", "title", "description", "examples", "default"}
+_SUPPORTED = _ANNOTATIONS | {
+    "type",
+    "properties",
+    "required",
+    "additionalProperties",
+    "items",
+    "enum",
+    "const",
+    "minLength",
+    "minimum",
+    "maximum",
+}
+
+# Array items are compiled with this index placeholder, filled in on error.
+_INDEX = "[*]"
+
+# Cache: id(schema) -> (schema, validator). The schema is kept so its id stays valid.
+_COMPILED: Dict[int, Tuple[Dict[str, Any], Callable[[Any], ValidationResult]]] = {}
+_COMPILED_EVENTS: Dict[int, Tuple[Dict[str, Any], Callable[[JsonEvent], List[str]]]] = {}
+
+
+def _is_number(value: Any) -> bool:
+    # JSON Schema: booleans are not numbers
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _compile_object(schema: Dict[str, Any], path: str) -> Check:
+    label = path or "payload"
+    prefix = f"{path}." if path else ""
+    properties = schema.get("properties", {})
+    required = tuple((key, f"{label}.{key} is missing") for key in schema.get("required", ()))
+    closed = schema.get("additionalProperties", True) is False
+    allowed = frozenset(properties)
+    children = tuple((key, _compile_node(sub, prefix + key)) for key, sub in properties.items())
+    # Fast path: a closed object whose properties are all required has exactly these keys.
+    exact = allowed if closed and frozenset(key for key, _ in required) == allowed else None
+    not_object = f"{label} must be an object"
+
+    def check(value: Any, errors: List[str]) -> None:
+        if not isinstance(value, dict):
+            errors.append(not_object)
+            return
+        if exact is None or value.keys() != exact:
+            for key, missing in required:
+                if key not in value:
+                    errors.append(missing)
+            if closed:
+                for key in value:
+                    if key not in allowed:
+                        errors.append(f"{label} has unexpected key '{key}'")
+        for key, child in children:
+            if key in value:
+                child(value[key], errors)
+
+    return check
+
+
+def _compile_array(schema: Dict[str, Any], path: str) -> Check:
+    items = _compile_node(schema["items"], path + _INDEX) if "items" in schema else None
+    not_array = f"{path} must be an array"
+    placeholder = path + _INDEX
+
+    def check(value: Any, errors: List[str]) -> None:
+        if not isinstance(value, list):
+            errors.append(not_array)
+            return
+        if items is not None:
+            for i, item in enumerate(value):
+                n = len(errors)
+                items(item, errors)
+                for j in range(n, len(errors)):
+                    errors[j] = errors[j].replace(placeholder, f"{path}[{i}]", 1)
+
+    return check
+
+
+def _compile_string(schema: Dict[str, Any], path: str) -> Check:
+    min_length = schema.get("minLength", 0)
+    if min_length == 1:
+        message = f"{path} must be a non-empty string"
+    elif min_length:
+        message = f"{path} must be a string of at least {min_length} non-blank characters"
+    else:
+        message = f"{path} must be a string"
+
+    def check(value: Any, errors: List[str]) -> None:
+        # Stricter than JSON Schema on purpose: "   " is blank, not a non-empty answer.
+        if not isinstance(value, str) or len(value.strip()) < min_length:
+            errors.append(message)
+
+    return check
 
 
-def _check_required_keys(obj: Dict[str, Any], required: List[str], path: str, errors: List[str]) -> None:
-    for key in required:
-        if key not in obj:
-            errors.append(f"{path}.{key} is missing")
+def _compile_number(schema: Dict[str, Any], path: str, integer: bool) -> Check:
+    low: Optional[float] = schema.get("minimum")
+    high: Optional[float] = schema.get("maximum")
+    wrong_type = f"{path} must be {'an integer' if integer else 'a number'}"
+    if low is not None and high is not None:
+        out_of_bounds = f"{path} must be between {low} and {high}"
+    elif low is not None:
+        out_of_bounds = f"{path} must be >= {low}"
+    else:
+        out_of_bounds = f"{path} must be <= {high}"
+
+    def check(value: Any, errors: List[str]) -> None:
+        if not _is_number(value) or (integer and not isinstance(value, int)):
+            errors.append(wrong_type)
+        elif (low is not None and value < low) or (high is not None and value > high):
+            errors.append(out_of_bounds)
+
+    return check
+
+
+def _compile_node(schema: Dict[str, Any], path: str) -> Check:
+    unsupported = set(schema) - _SUPPORTED
+    if unsupported:
+        raise SchemaCompileError(f"{path or 'payload'}: unsupported schema keywords {sorted(unsupported)}")
+
+    checks: List[Check] = []
+    kind = schema.get("type")
+    if kind == "object":
+        checks.append(_compile_object(schema, path))
+    elif kind == "array":
+        checks.append(_compile_array(schema, path))
+    elif kind == "string" and "const" not in schema and "enum" not in schema:
+        checks.append(_compile_string(schema, path))
+    elif kind in ("number", "integer"):
+        checks.append(_compile_number(schema, path, integer=kind == "integer"))
+    elif kind == "boolean":
+        message = f"{path} must be a boolean"
+        checks.append(lambda value, errors: isinstance(value, bool) or errors.append(message))
+    elif kind == "null":
+        message = f"{path} must be null"
+        checks.append(lambda value, errors: value is None or errors.append(message))
+    elif kind not in (None, "string"):
+        raise SchemaCompileError(f"{path or 'payload'}: unsupported type {kind!r}")
+
+    # A string enum / const implies the type: one message instead of two.
+    if "enum" in schema:
+        options = list(schema["enum"])
+        try:
+            allowed = frozenset(options)
+        except TypeError:
+            raise SchemaCompileError(f"{path or 'payload'}: enum values must be scalars") from None
+        not_allowed = f"{path} must be one of {options}"
+
+        def check_enum(value: Any, errors: List[str]) -> None:
+            if isinstance(value, (dict, list)) or value not in allowed:
+                errors.append(not_allowed)
+
+        checks.append(check_enum)
+    if "const" in schema:
+        const = schema["const"]
+        not_const = f"{path} must be '{const}'"
+
+        def check_const(value: Any, errors: List[str]) -> None:
+            if type(value) is not type(const) or value != const:
+                errors.append(not_const)
+
+        checks.append(check_const)
+
+    if not checks:
+        return lambda value, errors: None
+    if len(checks) == 1:
+        return checks[0]
+
+    def check_all(value: Any, errors: List[str]) -> None:
+        for check in checks:
+            check(value, errors)
+
+    return check_all
+
+
+def compile_schema(schema: Dict[str, Any]) -> Callable[[Any], ValidationResult]:
+    """
+    Return a validator for `schema`, compiling it on first use.
+
+    Errors name fields the way the contract is written ("task.type",
+    "quality.risks[2]"), with "payload" for the top level.
+
+    Raises:
+        SchemaCompileError if the schema uses keywords outside the subset.
+    """
+    cached = _COMPILED.get(id(schema))
+    if cached is not None and cached[0] is schema:
+        return cached[1]
+
+    root = _compile_node(schema, "")
 
+    def validate(payload: Any) -> ValidationResult:
+        errors: List[str] = []
+        root(payload, errors)
+        return ValidationResult(ok=not errors, errors=errors)
 
-def _check_no_extra_keys(obj: Dict[str, Any], allowed: List[str], path: str, errors: List[str]) -> None:
-    for key in obj.keys():
-        if key not in allowed:
-            errors.append(f"{path} has unexpected key '{key}'")
+    _COMPILED[id(schema)] = (schema, validate)
+    return validate
 
 
 def validate_structured_answer_lite(payload: Any) -> ValidationResult:
     """
-    Strict validation for StructuredAnswerLite v1.0.
+    Strict validation for StructuredAnswerLite v1.0, driven by
+    STRUCTURED_ANSWER_LITE_SCHEMA.
 
     Contract:
     {
@@ -51,110 +253,57 @@ def validate_structured_answer_lite(payload: Any) -> ValidationResult:
       "debug": {"schema_version": "1.0", "model": "..."}
     }
     """
-    schema = get_structured_answer_lite_schema()
-    errors: List[str] = []
-
-    if not isinstance(payload, dict):
-        return ValidationResult(ok=False, errors=["payload must be an object"])
-
-    # --- top-level ---
-    top_allowed = list(schema["properties"].keys())
-    top_required = schema["required"]
-
-    _check_required_keys(payload, top_required, "payload", errors)
-    _check_no_extra_keys(payload, top_allowed, "payload", errors)
-
-    task = payload.get("task")
-    answer = payload.get("answer")
-    quality = payload.get("quality")
-    debug = payload.get("debug")
-
-    # --- task ---
-    task_schema = schema["properties"]["task"]
-    task_allowed = list(task_schema["properties"].keys())
-    task_required = task_schema["required"]
-    allowed_task_types = task_schema["properties"]["type"]["enum"]
-
-    if not isinstance(task, dict):
-        errors.append("task must be an object")
-        task = {}
-    _check_required_keys(task, task_required, "task", errors)
-    _check_no_extra_keys(task, task_allowed, "task", errors)
-
-    ttype = task.get("type")
-    if ttype not in allowed_task_types:
-        errors.append(f"task.type must be one of {allowed_task_types}")
-
-    user_intent = task.get("user_intent")
-    if not _is_non_empty_str(user_intent):
-        errors.append("task.user_intent must be a non-empty string")
-
-    # --- answer ---
-    answer_schema = schema["properties"]["answer"]
-    answer_allowed = list(answer_schema["properties"].keys())
-    answer_required = answer_schema["required"]
-
-    if not isinstance(answer, dict):
-        errors.append("answer must be an object")
-        answer = {}
-    _check_required_keys(answer, answer_required, "answer", errors)
-    _check_no_extra_keys(answer, answer_allowed, "answer", errors)
-
-    text = answer.get("text")
-    if not _is_non_empty_str(text):
-        errors.append("answer.text must be a non-empty string")
-
-    # --- quality ---
-    quality_schema = schema["properties"]["quality"]
-    quality_allowed = list(quality_schema["properties"].keys())
-    quality_required = quality_schema["required"]
-
-    if not isinstance(quality, dict):
-        errors.append("quality must be an object")
-        quality = {}
-    _check_required_keys(quality, quality_required, "quality", errors)
-    _check_no_extra_keys(quality, quality_allowed, "quality", errors)
-
-    confidence = quality.get("confidence")
-    if not isinstance(confidence, (int, float)):
-        errors.append("quality.confidence must be a number")
-    else:
-        if confidence < 0.0 or confidence > 1.0:
-            errors.append("quality.confidence must be between 0.0 and 1.0")
+    return compile_schema(get_structured_answer_lite_schema())(payload)
 
-    assumptions = quality.get("assumptions")
-    if not isinstance(assumptions, list):
-        errors.append("quality.assumptions must be an array")
-    else:
-        for i, item in enumerate(assumptions):
-            if not isinstance(item, str):
-                errors.append(f"quality.assumptions[{i}] must be a string")
 
-    risks = quality.get("risks")
-    if not isinstance(risks, list):
-        errors.append("quality.risks must be an array")
-    else:
-        for i, item in enumerate(risks):
-            if not isinstance(item, str):
-                errors.append(f"quality.risks[{i}] must be a string")
-
-    # --- debug ---
-    debug_schema = schema["properties"]["debug"]
-    debug_allowed = list(debug_schema["properties"].keys())
-    debug_required = debug_schema["required"]
-
-    if not isinstance(debug, dict):
-        errors.append("debug must be an object")
-        debug = {}
-    _check_required_keys(debug, debug_required, "debug", errors)
-    _check_no_extra_keys(debug, debug_allowed, "debug", errors)
-
-    version = debug.get("schema_version")
-    if version != SCHEMA_VERSION:
-        errors.append(f"debug.schema_version must be '{SCHEMA_VERSION}'")
-
-    model = debug.get("model")
-    if not _is_non_empty_str(model):
-        errors.append("debug.model must be a non-empty string")
-
-    return ValidationResult(ok=(len(errors) == 0), errors=errors)
+def _node_table(schema: Dict[str, Any], pattern: Tuple[str, ...], path: str, table: Dict) -> None:
+    """Index every node by path pattern (array indexes as "*") with its check and label."""
+    table[pattern] = (schema, _compile_node(schema, path), path or "payload")
+    kind = schema.get("type")
+    if kind == "object":
+        prefix = f"{path}." if path else ""
+        for key, sub in schema.get("properties", {}).items():
+            _node_table(sub, pattern + (key,), prefix + key, table)
+    elif kind == "array" and "items" in schema:
+        _node_table(schema["items"], pattern + ("*",), path + _INDEX, table)
+
+
+def compile_event_checks(schema: Dict[str, Any]) -> Callable[[JsonEvent], List[str]]:
+    """
+    Return check(event) -> errors for a streamed response, compiling on first use.
+
+    Only definite violations are reported, with the messages of compile_schema:
+    an unexpected key as soon as it is read, a container of the wrong type as
+    soon as it opens, and any completed value that fails its node's checks
+    (for objects this includes missing keys, known when the object closes).
+    Paths outside the schema are not checked.
+    """
+    cached = _COMPILED_EVENTS.get(id(schema))
+    if cached is not None and cached[0] is schema:
+        return cached[1]
+
+    table: Dict[Tuple[str, ...], Tuple[Dict[str, Any], Check, str]] = {}
+    _node_table(schema, (), "", table)
+
+    def check(event: JsonEvent) -> List[str]:
+        path = event.path
+        entry = table.get(tuple("*" if isinstance(p, int) else p for p in path))
+        if entry is None:
+            return []
+        node, node_check, label = entry
+        errors: List[str] = []
+        if event.kind == "key":
+            if node.get("additionalProperties", True) is False and event.value not in node.get("properties", {}):
+                errors.append(f"{label} has unexpected key '{event.value}'")
+        elif event.kind == "open":
+            if node.get("type") != event.value:
+                # The type error of an empty container of the kind that was opened
+                node_check({} if event.value == "object" else [], errors)
+        else:
+            node_check(event.value, errors)
+        for i in (p for p in path if isinstance(p, int)):
+            errors = [e.replace(_INDEX, f"[{i}]", 1) for e in errors]
+        return errors
+
+    _COMPILED_EVENTS[id(schema)] = (schema, check)
+    return check
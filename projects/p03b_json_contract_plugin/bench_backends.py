@@ -0,0 +1,94 @@
+"""
+Benchmark: JSON Mode vs. Structured Outputs backends of JsonModeChatClient.
+
+This file is NOT part of the project deliverables.
+It runs the same inputs through both backends against the API (needs
+OPENAI_API_KEY) and compares, per contract:
+- the valid-result rate
+- the retry rate (items that needed more than one model call)
+- the model calls per item
+- p50 / p95 latency per item
+
+With "json_schema" the structure, types and enums come from the decoder
+(the contract's strict JSON Schema, see contracts/compiler.py). Only semantic
+rules such as the confidence bounds can still cost a retry.
+
+Run from the repository root:
+    python -m projects.p03b_json_contract_plugin.bench_backends --copies 5
+    python -m projects.p03b_json_contract_plugin.bench_backends --show-schema support_ticket
+"""
+
+import argparse
+import json
+import statistics
+import time
+from collections import Counter
+from typing import Dict, List
+
+from .src.config import RESPONSE_BACKENDS, get_openai_client
+from .src.contracts.registry import get_contract
+from .src.json_client import BatchItemResult, JsonModeChatClient
+from .test_batch import CUSTOMER_MESSAGES
+
+INPUTS: Dict[str, List[str]] = {
+    "support_ticket": [
+        f"Customer message:\n{m}\n\nExtract a support ticket from this message." for m in CUSTOMER_MESSAGES
+    ],
+    "structured_answer_lite": [
+        "Explain what JSON Mode is and when a production system should use it.",
+        "Summarize the difference between JSON Mode and Structured Outputs in two sentences.",
+        "Classify this sentence by sentiment: 'The delivery was late again, unacceptable.'",
+        "Extract the dates mentioned in: 'We met on March 3rd and again on 2024-04-10.'",
+        "What is a retry budget, and why should a client cap it?",
+        "List the risks of trusting model output without validation.",
+    ],
+}
+
+
+def _percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def _report(backend: str, items: List[BatchItemResult], elapsed: float) -> None:
+    latencies = [item.latency_s for item in items]
+    n = len(items)
+    print(
+        f"{backend:<12} {n:>4} {100 * sum(i.ok for i in items) / n:>6.1f}% "
+        f"{100 * sum(i.attempts > 1 for i in items) / n:>7.1f}% "
+        f"{sum(i.attempts for i in items) / n:>6.2f} "
+        f"{statistics.median(latencies):>7.2f} {_percentile(latencies, 0.95):>7.2f} {elapsed:>7.1f}"
+    )
+    errors = Counter(item.result.get("error") for item in items if not item.ok)
+    if errors:
+        print(f"{'':<12} errors: {dict(errors)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare retry rate and latency of the two response backends.")
+    parser.add_argument("--contract", choices=sorted(INPUTS), nargs="+", default=sorted(INPUTS))
+    parser.add_argument("--copies", type=int, default=3, help="Repeat each input N times")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--max-retries", type=int, default=2)
+    parser.add_argument("--show-schema", default=None, help="Print a contract's strict JSON Schema and exit")
+    args = parser.parse_args()
+
+    if args.show_schema:
+        print(json.dumps(get_contract(args.show_schema).json_schema, indent=2, ensure_ascii=False))
+        return
+
+    client = get_openai_client()
+    for name in args.contract:
+        contract = get_contract(name)
+        inputs = INPUTS[name] * max(1, args.copies)
+        print(f"\n{name}: {len(inputs)} inputs per backend")
+        print(f"{'backend':<12} {'n':>4} {'valid':>7} {'retried':>8} {'calls':>6} {'p50 s':>7} {'p95 s':>7} {'wall s':>7}")
+        for backend in RESPONSE_BACKENDS:
+            chat = JsonModeChatClient(client, contract, max_retries=args.max_retries, backend=backend)
+            start = time.perf_counter()
+            items = chat.extract_batch(inputs, concurrency=args.concurrency)
+            _report(backend, items, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+"""
+Benchmark: sequential corrective retries vs. multi-candidate sampling.
+
+This file is NOT part of the project deliverables.
+It replays a corpus of recorded responses to compare, for the same max_retries:
+- the valid-result rate
+- mean and p95 latency per request
+- tokens and cost per request
+
+of the default client (one response per attempt) and of
+JsonModeChatClient(candidates=k) in both candidate modes ("n" and "parallel").
+
+A corpus line is one recorded response:
+    {"contract": name, "raw": text, "latency_s": 1.8, "prompt_tokens": 950, "completion_tokens": 210}
+Record one against the API with --record FILE (needs OPENAI_API_KEY). Without
+--corpus, a synthetic corpus is used: the valid payloads of
+bench_contract_validators plus broken ones (unsafe truncations and contract
+violations), with log-normal latencies.
+
+Each simulated attempt draws responses at random from the corpus. An attempt
+with k candidates takes as long as its slowest candidate. Corrective retries
+add CORRECTION_TOKENS to the prompt, as the corrective message does.
+
+Run from the repository root:
+    python -m projects.p03b_json_contract_plugin.bench_candidates
+"""
+
+import argparse
+import copy
+import json
+import random
+import statistics
+import time
+from typing import Any, Dict, List, Tuple
+
+from .bench_contract_validators import VALID_PAYLOADS
+from .bench_json_repair import SHAPES
+from .src.contracts.registry import get_contract
+from .src.sampling import passes_contract
+
+# Approximate size of a corrective system message (instructions + errors + 400-char excerpt)
+CORRECTION_TOKENS = 250
+
+# gpt-4.1-mini list prices, USD per 1M tokens
+INPUT_PRICE = 0.40
+OUTPUT_PRICE = 1.60
+
+# Inputs used by --record
+RECORD_INPUTS = {
+    "structured_answer_lite": "Explain what JSON Mode is and when a production system should use it.",
+    "support_ticket": (
+        "Customer message:\nHi, I'm Ana (ana@example.com). Order A-1001 arrived broken, I want my R$ 129,90 back.\n\n"
+        "Extract a support ticket from this message."
+    ),
+}
+
+
+def _broken_payload(payload: Dict[str, Any], rng: random.Random) -> Dict[str, Any]:
+    """A schema violation the way models make them: an extra key or a wrong type."""
+    broken = copy.deepcopy(payload)
+    if rng.random() < 0.5:
+        broken["reasoning"] = "internal notes"
+    else:
+        broken["quality"]["confidence"] = "high"
+    return broken
+
+
+def synthetic_corpus(failure_rate: float, size: int, seed: int) -> List[Dict[str, Any]]:
+    rng = random.Random(seed)
+    unsafe = [breaker for breaker, safe in SHAPES.values() if not safe]
+    corpus = []
+    for name, payload in VALID_PAYLOADS.items():
+        prompt_tokens = len(get_contract(name).system_prompt) // 4 + 60
+        for _ in range(size):
+            text = json.dumps(payload, ensure_ascii=False)
+            if rng.random() < failure_rate:
+                if rng.random() < 0.5:
+                    text = rng.choice(unsafe)(text)
+                else:
+                    text = json.dumps(_broken_payload(payload, rng), ensure_ascii=False)
+            corpus.append(
+                {
+                    "contract": name,
+                    "raw": text,
+                    "latency_s": rng.lognormvariate(0.5, 0.35),
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": len(text) // 4,
+                }
+            )
+    return corpus
+
+
+def load_corpus(path: str) -> List[Dict[str, Any]]:
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def record_corpus(path: str, samples: int) -> None:
+    """Record `samples` single-response calls per contract (no retries)."""
+    from .src.config import get_openai_client
+    from .src.json_client import JsonModeChatClient
+
+    client = get_openai_client()
+    with open(path, "w", encoding="utf-8") as f:
+        for name, user_input in RECORD_INPUTS.items():
+            chat = JsonModeChatClient(client, get_contract(name), history="stateless")
+            messages = [chat.messages[0], {"role": "user", "content": user_input}]
+            for _ in range(samples):
+                completion_tokens = chat.usage.completion_tokens
+                start = time.perf_counter()
+                raw = chat._call_model(messages)
+                latency = time.perf_counter() - start
+                line = {
+                    "contract": name,
+                    "raw": raw,
+                    "latency_s": round(latency, 4),
+                    "prompt_tokens": chat.usage.last_prompt_tokens,
+                    "completion_tokens": chat.usage.completion_tokens - completion_tokens,
+                }
+                f.write(json.dumps(line, ensure_ascii=False) + "\n")
+                print(f"{name}: {latency:.2f}s valid={passes_contract(raw, chat.contract)}")
+
+
+def simulate(
+    samples: List[Tuple[bool, float, int, int]],
+    k: int,
+    mode: str,
+    max_retries: int,
+    requests: int,
+    rng: random.Random,
+) -> Dict[str, float]:
+    """Replay `requests` requests; samples are (valid, latency_s, prompt_tokens, completion_tokens)."""
+    latencies: List[float] = []
+    valid = calls = input_tokens = output_tokens = 0
+    for _ in range(requests):
+        latency = 0.0
+        for attempt in range(max_retries + 1):
+            drawn = [rng.choice(samples) for _ in range(k)]
+            latency += max(s[1] for s in drawn)
+            prompt = drawn[0][2] + attempt * CORRECTION_TOKENS
+            # "n": one request, the prompt is billed once; "parallel": k requests
+            calls += 1 if mode == "n" else k
+            input_tokens += prompt if mode == "n" else prompt * k
+            output_tokens += sum(s[3] for s in drawn)
+            if any(s[0] for s in drawn):
+                valid += 1
+                break
+        latencies.append(latency)
+
+    latencies.sort()
+    cost = (input_tokens * INPUT_PRICE + output_tokens * OUTPUT_PRICE) / 1e6
+    return {
+        "valid": valid / requests,
+        "mean_s": statistics.fmean(latencies),
+        "p95_s": latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))],
+        "calls": calls / requests,
+        "input_tokens": input_tokens / requests,
+        "output_tokens": output_tokens / requests,
+        "usd_per_1k": cost / requests * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare sequential retries with multi-candidate sampling.")
+    parser.add_argument("--corpus", default=None, help="JSONL of recorded responses (default: synthetic)")
+    parser.add_argument("--record", default=None, help="Record a corpus to this JSONL file and exit")
+    parser.add_argument("--samples", type=int, default=20, help="Responses per contract for --record / synthetic")
+    parser.add_argument("--failure-rate", type=float, default=0.3, help="Invalid share of the synthetic corpus")
+    parser.add_argument("--k", type=int, nargs="+", default=[2, 3], help="Candidate counts to compare")
+    parser.add_argument("--max-retries", type=int, default=2)
+    parser.add_argument("--requests", type=int, default=5000, help="Simulated requests per strategy")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    if args.record:
+        record_corpus(args.record, args.samples)
+        return
+
+    if args.corpus:
+        corpus, source = load_corpus(args.corpus), f"recorded responses ({args.corpus})"
+    else:
+        corpus = synthetic_corpus(args.failure_rate, args.samples * 5, args.seed)
+        source = f"SYNTHETIC responses (--failure-rate {args.failure_rate}, simulated latency; use --corpus for measured data)"
+    by_contract: Dict[str, List[Tuple[bool, float, int, int]]] = {}
+    for line in corpus:
+        contract = get_contract(line["contract"])
+        by_contract.setdefault(line["contract"], []).append(
+            (
+                passes_contract(line["raw"], contract),
+                float(line["latency_s"]),
+                int(line.get("prompt_tokens") or len(contract.system_prompt) // 4),
+                int(line.get("completion_tokens") or len(line["raw"]) // 4),
+            )
+        )
+
+    strategies = [("sequential", 1, "n")] + [(f"{mode} k={k}", k, mode) for k in args.k for mode in ("n", "parallel")]
+    for name, samples in by_contract.items():
+        first_pass = sum(s[0] for s in samples) / len(samples)
+        print(f"\n{name}: {len(samples)} {source} · {100 * first_pass:.1f}% valid on first pass")
+        print(
+            f"{'strategy':<16} {'valid':>7} {'mean s':>7} {'p95 s':>7} {'calls':>6} "
+            f"{'in tok':>7} {'out tok':>8} {'$/1k req':>9}"
+        )
+        for label, k, mode in strategies:
+            row = simulate(samples, k, mode, args.max_retries, args.requests, random.Random(args.seed))
+            print(
+                f"{label:<16} {100 * row['valid']:>6.1f}% {row['mean_s']:>7.2f} {row['p95_s']:>7.2f} "
+                f"{row['calls']:>6.2f} {row['input_tokens']:>7.0f} {row['output_tokens']:>8.0f} "
+                f"{row['usd_per_1k']:>9.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+Microbenchmark: handwritten contract validators vs. compiled validators.
+
+This file is NOT part of the project deliverables.
+It exists only to verify that the compiled validators (src/contracts/compiler.py):
+- produce exactly the same errors as the handwritten validate() methods
+  (on valid payloads and on a corpus of mutated ones)
+- are faster, in payloads/sec
+
+Run from the repository root:
+    python -m projects.p03b_json_contract_plugin.bench_contract_validators
+"""
+
+import argparse
+import copy
+import random
+import time
+from typing import Any, Callable, Dict, List
+
+from .src.contracts.compiler import compile_contract
+from .src.contracts.structured_answer_lite import StructuredAnswerLiteContract
+from .src.contracts.support_ticket_contract import SupportTicketContract
+
+VALID_PAYLOADS: Dict[str, Dict[str, Any]] = {
+    "structured_answer_lite": {
+        "task": {"type": "qa", "user_intent": "Explain JSON mode"},
+        "answer": {"text": "JSON mode constrains the output to a JSON object."},
+        "quality": {"confidence": 0.9, "assumptions": ["SDK 2.x"], "risks": []},
+        "debug": {"schema_version": "1.0", "model": "gpt-4.1-mini"},
+    },
+    "support_ticket": {
+        "ticket": {
+            "channel": "email",
+            "customer": {"name": "Ana", "email": "ana@example.com"},
+            "intent": "refund",
+            "priority": "high",
+            "summary": "Customer wants a refund for a damaged item.",
+            "order": {"order_id": "A-1001", "amount": 129.9, "currency": "BRL"},
+            "entities": ["A-1001", "damaged item"],
+            "suggested_actions": ["Open a refund request", "Ask for photos"],
+        },
+        "quality": {"confidence": 0.8, "assumptions": [], "risks": ["amount may include shipping"]},
+        "debug": {"schema_version": "1.0", "model": "gpt-4.1-mini"},
+    },
+}
+
+# Replacement values tried at every position of a payload
+MUTATIONS: List[Any] = [None, "", "  ", "x", "other", 0, 1, -1, 2.5, 0.5, True, float("nan"), [], ["a", 1], {}, {"k": 1}]
+
+
+def _paths(obj: Any, prefix=()) -> List[tuple]:
+    paths = []
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            paths.append(prefix + (key,))
+            paths.extend(_paths(value, prefix + (key,)))
+    elif isinstance(obj, list):
+        for i, value in enumerate(obj):
+            paths.append(prefix + (i,))
+    return paths
+
+
+def _set(obj: Any, path: tuple, value: Any) -> None:
+    for key in path[:-1]:
+        obj = obj[key]
+    obj[path[-1]] = value
+
+
+def _delete(obj: Any, path: tuple) -> None:
+    for key in path[:-1]:
+        obj = obj[key]
+    del obj[path[-1]]
+
+
+def mutated_corpus(valid: Dict[str, Any], extra: int, seed: int) -> List[Any]:
+    """Valid payload, every single-field mutation and deletion, extra keys, then random multi-mutations."""
+    rng = random.Random(seed)
+    corpus: List[Any] = [valid, [], "text", None]
+    paths = _paths(valid)
+    for path in paths:
+        for value in MUTATIONS:
+            payload = copy.deepcopy(valid)
+            _set(payload, path, value)
+            corpus.append(payload)
+        if not isinstance(path[-1], int):
+            payload = copy.deepcopy(valid)
+            _delete(payload, path)
+            corpus.append(payload)
+            payload = copy.deepcopy(valid)
+            parent = payload
+            for key in path[:-1]:
+                parent = parent[key]
+            parent["unexpected"] = 1
+            corpus.append(payload)
+    for _ in range(extra):
+        payload = copy.deepcopy(valid)
+        for path in rng.sample(paths, k=3):
+            try:
+                _set(payload, path, rng.choice(MUTATIONS))
+            except (KeyError, IndexError, TypeError):
+                pass  # an earlier mutation replaced the parent
+        corpus.append(payload)
+    return corpus
+
+
+def _outcome(validate: Callable[[Any], Any], payload: Any):
+    try:
+        result = validate(payload)
+        return (result.ok, result.errors)
+    except Exception as e:  # parity includes failing the same way
+        return ("raised", type(e).__name__)
+
+
+def check_parity(name: str, handwritten: Callable, compiled: Callable, corpus: List[Any]) -> int:
+    mismatches = 0
+    for payload in corpus:
+        expected, actual = _outcome(handwritten, payload), _outcome(compiled, payload)
+        if expected != actual:
+            mismatches += 1
+            if mismatches <= 3:
+                print(f"  MISMATCH {name}: {payload!r}\n    handwritten: {expected}\n    compiled:    {actual}")
+    return mismatches
+
+
+def payloads_per_sec(validate: Callable, payloads: List[Any], seconds: float) -> float:
+    n = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while True:
+        for payload in payloads:
+            validate(payload)
+        n += len(payloads)
+        now = time.perf_counter()
+        if now >= deadline:
+            return n / (now - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare handwritten and compiled contract validators.")
+    parser.add_argument("--seconds", type=float, default=1.0, help="Timing budget per measurement (default: 1)")
+    parser.add_argument("--random", type=int, default=2000, help="Random multi-field mutations per contract")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    failed = False
+    for contract in (StructuredAnswerLiteContract(), SupportTicketContract()):
+        compiled = compile_contract(contract)
+        valid = VALID_PAYLOADS[contract.name]
+        corpus = mutated_corpus(valid, args.random, args.seed)
+
+        mismatches = check_parity(contract.name, contract.validate, compiled.validate, corpus)
+        failed = failed or mismatches > 0
+        print(f"\n{contract.name}: parity {len(corpus) - mismatches}/{len(corpus)} payloads identical")
+
+        invalid = [p for p in corpus if _outcome(contract.validate, p)[0] is False]
+        for label, payloads in (("valid", [valid]), ("invalid mix", invalid)):
+            before = payloads_per_sec(contract.validate, payloads, args.seconds)
+            after = payloads_per_sec(compiled.validate, payloads, args.seconds)
+            print(
+                f"  {label:<12} handwritten {before:>12,.0f}/s · compiled {after:>12,.0f}/s · "
+                f"{after / before:.2f}x"
+            )
+
+    if failed:
+        raise SystemExit("compiled validators do not match the handwritten ones")
+
+
+if __name__ == "__main__":
+    main()
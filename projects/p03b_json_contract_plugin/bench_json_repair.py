@@ -0,0 +1,130 @@
+"""
+Benchmark: local JSON repair (src/json_repair.py) on the common failure shapes.
+
+This file is NOT part of the project deliverables.
+It exists only to verify that repair_json():
+- fixes the mechanical failures (fences, stray prose, trailing commas,
+  missing closing braces), so the contract validates without a retry
+- never turns an unsafe truncation (cut string, number or array) into a
+  payload that passes validation with different data
+- is cheap next to a model round-trip
+
+Each valid payload of the bench_contract_validators corpus is broken in every
+shape below, compact and indented. Logged failures can be added with
+--corpus FILE.jsonl (one {"contract": name, "raw": text} per line).
+
+Run from the repository root:
+    python -m projects.p03b_json_contract_plugin.bench_json_repair
+"""
+
+import argparse
+import json
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Tuple
+
+from .bench_contract_validators import VALID_PAYLOADS
+from .src.contracts.registry import get_contract
+from .src.json_repair import repair_json
+
+
+def _trailing_comma_object(text: str) -> str:
+    i = text.rindex("}", 0, len(text) - 1)  # close of the last nested object
+    return text[:i].rstrip() + "," + text[i:]
+
+
+def _trailing_comma_array(text: str) -> str:
+    i = text.index("]")
+    return text[:i] + ("," if text[i - 1] != "[" else "") + text[i:]
+
+
+# name -> (break the JSON text, safe: a repair should make it valid)
+SHAPES: Dict[str, Tuple[Callable[[str], str], bool]] = {
+    "fence_json": (lambda t: f"```json\n{t}\n```", True),
+    "fence_bare": (lambda t: f"```\n{t}\n```", True),
+    "prose_before": (lambda t: f"Sure! Here is the JSON you asked for:\n{t}", True),
+    "prose_after": (lambda t: f"{t}\nLet me know if you need anything else.", True),
+    "prose_around_fence": (lambda t: f"Here it is:\n```json\n{t}\n```\nHope this helps!", True),
+    "trailing_comma_object": (_trailing_comma_object, True),
+    "trailing_comma_array": (lambda t: _trailing_comma_array(t), True),
+    "missing_last_brace": (lambda t: t.rstrip()[:-1], True),
+    "fence_trailing_comma_truncated": (lambda t: f"```json\n{_trailing_comma_object(t).rstrip()[:-1]}", True),
+    # Unsafe: the data itself is cut; repair must not pass these off as valid
+    "cut_in_string": (lambda t: t[: t.index('"', t.index(":") + 3) - 2], False),
+    "cut_in_number": (lambda t: t[: t.index(".", t.index("confidence")) + 1], False),
+    "cut_in_array": (lambda t: t[: t.index("[", t.index("assumptions")) + 1], False),
+    "cut_after_key": (lambda t: t[: t.index('"answer"') + len('"answer"')] if '"answer"' in t else t[:-1] + ', "x"', False),
+}
+
+
+def build_corpus(extra_path: str = None) -> List[Tuple[str, str, str, Any]]:
+    """(shape, contract name, broken text, original payload or None)."""
+    corpus = []
+    for name, payload in VALID_PAYLOADS.items():
+        for indent in (None, 2):
+            text = json.dumps(payload, indent=indent, ensure_ascii=False)
+            for shape, (breaker, _) in SHAPES.items():
+                corpus.append((shape, name, breaker(text), payload))
+    if extra_path:
+        with open(extra_path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    obj = json.loads(line)
+                    corpus.append(("logged", obj["contract"], obj["raw"], None))
+    return corpus
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure local JSON repair on common failure shapes.")
+    parser.add_argument("--corpus", default=None, help="Extra JSONL of logged failures ({contract, raw})")
+    parser.add_argument("--repeat", type=int, default=200, help="Repairs per sample for timing (default: 200)")
+    args = parser.parse_args()
+
+    rows: Dict[str, Dict[str, float]] = defaultdict(lambda: defaultdict(float))
+    unsafe_rescues = 0
+    for shape, name, raw, original in build_corpus(args.corpus):
+        contract = get_contract(name)
+        row = rows[shape]
+        row["samples"] += 1
+        try:
+            json.loads(raw)
+            row["parsed_as_is"] += 1  # not a failure at all; nothing to repair
+            continue
+        except ValueError:
+            pass
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            result = repair_json(raw)
+        row["us"] += (time.perf_counter() - start) / args.repeat * 1e6
+
+        if result.data is None:
+            continue
+        row["parsed"] += 1
+        if contract.validate(result.data).ok:
+            row["valid"] += 1
+            if original is not None and result.data != original:
+                unsafe_rescues += 1
+                print(f"  CHANGED DATA ({shape}, {name}): {raw[:80]!r}")
+
+    print(f"{'shape':<32} {'n':>4} {'parsed':>7} {'valid':>6} {'µs/repair':>10}  expected")
+    saved = failures = 0
+    for shape, row in rows.items():
+        n = int(row["samples"])
+        repaired = n - int(row["parsed_as_is"])
+        safe = SHAPES[shape][1] if shape in SHAPES else None
+        expected = {True: "repairable", False: "retry", None: "logged"}[safe]
+        print(
+            f"{shape:<32} {n:>4} {int(row['parsed']):>7} {int(row['valid']):>6} "
+            f"{row['us'] / max(repaired, 1):>10.1f}  {expected}"
+        )
+        saved += int(row["valid"])
+        failures += repaired
+    print(f"\nround-trips saved: {saved}/{failures} failing responses · data changed by a repair: {unsafe_rescues}")
+
+    if unsafe_rescues:
+        raise SystemExit("a repair changed the data of a payload that then passed validation")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Benchmark: contract prompt renderings (contracts/prompt_render.py).
+
+This file is NOT part of the project deliverables.
+It exists only to verify, for every contract and PROMPT_STYLE:
+- the size of the system prompt, in characters and tokens
+- that the rendering still carries every key, enum value and type description
+  of CONTRACT_SPEC
+- the cost of reading contract.system_prompt (cached) vs. rendering it again
+
+With --ab N it also runs N inputs per style against the API (needs
+OPENAI_API_KEY) and reports schema compliance, so a smaller prompt can be
+checked not to cost more retries than it saves:
+first-attempt valid rate, final valid rate, calls per item and prompt tokens.
+
+Run from the repository root:
+    python -m projects.p03b_json_contract_plugin.bench_prompt_render
+    python -m projects.p03b_json_contract_plugin.bench_prompt_render --ab 3
+"""
+
+import argparse
+import time
+from typing import Any, Iterator, List
+
+from .src.contracts.compiler import compile_contract
+from .src.contracts.prompt_render import PROMPT_STYLES
+from .src.contracts.structured_answer_lite import StructuredAnswerLiteContract
+from .src.contracts.support_ticket_contract import SupportTicketContract
+
+CONTRACTS = {
+    "structured_answer_lite": StructuredAnswerLiteContract,
+    "support_ticket": SupportTicketContract,
+}
+
+
+def _token_counter():
+    """len(tokens) with tiktoken when installed, else the ~4 chars/token estimate."""
+    try:
+        import tiktoken
+    except ImportError:  # optional dependency
+        return lambda text: (len(text) + 3) // 4, "estimate"
+    encoder = tiktoken.get_encoding("o200k_base")  # gpt-4.1 / gpt-4o family
+    return lambda text: len(encoder.encode(text)), "tiktoken"
+
+
+def _spec_atoms(spec: Any) -> Iterator[str]:
+    """Every key, enum option and type description of a spec."""
+    if isinstance(spec, dict):
+        for key, value in spec.items():
+            yield key
+            yield from _spec_atoms(value)
+    elif isinstance(spec, list):
+        for value in spec:
+            yield from _spec_atoms(value)
+    else:
+        yield from (option.strip() for option in str(spec).split("|"))
+
+
+def _missing(contract: Any) -> List[str]:
+    prompt = contract.system_prompt
+    return [atom for atom in _spec_atoms(contract.CONTRACT_SPEC) if atom not in prompt]
+
+
+def report(repeat: int) -> None:
+    count_tokens, tokenizer = _token_counter()
+    print(f"tokens: {tokenizer}\n")
+    print(f"{'contract':<24} {'style':<9} {'chars':>6} {'tokens':>7} {'saved':>7} {'µs cached':>10} {'µs render':>10}")
+    lost = 0
+    for name, cls in CONTRACTS.items():
+        baseline = None
+        for style in PROMPT_STYLES:
+            contract = cls(prompt_style=style)
+            prompt = contract.system_prompt
+            tokens = count_tokens(prompt)
+            baseline = baseline or tokens
+
+            start = time.perf_counter()
+            for _ in range(repeat):
+                contract.system_prompt
+            cached_us = (time.perf_counter() - start) / repeat * 1e6
+            start = time.perf_counter()
+            for _ in range(repeat):
+                cls(prompt_style=style).system_prompt
+            render_us = (time.perf_counter() - start) / repeat * 1e6
+
+            print(
+                f"{name:<24} {style:<9} {len(prompt):>6} {tokens:>7} {100 * (1 - tokens / baseline):>6.1f}% "
+                f"{cached_us:>10.2f} {render_us:>10.2f}"
+            )
+            missing = _missing(contract)
+            if missing:
+                lost += 1
+                print(f"  MISSING from the {style} prompt: {missing}")
+    if lost:
+        raise SystemExit("a rendering dropped part of CONTRACT_SPEC")
+
+
+def ab(copies: int, concurrency: int) -> None:
+    # Imported here: the offline report does not need the OpenAI SDK.
+    from .bench_backends import INPUTS
+    from .src.config import get_openai_client
+    from .src.json_client import JsonModeChatClient
+
+    client = get_openai_client()
+    for name, cls in CONTRACTS.items():
+        inputs = INPUTS[name] * max(1, copies)
+        print(f"\n{name}: {len(inputs)} inputs per style")
+        print(f"{'style':<9} {'first ok':>9} {'valid':>7} {'calls':>6} {'prompt tok':>11}")
+        for style in PROMPT_STYLES:
+            chat = JsonModeChatClient(client, compile_contract(cls(prompt_style=style)), max_retries=2)
+            items = chat.extract_batch(inputs, concurrency=concurrency)
+            n = len(items)
+            print(
+                f"{style:<9} {100 * sum(i.ok and i.attempts == 1 for i in items) / n:>8.1f}% "
+                f"{100 * sum(i.ok for i in items) / n:>6.1f}% {sum(i.attempts for i in items) / n:>6.2f} "
+                f"{chat.usage.avg_prompt_tokens:>11.1f}"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Token report and A/B compliance check of contract prompt styles.")
+    parser.add_argument("--repeat", type=int, default=2000, help="Accesses per timing (default: 2000)")
+    parser.add_argument("--ab", type=int, default=0, metavar="COPIES", help="Also run an A/B against the API")
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    report(args.repeat)
+    if args.ab:
+        ab(args.ab, args.concurrency)
+
+
+if __name__ == "__main__":
+    main()
@@ -22,6 +22,8 @@ class Contract(Protocol):
     A contract encapsulates:
     - The governing system prompt
     - The semantic validation logic for the JSON payload
+    - Optionally, check_event(event) -> List[str]: checks for a response that
+      is still streaming (compiled contracts provide it, see compiler.py)
 
     The chat client must treat contracts as opaque objects and
     interact with them only through this interface.
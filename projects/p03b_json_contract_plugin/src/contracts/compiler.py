@@ -0,0 +1,385 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .base import ValidationResult
+
+
+class ContractCompileError(ValueError):
+    """Raised when a CONTRACT_SPEC entry cannot be turned into a check."""
+
+
+@dataclass(frozen=True)
+class MessageStyle:
+    """
+    How a contract phrases its validation errors.
+
+    The handwritten validators differ in small ways (root label, trailing
+    period, how the confidence range is reported), and the compiled
+    validator must reproduce them exactly.
+
+    Attributes:
+        root_path: Label used for the top-level key check ("payload", "root").
+        not_object: Error returned when the payload is not an object.
+        suffix: Appended to every message ("" or ".").
+        split_range: Report "must be a number" and "must be between" separately.
+        const_template: Message for a constant mismatch ({path}, {value}).
+    """
+    root_path: str
+    not_object: str
+    suffix: str = ""
+    split_range: bool = False
+    const_template: str = "{path} must be '{value}'"
+
+
+# --- Spec parsing ------------------------------------------------
+#
+# CONTRACT_SPEC values are human-readable type descriptions. The compiler
+# understands the forms used by the contracts:
+#   {...}                          object with exactly these keys (in order)
+#   ["string"]                     array of strings
+#   "string", "string (...)"       non-empty string
+#   "number"                       number
+#   "number between A and B"       number in [A, B]
+#   "a | b | c"                    one of the listed values
+#   "a | b | null"                 one of the listed values, or null
+#   "string | null", "number | null"
+#   anything else                  exact constant (e.g. "1.0")
+
+
+def _parse(spec: Any, path: str) -> Tuple:
+    if isinstance(spec, dict):
+        return ("object", [(key, _parse(value, f"{path}.{key}" if path else key)) for key, value in spec.items()])
+    if isinstance(spec, list):
+        if spec != ["string"]:
+            raise ContractCompileError(f"{path}: only arrays of strings are supported, got {spec!r}")
+        return ("string_array",)
+    if not isinstance(spec, str):
+        raise ContractCompileError(f"{path}: unsupported spec value {spec!r}")
+
+    if spec.startswith("number between "):
+        low, sep, high = spec[len("number between "):].partition(" and ")
+        if not sep:
+            raise ContractCompileError(f"{path}: cannot parse range {spec!r}")
+        return ("range", low, high)
+    if " | " in spec:
+        options = [o.strip() for o in spec.split("|")]
+        nullable = "null" in options
+        options = [o for o in options if o != "null"]
+        if options == ["string"] and nullable:
+            return ("string_or_null",)
+        if options == ["number"] and nullable:
+            return ("number_or_null",)
+        return ("enum", frozenset(options), nullable)
+    if spec == "string" or spec.startswith("string "):
+        return ("string",)
+    if spec == "number":
+        return ("number",)
+    return ("const", spec)
+
+
+# --- Code generation ---------------------------------------------
+
+
+class _Emitter:
+    """Builds the validator source; messages and sets become module constants."""
+
+    def __init__(self, style: MessageStyle):
+        self.style = style
+        self.lines: List[str] = []
+        self.consts: Dict[str, Any] = {"ValidationResult": ValidationResult}
+        self._n = 0
+
+    def const(self, value: Any) -> str:
+        name = f"_C{len(self.consts)}"
+        self.consts[name] = value
+        return name
+
+    def var(self) -> str:
+        self._n += 1
+        return f"v{self._n}"
+
+    def emit(self, indent: int, line: str) -> None:
+        self.lines.append("    " * indent + line)
+
+    def error(self, indent: int, message: str) -> None:
+        self.emit(indent, f"errors.append({self.const(message + self.style.suffix)})")
+
+    def node(self, node: Tuple, value: str, path: str, indent: int) -> None:
+        kind = node[0]
+        if kind == "object":
+            self.emit(indent, f"if not isinstance({value}, dict):")
+            self.error(indent + 1, f"{path} must be an object")
+            self.emit(indent, "else:")
+            self.fields(node[1], value, path, f"{path}.", indent + 1)
+        elif kind == "string":
+            self.emit(indent, f"if not isinstance({value}, str) or not {value}.strip():")
+            self.error(indent + 1, f"{path} must be a non-empty string")
+        elif kind == "string_or_null":
+            self.emit(indent, f"if {value} is not None and not isinstance({value}, str):")
+            self.error(indent + 1, f"{path} must be a string or null")
+        elif kind == "number":
+            self.emit(indent, f"if not isinstance({value}, (int, float)):")
+            self.error(indent + 1, f"{path} must be a number")
+        elif kind == "number_or_null":
+            self.emit(indent, f"if {value} is not None and not isinstance({value}, (int, float)):")
+            self.error(indent + 1, f"{path} must be a number or null")
+        elif kind == "range":
+            _, low, high = node
+            lo, hi = self.const(float(low)), self.const(float(high))
+            if self.style.split_range:
+                self.emit(indent, f"if not isinstance({value}, (int, float)):")
+                self.error(indent + 1, f"{path} must be a number")
+                self.emit(indent, f"elif float({value}) < {lo} or float({value}) > {hi}:")
+                self.error(indent + 1, f"{path} must be between {low} and {high}")
+            else:
+                self.emit(indent, f"if not isinstance({value}, (int, float)) or not ({lo} <= float({value}) <= {hi}):")
+                self.error(indent + 1, f"{path} must be a number between {low} and {high}")
+        elif kind == "enum":
+            _, options, nullable = node
+            allowed = self.const(options)
+            if nullable:
+                self.emit(indent, f"if {value} is not None and {value} not in {allowed}:")
+                self.error(indent + 1, f"{path} must be one of {sorted(options)} or null")
+            else:
+                self.emit(indent, f"if {value} not in {allowed}:")
+                self.error(indent + 1, f"{path} must be one of {sorted(options)}")
+        elif kind == "string_array":
+            item_message = self.const(f"{path}[{{}}] must be a string{self.style.suffix}")
+            self.emit(indent, f"if not isinstance({value}, list):")
+            self.error(indent + 1, f"{path} must be an array")
+            self.emit(indent, "else:")
+            self.emit(indent + 1, f"for i, item in enumerate({value}):")
+            self.emit(indent + 2, "if not isinstance(item, str):")
+            self.emit(indent + 3, f"errors.append({item_message}.format(i))")
+        elif kind == "const":
+            self.emit(indent, f"if {value} != {self.const(node[1])}:")
+            self.error(indent + 1, self.style.const_template.format(path=path, value=node[1]))
+        else:
+            raise ContractCompileError(f"{path}: unknown node {kind!r}")
+
+    def fields(self, fields: List[Tuple[str, Tuple]], value: str, path: str, prefix: str, indent: int) -> None:
+        """Exact-keys check, then each field in spec order (child paths are prefix + key)."""
+        keys = [key for key, _ in fields]
+        self.emit(indent, f"if {value}.keys() != {self.const(frozenset(keys))}:")
+        self.error(indent + 1, f"{path} must have exactly keys {sorted(keys)}")
+        for key, child in fields:
+            child_value = self.var()
+            self.emit(indent, f"{child_value} = {value}.get({key!r})")
+            self.node(child, child_value, prefix + key, indent)
+
+
+def _materialize(emitter: _Emitter, argument: str, label: str) -> Callable:
+    """Turn the emitter's lines into the body of `def fn(argument)` and build it."""
+    # Constants and builtins become closure variables of a factory: fast
+    # lookups, nothing to bind per call.
+    bound = list(emitter.consts) + ["isinstance", "dict", "list", "str", "int", "float"]
+    source = "\n".join(
+        [f"def make({', '.join(bound)}):", f"    def fn({argument}):"]
+        + ["    " + line for line in emitter.lines]
+        + ["    return fn"]
+    )
+    namespace: Dict[str, Any] = {}
+    exec(compile(source, f"<compiled contract {label}>", "exec"), namespace)
+    fn = namespace["make"](*emitter.consts.values(), isinstance, dict, list, str, int, float)
+    fn.__source__ = source
+    return fn
+
+
+def compile_validator(spec: Dict[str, Any], style: MessageStyle) -> Callable[[Any], ValidationResult]:
+    """
+    Compile a CONTRACT_SPEC into a specialized validate(payload) function.
+
+    The generated function is straight-line code: key sets are precomputed
+    frozensets, and every error message is a constant built here, once, so
+    a valid payload costs only the type and membership checks.
+
+    Raises:
+        ContractCompileError if the spec uses an unsupported form.
+    """
+    root = _parse(spec, "")
+    emitter = _Emitter(style)
+    emitter.emit(1, "if not isinstance(payload, dict):")
+    emitter.emit(2, f"return ValidationResult(ok=False, errors=[{emitter.const(style.not_object)}])")
+    emitter.emit(1, "errors = []")
+    # Top-level fields are reported without a prefix ("task.type", not "payload.task.type").
+    emitter.fields(root[1], "payload", style.root_path, "", 1)
+    emitter.emit(1, "return ValidationResult(not errors, errors)")
+    return _materialize(emitter, "payload", f"validator: {style.root_path}")
+
+
+# --- Structured Outputs schema -----------------------------------
+#
+# The same spec, rendered as a JSON Schema for response_format
+# {"type": "json_schema", "strict": true}. Strict mode needs every object to
+# list all its keys as required and set additionalProperties to false, and
+# the decoder then guarantees the structure, types and enums. Bounds such as
+# "number between A and B" and non-empty strings are left out of the schema:
+# the contract's validate() still checks them after decoding.
+
+
+def _schema_node(node: Tuple) -> Dict[str, Any]:
+    kind = node[0]
+    if kind == "object":
+        properties = {key: _schema_node(child) for key, child in node[1]}
+        return {
+            "type": "object",
+            "properties": properties,
+            "required": list(properties),
+            "additionalProperties": False,
+        }
+    if kind == "string":
+        return {"type": "string"}
+    if kind == "string_or_null":
+        return {"type": ["string", "null"]}
+    if kind in ("number", "range"):
+        return {"type": "number"}
+    if kind == "number_or_null":
+        return {"type": ["number", "null"]}
+    if kind == "string_array":
+        return {"type": "array", "items": {"type": "string"}}
+    if kind == "enum":
+        _, options, nullable = node
+        # Enums are unordered in the parsed spec: sort for a stable schema (and prompt cache).
+        values: List[Any] = sorted(options)
+        if nullable:
+            return {"type": ["string", "null"], "enum": values + [None]}
+        return {"type": "string", "enum": values}
+    if kind == "const":
+        return {"type": "string", "enum": [node[1]]}
+    raise ContractCompileError(f"unknown node {kind!r}")
+
+
+def compile_json_schema(spec: Dict[str, Any], name: str) -> Dict[str, Any]:
+    """
+    Compile a CONTRACT_SPEC into the `json_schema` object of a strict
+    Structured Outputs response_format.
+
+    Semantic rules the schema cannot carry (confidence bounds, non-empty
+    strings) are still enforced by the contract's validate().
+
+    Raises:
+        ContractCompileError if the spec uses an unsupported form.
+    """
+    return {"name": name, "strict": True, "schema": _schema_node(_parse(spec, ""))}
+
+
+# --- Streaming checks --------------------------------------------
+#
+# A streamed response is checked piece by piece (see stream_json.py): each
+# spec node gets its own compiled check, indexed by path ("*" for array
+# items), with the same messages as the whole-payload validator.
+
+_CONTAINER = {"object": "object", "string_array": "array"}
+
+
+def _node_checks(node: Tuple, pattern: Tuple, path: str, style: MessageStyle, table: Dict) -> None:
+    emitter = _Emitter(style)
+    emitter.emit(1, "errors = []")
+    emitter.node(node, "value", path, 1)
+    emitter.emit(1, "return errors")
+    exact_keys = None
+    if node[0] == "object":
+        keys = [key for key, _ in node[1]]
+        exact_keys = (frozenset(keys), f"{path} must have exactly keys {sorted(keys)}{style.suffix}")
+        for key, child in node[1]:
+            _node_checks(child, pattern + (key,), f"{path}.{key}", style, table)
+    elif node[0] == "string_array":
+        table[pattern + ("*",)] = (None, _item_check(f"{path}[{{}}] must be a string{style.suffix}"), None)
+    table[pattern] = (node[0], _materialize(emitter, "value", f"check: {path}"), exact_keys)
+
+
+def _item_check(template: str) -> Callable:
+    def check(value: Any, index: int = 0) -> List[str]:
+        return [] if isinstance(value, str) else [template.format(index)]
+
+    return check
+
+
+def compile_event_checks(
+    spec: Dict[str, Any], style: MessageStyle, validate: Optional[Callable[[Any], ValidationResult]] = None
+) -> Callable[[Any], List[str]]:
+    """
+    Compile a CONTRACT_SPEC into check(event) -> errors for streamed responses.
+
+    Only definite violations are reported: a key outside the contract as soon
+    as it is read, a container of the wrong type as soon as it opens, and a
+    completed value that fails its checks (for objects this includes the
+    exact-keys check, known when the object closes). The closed top-level
+    object goes through `validate` (compiled from the spec if not given).
+
+    Raises:
+        ContractCompileError if the spec uses an unsupported form.
+    """
+    root = _parse(spec, "")
+    validate = validate or compile_validator(spec, style)
+    root_keys = frozenset(key for key, _ in root[1])
+    table: Dict[Tuple, Tuple] = {
+        (): ("object", None, (root_keys, f"{style.root_path} must have exactly keys {sorted(root_keys)}{style.suffix}"))
+    }
+    for key, child in root[1]:
+        # Top-level fields are reported without a prefix, as in compile_validator.
+        _node_checks(child, (key,), key, style, table)
+
+    def check(event: Any) -> List[str]:
+        path = event.path
+        entry = table.get(tuple("*" if isinstance(p, int) else p for p in path))
+        if entry is None:
+            return []
+        kind, node_check, exact_keys = entry
+        if event.kind == "key":
+            keys, message = exact_keys or (None, None)
+            return [message] if keys is not None and event.value not in keys else []
+        if not path:
+            return validate(event.value).errors if event.kind == "value" else []
+        if kind is None:  # array item
+            return node_check(event.value, path[-1]) if event.kind == "value" else []
+        try:
+            if event.kind == "open":
+                if _CONTAINER.get(kind) == event.value:
+                    return []
+                # The type error of an empty container of the kind that was opened
+                return node_check({} if event.value == "object" else [])
+            return node_check(event.value)
+        except TypeError:
+            return []  # e.g. an unhashable value in an enum check: left to validate()
+
+    return check
+
+
+class CompiledContract:
+    """
+    A contract whose validate() is compiled from its CONTRACT_SPEC and MESSAGE_STYLE,
+    with check_event() for checking a streamed response as it arrives.
+
+    Everything else (name, system_prompt, json_schema, extra attributes) is
+    delegated to the wrapped contract, so it can be used wherever a Contract
+    is expected and its cached renderings are reused.
+    """
+
+    def __init__(self, contract: Any):
+        self.contract = contract
+        self.name = contract.name
+        self.validate = compile_validator(contract.CONTRACT_SPEC, contract.MESSAGE_STYLE)
+        self.check_event = compile_event_checks(contract.CONTRACT_SPEC, contract.MESSAGE_STYLE, self.validate)
+
+    @property
+    def system_prompt(self) -> str:
+        return self.contract.system_prompt
+
+    def __getattr__(self, item: str) -> Any:
+        return getattr(self.contract, item)
+
+    def source(self) -> str:
+        """Generated validator source (for debugging)."""
+        return self.validate.__source__
+
+
+def compile_contract(contract: Any) -> Any:
+    """
+    Return a compiled version of `contract` if it declares CONTRACT_SPEC and
+    MESSAGE_STYLE, else the contract unchanged.
+    """
+    if getattr(contract, "CONTRACT_SPEC", None) is None or getattr(contract, "MESSAGE_STYLE", None) is None:
+        return contract
+    return CompiledContract(contract)
+
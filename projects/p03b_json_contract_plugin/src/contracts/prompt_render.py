@@ -0,0 +1,35 @@
+import json
+from typing import Any, Dict
+
+# How a contract renders CONTRACT_SPEC into its system prompt:
+# - "indented": json.dumps(indent=2), the original rendering
+# - "compact": the same JSON without whitespace (separators "," and ":")
+# - "terse": JSON-like notation without quotes, e.g.
+#       {task:{type:qa|extraction|other,user_intent:string (non-empty)},risks:[string]}
+#   Keys and type descriptions are the CONTRACT_SPEC strings, unchanged.
+PROMPT_STYLES = ("indented", "compact", "terse")
+
+
+def _terse(spec: Any) -> str:
+    if isinstance(spec, dict):
+        return "{" + ",".join(f"{key}:{_terse(value)}" for key, value in spec.items()) + "}"
+    if isinstance(spec, list):
+        return "[" + ",".join(_terse(value) for value in spec) + "]"
+    # "a | b | c" -> "a|b|c": the spaces around the bar are one token each.
+    return str(spec).replace(" | ", "|")
+
+
+def render_contract_spec(spec: Dict[str, Any], style: str = "indented") -> str:
+    """
+    Render a CONTRACT_SPEC for the system prompt in one of PROMPT_STYLES.
+
+    Every rendering is deterministic (spec order), so a cached prompt stays
+    byte-identical across requests and keeps hitting the prompt cache.
+    """
+    if style == "indented":
+        return json.dumps(spec, indent=2, ensure_ascii=False)
+    if style == "compact":
+        return json.dumps(spec, separators=(",", ":"), ensure_ascii=False)
+    if style == "terse":
+        return _terse(spec)
+    raise ValueError(f"Unknown prompt style: {style} (expected one of {', '.join(PROMPT_STYLES)})")
@@ -1,11 +1,29 @@
 from typing import Dict
 
 from .base import Contract
+from .compiler import compile_contract
 from .structured_answer_lite import StructuredAnswerLiteContract
+from .support_ticket_contract import SupportTicketContract
+
+_REGISTRY: Dict[str, Contract] = {}
+
+
+def register(contract: Contract) -> Contract:
+    """
+    Register a contract under its name.
+
+    Contracts that declare CONTRACT_SPEC and MESSAGE_STYLE are compiled here,
+    once: their validate() is replaced by a generated straight-line validator
+    with the same error messages (see compiler.py).
+    """
+    compiled = compile_contract(contract)
+    _REGISTRY[contract.name] = compiled
+    return compiled
+
+
+register(StructuredAnswerLiteContract())
+register(SupportTicketContract())
 
-_REGISTRY: Dict[str, Contract] = {
-    "structured_answer_lite": StructuredAnswerLiteContract(),
-}
 
 def get_contract(name: str) -> Contract:
     if name not in _REGISTRY:
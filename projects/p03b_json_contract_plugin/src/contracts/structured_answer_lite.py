@@ -1,7 +1,9 @@
-import json
-from typing import Any, Dict, List, Set
+from functools import cached_property
+from typing import Any, Dict, List, Optional, Set
 
 from .base import ValidationResult
+from .compiler import MessageStyle, compile_json_schema
+from .prompt_render import PROMPT_STYLES, render_contract_spec
 
 
 class StructuredAnswerLiteContract:
@@ -33,6 +35,13 @@ class StructuredAnswerLiteContract:
 
     ALLOWED_TASK_TYPES: Set[str] = {"qa", "extraction", "classification", "summarization", "other"}
 
+    # Error phrasing of validate(), reproduced by the compiled validator (see registry).
+    MESSAGE_STYLE = MessageStyle(
+        root_path="payload",
+        not_object="payload must be an object",
+        split_range=True,
+    )
+
     BASE_PROMPT: str = (
         "You are an AI assistant that must respond using STRICT JSON only.\n\n"
         "Your output MUST be a single JSON object that follows EXACTLY the contract below.\n"
@@ -54,10 +63,29 @@ class StructuredAnswerLiteContract:
         "- Use the same model name you are running as the value for debug.model.\n"
     )
 
-    @property
+    # Rendering of CONTRACT_SPEC in the system prompt (see prompt_render.PROMPT_STYLES).
+    PROMPT_STYLE: str = "indented"
+
+    def __init__(self, prompt_style: Optional[str] = None):
+        """
+        Parameters:
+            prompt_style: Override PROMPT_STYLE for this instance ("indented", "compact", "terse").
+        """
+        self.prompt_style = prompt_style or self.PROMPT_STYLE
+        if self.prompt_style not in PROMPT_STYLES:
+            raise ValueError(f"Unknown prompt style: {self.prompt_style} (expected one of {', '.join(PROMPT_STYLES)})")
+
+    @cached_property
+    def json_schema(self) -> Dict[str, Any]:
+        """Strict JSON Schema of CONTRACT_SPEC (see compile_json_schema), compiled once per instance."""
+        return compile_json_schema(self.CONTRACT_SPEC, self.name)
+
+    @cached_property
     def system_prompt(self) -> str:
         """
         Render the system prompt from CONTRACT_SPEC to avoid drift.
+
+        Rendered once per instance: CONTRACT_SPEC and the prompt style are fixed.
         """
         contract_block = self._render_contract_spec()
         return f"{self.BASE_PROMPT}\n{contract_block}\n{self.RULES}"
@@ -136,9 +164,9 @@ class StructuredAnswerLiteContract:
 
     def _render_contract_spec(self) -> str:
         """
-        Render CONTRACT_SPEC as deterministic JSON for prompt stability.
+        Render CONTRACT_SPEC deterministically (for prompt stability) in the instance's prompt style.
         """
-        return json.dumps(self.CONTRACT_SPEC, indent=2, ensure_ascii=False)
+        return render_contract_spec(self.CONTRACT_SPEC, self.prompt_style)
 
     def _validate_exact_keys(self, obj: Dict[str, Any], expected: Set[str], path: str, errors: List[str]) -> None:
         actual = set(obj.keys())
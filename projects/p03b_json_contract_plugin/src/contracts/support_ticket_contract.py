@@ -1,7 +1,9 @@
-import json
-from typing import Any, Dict, List, Set
+from functools import cached_property
+from typing import Any, Dict, List, Optional, Set
 
 from .base import ValidationResult
+from .compiler import MessageStyle, compile_json_schema
+from .prompt_render import PROMPT_STYLES, render_contract_spec
 
 
 class SupportTicketContract:
@@ -56,6 +58,14 @@ class SupportTicketContract:
     ALLOWED_CURRENCIES: Set[str] = {"BRL", "USD", "EUR"}
     SCHEMA_VERSION: str = "1.0"
 
+    # Error phrasing of validate(), reproduced by the compiled validator (see registry).
+    MESSAGE_STYLE = MessageStyle(
+        root_path="root",
+        not_object="Top-level JSON must be an object.",
+        suffix=".",
+        const_template='{path} must be exactly "{value}"',
+    )
+
     BASE_PROMPT: str = (
         "You are a system that extracts customer support tickets from user messages.\n\n"
         "You MUST return ONLY a valid JSON object.\n"
@@ -73,12 +83,31 @@ class SupportTicketContract:
         "- schema_version MUST be exactly \"1.0\".\n"
     )
 
-    @property
+    # Rendering of CONTRACT_SPEC in the system prompt (see prompt_render.PROMPT_STYLES).
+    PROMPT_STYLE: str = "indented"
+
+    def __init__(self, prompt_style: Optional[str] = None):
+        """
+        Parameters:
+            prompt_style: Override PROMPT_STYLE for this instance ("indented", "compact", "terse").
+        """
+        self.prompt_style = prompt_style or self.PROMPT_STYLE
+        if self.prompt_style not in PROMPT_STYLES:
+            raise ValueError(f"Unknown prompt style: {self.prompt_style} (expected one of {', '.join(PROMPT_STYLES)})")
+
+    @cached_property
+    def json_schema(self) -> Dict[str, Any]:
+        """Strict JSON Schema of CONTRACT_SPEC for the "json_schema" backend."""
+        return compile_json_schema(self.CONTRACT_SPEC, self.name)
+
+    @cached_property
     def system_prompt(self) -> str:
         """
         Render the system prompt from a single source of truth (CONTRACT_SPEC).
 
         Using a property ensures the prompt stays consistent with CONTRACT_SPEC.
+
+        Rendered once per instance: CONTRACT_SPEC and the prompt style are fixed.
         """
         contract_block = self._render_contract_spec()
         return f"{self.BASE_PROMPT}\n{contract_block}\n{self.RULES}"
@@ -111,9 +140,9 @@ class SupportTicketContract:
 
     def _render_contract_spec(self) -> str:
         """
-        Render CONTRACT_SPEC as deterministic JSON for prompt stability.
+        Render CONTRACT_SPEC deterministically (for prompt stability) in the instance's prompt style.
         """
-        return json.dumps(self.CONTRACT_SPEC, indent=2, ensure_ascii=False)
+        return render_contract_spec(self.CONTRACT_SPEC, self.prompt_style)
 
     # --- Validation helpers ----------------------------------------
 
@@ -0,0 +1,189 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+
+# History policies of JsonModeChatClient:
+# - "full": every message is kept, corrective messages of failed attempts included
+#   (the original behaviour).
+# - "pruned": a turn is stored as user + final assistant message only once it
+#   succeeds; corrective messages and failed turns are dropped. Optionally bounded
+#   by a token budget.
+# - "stateless": each send() carries only the system prompt and the current input.
+HISTORY_MODES = ("full", "pruned", "stateless")
+
+# Fixed per-message overhead of the chat format (role + separators).
+MESSAGE_OVERHEAD_TOKENS = 4
+
+# Heuristic used when tiktoken is not installed (~4 characters per token).
+CHARS_PER_TOKEN = 4
+
+
+def _get_encoder(model: str):
+    """Return a tiktoken encoder for the model, or None if unavailable."""
+    try:
+        import tiktoken
+    except ImportError:  # optional dependency: fall back to a character heuristic
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+
+
+class ConversationHistory:
+    """
+    Multi-turn history of a JSON Mode client.
+
+    `messages` is the plain list sent to the API. The system message (index 0)
+    is pinned. Turns are appended only when they are committed, so the working
+    copy of a request (with its corrective messages) never leaks into it unless
+    the policy is "full".
+    """
+
+    def __init__(self, system_prompt: str, model: str, mode: str = "full", budget_tokens: Optional[int] = None):
+        """
+        Parameters:
+            system_prompt: Pinned system message content.
+            model: Model ID, used to pick the tokenizer.
+            mode: One of HISTORY_MODES (default: "full").
+            budget_tokens: Maximum estimated tokens of retained history, system
+                prompt included ("pruned" only; None = unbounded).
+        """
+        if mode not in HISTORY_MODES:
+            raise ValueError(f"Unknown history mode: {mode} (expected one of {', '.join(HISTORY_MODES)})")
+        if budget_tokens is not None and mode != "pruned":
+            raise ValueError('budget_tokens requires history mode "pruned"')
+
+        self.mode = mode
+        self.budget_tokens = budget_tokens
+        self._encoder = _get_encoder(model)
+
+        self.messages: List[Dict[str, str]] = [{"role": "system", "content": system_prompt}]
+        self._token_counts: List[int] = [self._count_tokens(system_prompt)]
+        self.used_tokens = self._token_counts[0]
+
+        # Messages that were not retained: corrective messages, failed turns, evicted turns
+        self.dropped_messages = 0
+
+    def begin_turn(self, user_input: str) -> List[Dict[str, str]]:
+        """
+        Return the message list for a new turn, ending with the user message.
+
+        In "full" mode this is `messages` itself, so corrective messages and the
+        reply are recorded as they happen. Otherwise it is a copy, and the turn
+        only enters the history through commit_turn().
+        """
+        user = {"role": "user", "content": user_input}
+        if self.mode == "full":
+            self._push(user)
+            return self.messages
+        if self.mode == "stateless":
+            return [self.messages[0], user]
+        return self.messages + [user]
+
+    def commit_turn(self, working: List[Dict[str, str]], ok: bool) -> None:
+        """
+        Fold a finished turn back into the history according to the policy.
+
+        Parameters:
+            working: The list returned by begin_turn(), after the retry loop.
+            ok: True if the turn ended with a validated payload.
+        """
+        if self.mode == "full":
+            # Already recorded in place; just keep the token counts in step.
+            for message in working[len(self._token_counts):]:
+                self._token_counts.append(self._count_tokens(message["content"]))
+                self.used_tokens += self._token_counts[-1]
+            return
+
+        start = 1 if self.mode == "stateless" else len(self.messages)
+        turn = working[start:]
+        if self.mode == "stateless":
+            self.dropped_messages += len(turn)
+            return
+
+        if not ok:
+            self.dropped_messages += len(turn)
+            return
+
+        # Keep the user message and the final assistant message, nothing in between.
+        self.dropped_messages += len(turn) - 2
+        self._push(turn[0])
+        self._push(turn[-1])
+        self._enforce_budget()
+
+    def clear(self) -> None:
+        """Reset history to the pinned system message."""
+        del self.messages[1:]
+        del self._token_counts[1:]
+        self.used_tokens = self._token_counts[0]
+
+    def describe_usage(self) -> str:
+        """Human-readable history size, e.g. 'pruned · 9 messages · 812 / 4000 tokens'."""
+        budget = f" / {self.budget_tokens}" if self.budget_tokens is not None else ""
+        return f"{self.mode} · {len(self.messages)} messages · {self.used_tokens}{budget} tokens"
+
+    # --- Internals --------------------------------------------------
+
+    def _count_tokens(self, content: str) -> int:
+        if self._encoder is not None:
+            n = len(self._encoder.encode(content))
+        else:
+            n = (len(content) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+        return n + MESSAGE_OVERHEAD_TOKENS
+
+    def _push(self, message: Dict[str, str]) -> None:
+        n = self._count_tokens(message["content"])
+        self.messages.append(message)
+        self._token_counts.append(n)
+        self.used_tokens += n
+
+    def _enforce_budget(self) -> None:
+        if self.budget_tokens is None:
+            return
+        # Committed history is strictly user/assistant pairs: evict whole turns,
+        # oldest first, but always keep the newest one.
+        while self.used_tokens > self.budget_tokens and len(self.messages) > 3:
+            for _ in range(2):
+                self.messages.pop(1)
+                self.used_tokens -= self._token_counts.pop(1)
+                self.dropped_messages += 1
+
+
+@dataclass
+class UsageStats:
+    """
+    Token usage reported by the API, per client.
+
+    Attributes:
+        calls: Model calls that reported usage.
+        prompt_tokens: Total prompt tokens of those calls.
+        completion_tokens: Total completion tokens of those calls.
+        last_prompt_tokens: Prompt tokens of the most recent call.
+    """
+    calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    last_prompt_tokens: int = 0
+
+    def record(self, usage: Any) -> None:
+        """Add the `usage` object of a completion (ignored if None)."""
+        if usage is None:
+            return
+        self.calls += 1
+        self.last_prompt_tokens = usage.prompt_tokens or 0
+        self.prompt_tokens += self.last_prompt_tokens
+        self.completion_tokens += usage.completion_tokens or 0
+
+    @property
+    def avg_prompt_tokens(self) -> float:
+        return self.prompt_tokens / self.calls if self.calls else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "last_prompt_tokens": self.last_prompt_tokens,
+            "avg_prompt_tokens": round(self.avg_prompt_tokens, 1),
+        }
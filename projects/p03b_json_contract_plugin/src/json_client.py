@@ -1,10 +1,20 @@
 import json
-from typing import Any, Dict, List, Optional, Tuple
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from openai import OpenAI
 
-from .config import get_default_params
+from .config import get_default_params, get_response_format
 from .contracts.base import Contract, ValidationResult
+from .history import ConversationHistory, UsageStats
+from .json_repair import RepairStats, repair_json
+from .rate_limit import RateLimiter
+from .sampling import CANDIDATE_MODES, CandidateStats, pick_candidate
+from .stream_json import IncrementalJsonParser, JsonStreamError
 
 
 def _parse_json(raw_text: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
@@ -23,6 +33,28 @@ def _parse_json(raw_text: str) -> Tuple[Optional[Dict[str, Any]], Optional[str]]
         return None, str(e)
 
 
+@dataclass
+class BatchItemResult:
+    """
+    Outcome of one item of send_many() / extract_batch().
+
+    Attributes:
+        index: Position of the item in the input.
+        user_input: The item's user message.
+        result: The validated payload, or a structured error object
+            (including "REQUEST_FAILED" if the API call raised).
+        ok: True if result is a validated payload.
+        attempts: Model calls made for this item (1 + corrective retries).
+        latency_s: Wall time of the item, including rate-limit waits.
+    """
+    index: int
+    user_input: str
+    result: Dict[str, Any]
+    ok: bool
+    attempts: int
+    latency_s: float
+
+
 class JsonModeChatClient:
     """
     JSON Mode chat client (Chat Completions API) with contract-driven validation and controlled retry.
@@ -35,6 +67,13 @@ class JsonModeChatClient:
         model: Optional[str] = None,
         max_retries: int = 2,
         debug: bool = False,
+        stream: bool = False,
+        repair: bool = True,
+        history: str = "full",
+        history_budget_tokens: Optional[int] = None,
+        candidates: int = 1,
+        candidate_mode: str = "n",
+        backend: str = "json_object",
     ):
         """
         Initialize the JSON Mode chat client.
@@ -45,6 +84,24 @@ class JsonModeChatClient:
             model: Optional model override.
             max_retries: Number of corrective retries (default: 2).
             debug: Enable debug logging (default: False).
+            stream: Stream responses and check them while they arrive (default: False);
+                the first definite violation closes the stream and starts the corrective retry.
+            repair: Try local fixes (markdown fences, stray prose, trailing commas,
+                missing closing braces) on unparseable responses before a retry (default: True).
+            history: History policy of send(): "full" keeps every message, corrective
+                ones included; "pruned" keeps only successful turns (user + final
+                answer); "stateless" sends the system prompt and the input only
+                (default: "full").
+            history_budget_tokens: Token budget of the retained history, oldest
+                turns evicted first ("pruned" only; default: unbounded).
+            candidates: Responses sampled per attempt; the first one that passes the
+                contract is used, and a corrective retry runs only if none does
+                (default: 1, i.e. off). Not combined with stream=True.
+            candidate_mode: "n" asks for all candidates in one request (`n` parameter);
+                "parallel" sends `candidates` concurrent requests (default: "n").
+            backend: "json_object" (JSON Mode) or "json_schema" (Structured Outputs with
+                the contract's strict JSON Schema; validate() still checks the semantic
+                rules) (default: "json_object").
         """
         self.client = client
         self.contract = contract
@@ -54,19 +111,44 @@ class JsonModeChatClient:
         if model:
             self.default_params["model"] = model
 
+        self.backend = backend
+        self.response_format = get_response_format(backend, getattr(contract, "json_schema", None))
+
         self.max_retries = max_retries
         self.debug = debug
 
-        # Message history for multi-turn conversations
-        self.messages: List[Dict[str, str]] = []
-
-        # Inject contract-governed system prompt
-        self.messages.append(
-            {
-                "role": "system",
-                "content": self.contract.system_prompt,
-            }
+        if candidates < 1:
+            raise ValueError("candidates must be at least 1")
+        if candidate_mode not in CANDIDATE_MODES:
+            raise ValueError(f"Unknown candidate mode: {candidate_mode} (expected one of {', '.join(CANDIDATE_MODES)})")
+        if candidates > 1 and stream:
+            raise ValueError("candidates > 1 cannot be combined with stream=True")
+        self.candidates = candidates
+        self.candidate_mode = candidate_mode
+        self.candidate_stats = CandidateStats()
+
+        self.stream = stream
+        # Streamed attempts closed before the end of the response
+        self.stream_aborts = 0
+
+        self.repair = repair
+        self.repair_stats = RepairStats()
+
+        # Prompt/completion tokens reported by the API, per call and in total
+        self.usage = UsageStats()
+
+        # Counters are shared by the worker threads of send_many()
+        self._stats_lock = threading.Lock()
+
+        # Message history for multi-turn conversations, seeded with the
+        # contract-governed system prompt
+        self.history = ConversationHistory(
+            self.contract.system_prompt,
+            model=self.default_params["model"],
+            mode=history,
+            budget_tokens=history_budget_tokens,
         )
+        self.messages: List[Dict[str, str]] = self.history.messages
 
     def _debug(self, message: str) -> None:
         """
@@ -75,22 +157,135 @@ class JsonModeChatClient:
         if self.debug:
             print(f"[DEBUG] {message}")
 
-    def _call_model(self) -> str:
+    def _call_model(self, messages: List[Dict[str, str]]) -> str:
         """
         Perform a single Chat Completions call and return raw assistant content (expected JSON string).
         """
         completion = self.client.chat.completions.create(
             model=self.default_params["model"],
-            messages=self.messages,
-            response_format=self.default_params["response_format"],  # {"type":"json_object"}
+            messages=messages,
+            response_format=self.response_format,  # {"type":"json_object"} or the contract's json_schema
             temperature=self.default_params["temperature"],
             top_p=self.default_params.get("top_p", 1.0),
         )
+        self._record_usage(completion.usage)
 
         # Chat Completions: assistant text is in choices[0].message.content
-        raw_text = completion.choices[0].message.content or ""
+        message = completion.choices[0].message
+        if getattr(message, "refusal", None):
+            # Structured Outputs: a refusal comes instead of content (it fails parsing and is retried)
+            self._debug(f"Model refused: {message.refusal}")
+        raw_text = message.content or ""
         return raw_text
 
+    def _sample_model(self, messages: List[Dict[str, str]]) -> List[str]:
+        """
+        Sample self.candidates responses for the same messages, in one request
+        (candidate_mode "n") or in concurrent requests ("parallel").
+        """
+        if self.candidate_mode == "parallel":
+            with ThreadPoolExecutor(max_workers=self.candidates, thread_name_prefix="candidate") as pool:
+                return list(pool.map(lambda _: self._call_model(messages), range(self.candidates)))
+
+        completion = self.client.chat.completions.create(
+            model=self.default_params["model"],
+            messages=messages,
+            response_format=self.response_format,  # {"type":"json_object"} or the contract's json_schema
+            temperature=self.default_params["temperature"],
+            top_p=self.default_params.get("top_p", 1.0),
+            n=self.candidates,
+        )
+        self._record_usage(completion.usage)
+        return [choice.message.content or "" for choice in completion.choices]
+
+    def _select_candidate(self, candidates: List[str]) -> str:
+        """
+        Return the first candidate that passes the contract locally, or the
+        first candidate if none does (it then drives the corrective retry).
+        """
+        index = pick_candidate(candidates, self.contract, repair=self.repair)
+        with self._stats_lock:
+            stats = self.candidate_stats
+            stats.attempts += 1
+            stats.candidates += len(candidates)
+            if index == 0:
+                stats.first_valid += 1
+            elif index > 0:
+                stats.rescued += 1
+            else:
+                stats.none_valid += 1
+        self._debug(f"Candidates: {len(candidates)}, first valid: {index if index >= 0 else 'none'}")
+        return candidates[max(index, 0)] if candidates else ""
+
+    def _stream_model(self, messages: List[Dict[str, str]]) -> Tuple[str, Optional[Tuple[str, List[str]]]]:
+        """
+        Stream a Chat Completions call, parsing the JSON as it arrives and checking
+        it with the contract's check_event() when it has one.
+
+        Returns:
+            (raw_text, failure): failure is (error_code, details) if the stream
+            was closed early on a syntax error or a contract violation, else
+            None and raw_text is the complete response.
+        """
+        stream = self.client.chat.completions.create(
+            model=self.default_params["model"],
+            messages=messages,
+            response_format=self.response_format,  # {"type":"json_object"} or the contract's json_schema
+            temperature=self.default_params["temperature"],
+            top_p=self.default_params.get("top_p", 1.0),
+            stream=True,
+            # The final chunk carries the usage (only reached if the stream is read to the end)
+            stream_options={"include_usage": True},
+        )
+
+        check_event = getattr(self.contract, "check_event", None)
+        parser: Optional[IncrementalJsonParser] = IncrementalJsonParser()
+        parts: List[str] = []
+        failure: Optional[Tuple[str, List[str]]] = None
+        with stream:
+            for chunk in stream:
+                if chunk.usage is not None:
+                    self._record_usage(chunk.usage)
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if not delta:
+                    continue
+                parts.append(delta)
+                if parser is None:
+                    continue
+                try:
+                    events = parser.feed(delta)
+                except JsonStreamError as e:
+                    if self.repair:
+                        # Read to the end: the local repair stage may still fix it.
+                        self._debug(f"Stream is not plain JSON ({e}); checks stop, reading on for repair.")
+                        parser = None
+                        continue
+                    failure = ("INVALID_JSON", [f"JSON parse error: {e}"])
+                    break
+                if check_event is None:
+                    continue
+                for event in events:
+                    errors = check_event(event)
+                    if errors:
+                        failure = ("SCHEMA_VALIDATION_FAILED", errors)
+                        break
+                if failure:
+                    break
+        # Leaving the `with` block closes the HTTP response: no more tokens are generated.
+
+        raw_text = "".join(parts)
+        if failure:
+            with self._stats_lock:
+                self.stream_aborts += 1
+            self._debug(f"Stream closed after {len(raw_text)} chars: {failure[0]} {failure[1]}")
+        return raw_text, failure
+
+    def _record_usage(self, usage: Any) -> None:
+        with self._stats_lock:
+            self.usage.record(usage)
+        if usage is not None:
+            self._debug(f"Prompt tokens: {usage.prompt_tokens}")
+
     def send(self, user_input: str) -> Dict[str, Any]:
         """
         Send user input, enforce JSON-only output, validate the contract, and optionally retry.
@@ -98,9 +293,92 @@ class JsonModeChatClient:
         Returns:
             A dict matching the active contract, or a structured error object.
         """
-        # Add user message to history
-        self.messages.append({"role": "user", "content": user_input})
+        # The history policy decides what this turn sends and what it keeps
+        messages = self.history.begin_turn(user_input)
+        result, _ = self._complete(messages)
+        self.history.commit_turn(messages, ok="error" not in result)
+        return result
+
+    def send_many(
+        self,
+        inputs: Iterable[str],
+        concurrency: int = 8,
+        requests_per_minute: Optional[float] = None,
+    ) -> Iterator[BatchItemResult]:
+        """
+        Run independent single-turn extractions on a bounded thread pool.
+
+        Each input gets its own conversation (contract system prompt + the input)
+        and its own retry loop; the shared history in self.messages is neither
+        used nor changed. Results are yielded in input order, each as soon as it
+        and all the items before it are done.
+
+        Parameters:
+            inputs: User messages (any iterable; it is consumed lazily).
+            concurrency: Items in flight at once (default: 8).
+            requests_per_minute: Budget for all model calls of the batch,
+                retries included (default: no limit).
+        """
+        limiter = RateLimiter(requests_per_minute) if requests_per_minute else None
+        system = {"role": "system", "content": self.contract.system_prompt}
+
+        def run(index: int, user_input: str) -> BatchItemResult:
+            start = time.perf_counter()
+            messages = [system, {"role": "user", "content": user_input}]
+            result, attempts = self._complete(messages, limiter=limiter, capture_errors=True)
+            return BatchItemResult(
+                index=index,
+                user_input=user_input,
+                result=result,
+                ok="error" not in result,
+                attempts=attempts,
+                latency_s=time.perf_counter() - start,
+            )
+
+        concurrency = max(1, concurrency)
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="extract") as pool:
+            # Submit a bounded window ahead of the item being waited on, so a
+            # huge input is never queued all at once.
+            pending = deque()
+            try:
+                for index, user_input in enumerate(inputs):
+                    pending.append(pool.submit(run, index, user_input))
+                    if len(pending) >= 2 * concurrency:
+                        yield pending.popleft().result()
+                while pending:
+                    yield pending.popleft().result()
+            finally:
+                # The caller stopped early: drop the items that have not started.
+                for future in pending:
+                    future.cancel()
+
+    def extract_batch(
+        self,
+        inputs: Iterable[str],
+        concurrency: int = 8,
+        requests_per_minute: Optional[float] = None,
+    ) -> List[BatchItemResult]:
+        """
+        Collect send_many() into a list, in input order.
+        """
+        return list(self.send_many(inputs, concurrency=concurrency, requests_per_minute=requests_per_minute))
+
+    def _complete(
+        self,
+        messages: List[Dict[str, str]],
+        limiter: Optional[RateLimiter] = None,
+        capture_errors: bool = False,
+    ) -> Tuple[Dict[str, Any], int]:
+        """
+        The retry loop for one request: call the model with `messages`, repair,
+        validate, and append corrective messages to `messages` until the contract
+        is met or retries run out.
 
+        Returns:
+            (result, attempts): the payload or a structured error object, and the
+            number of model calls made. With capture_errors, an API exception
+            becomes a "REQUEST_FAILED" error instead of propagating.
+        """
         last_raw: str = ""
         last_parse_error: Optional[str] = None
         last_validation_errors: List[str] = []
@@ -108,15 +386,65 @@ class JsonModeChatClient:
         for attempt in range(self.max_retries + 1):
             self._debug(f"Attempt {attempt + 1}/{self.max_retries + 1}")
 
-            last_raw = self._call_model()
+            if limiter is not None:
+                # Every request takes a slot: k of them per attempt in "parallel" mode
+                for _ in range(self.candidates if self.candidate_mode == "parallel" else 1):
+                    limiter.acquire()
+            try:
+                if self.stream:
+                    last_raw, failure = self._stream_model(messages)
+                elif self.candidates > 1:
+                    last_raw, failure = self._select_candidate(self._sample_model(messages)), None
+                else:
+                    last_raw, failure = self._call_model(messages), None
+            except Exception as e:
+                if not capture_errors:
+                    raise
+                return {
+                    "error": "REQUEST_FAILED",
+                    "raw_response": last_raw,
+                    "details": f"{type(e).__name__}: {e}",
+                }, attempt + 1
+
+            # Streaming: a violation was found before the response was complete
+            if failure:
+                error_code, details = failure
+                if attempt < self.max_retries:
+                    self._inject_corrective_system_message(
+                        messages,
+                        error_code=error_code,
+                        details=details,
+                        raw_response=last_raw,
+                    )
+                    continue
+
+                return {
+                    "error": error_code,
+                    "raw_response": last_raw,
+                    "details": details if error_code == "SCHEMA_VALIDATION_FAILED" else details[0],
+                    "stream_aborted": True,
+                }, attempt + 1
 
             # Attempt to parse JSON
             data, parse_error = _parse_json(last_raw)
+            repaired = None
+            if parse_error and self.repair:
+                # Mechanical failures are fixed locally instead of spending a round-trip
+                with self._stats_lock:
+                    self.repair_stats.attempts += 1
+                repaired = repair_json(last_raw)
+                if repaired.data is not None:
+                    self._debug(f"Local repair ({', '.join(repaired.fixes)}) made the response parse.")
+                    data, parse_error = repaired.data, None
+                else:
+                    repaired = None
+
             if parse_error:
                 last_parse_error = parse_error
 
                 if attempt < self.max_retries:
                     self._inject_corrective_system_message(
+                        messages,
                         error_code="INVALID_JSON",
                         details=[f"JSON parse error: {parse_error}"],
                         raw_response=last_raw,
@@ -127,22 +455,29 @@ class JsonModeChatClient:
                     "error": "INVALID_JSON",
                     "raw_response": last_raw,
                     "details": parse_error,
-                }
+                }, attempt + 1
 
             # Contract-driven semantic validation
             result: ValidationResult = self.contract.validate(data)
             if result.ok:
                 self._debug("Validation passed. Returning final JSON response.")
+                if repaired is not None:
+                    with self._stats_lock:
+                        self.repair_stats.successes += 1
+                        if attempt < self.max_retries:
+                            self.repair_stats.saved_round_trips += 1
+                    last_raw = repaired.text
 
-                # Store assistant message in history (as the raw JSON string)
-                self.messages.append({"role": "assistant", "content": last_raw})
-                return data
+                # Store assistant message in history (as the raw JSON string, or its repaired form)
+                messages.append({"role": "assistant", "content": last_raw})
+                return data, attempt + 1
 
             last_validation_errors = result.errors
             self._debug(f"Contract validation failed with errors: {result.errors}")
 
             if attempt < self.max_retries:
                 self._inject_corrective_system_message(
+                    messages,
                     error_code="SCHEMA_VALIDATION_FAILED",
                     details=result.errors,
                     raw_response=last_raw,
@@ -153,17 +488,18 @@ class JsonModeChatClient:
                 "error": "SCHEMA_VALIDATION_FAILED",
                 "raw_response": last_raw,
                 "details": result.errors,
-            }
+            }, attempt + 1
 
         # Defensive fallback (should never happen)
         return {
             "error": "UNKNOWN",
             "raw_response": last_raw,
             "details": last_validation_errors or last_parse_error or "Unknown failure",
-        }
+        }, self.max_retries + 1
 
     def _inject_corrective_system_message(
         self,
+        messages: List[Dict[str, str]],
         error_code: str,
         details: List[str],
         raw_response: str,
@@ -188,4 +524,4 @@ class JsonModeChatClient:
             "Now return the corrected JSON object only."
         )
 
-        self.messages.append({"role": "system", "content": corrective})
+        messages.append({"role": "system", "content": corrective})
@@ -0,0 +1,30 @@
+import threading
+import time
+
+
+class RateLimiter:
+    """
+    Thread-safe requests-per-minute budget.
+
+    Requests are spaced evenly (60 / rpm seconds apart) instead of being sent
+    in bursts, so a batch never exceeds the budget in any window. Every model
+    call takes a slot, including corrective retries.
+    """
+
+    def __init__(self, requests_per_minute: float):
+        if requests_per_minute <= 0:
+            raise ValueError("requests_per_minute must be positive")
+        self.interval = 60.0 / requests_per_minute
+        self._lock = threading.Lock()
+        self._next = time.monotonic()
+
+    def acquire(self) -> float:
+        """Block until the next slot. Returns the time waited, in seconds."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        wait = slot - now
+        if wait > 0:
+            time.sleep(wait)
+        return wait
@@ -0,0 +1,54 @@
+import json
+from dataclasses import dataclass
+from typing import Dict, List
+
+from .contracts.base import Contract
+from .json_repair import repair_json
+
+# How a client gets k candidates per attempt:
+# - "n": one request with the `n` parameter (the prompt is billed once)
+# - "parallel": k concurrent requests (k prompts billed; no dependency on `n` support)
+CANDIDATE_MODES = ("n", "parallel")
+
+
+@dataclass
+class CandidateStats:
+    """Counters of multi-candidate sampling of a client."""
+    attempts: int = 0  # attempts that sampled more than one candidate
+    candidates: int = 0  # candidates received over those attempts
+    first_valid: int = 0  # attempts where the first candidate already passed
+    rescued: int = 0  # attempts where only a later candidate passed (a retry saved)
+    none_valid: int = 0  # attempts that fell through to a corrective retry
+
+    def as_dict(self) -> Dict[str, int]:
+        return {
+            "attempts": self.attempts,
+            "candidates": self.candidates,
+            "first_valid": self.first_valid,
+            "rescued": self.rescued,
+            "none_valid": self.none_valid,
+        }
+
+
+def passes_contract(raw: str, contract: Contract, repair: bool = True) -> bool:
+    """True if raw parses (directly or after local repair) to an object the contract accepts."""
+    try:
+        data = json.loads(raw)
+    except ValueError:
+        if not repair:
+            return False
+        data = repair_json(raw).data
+    return isinstance(data, dict) and contract.validate(data).ok
+
+
+def pick_candidate(candidates: List[str], contract: Contract, repair: bool = True) -> int:
+    """
+    Index of the first candidate that passes the contract, or -1 if none does.
+
+    Only a cheap local check: the client still runs the chosen candidate
+    through its normal parse / repair / validate path.
+    """
+    for i, raw in enumerate(candidates):
+        if passes_contract(raw, contract, repair):
+            return i
+    return -1
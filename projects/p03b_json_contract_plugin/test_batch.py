@@ -0,0 +1,56 @@
+"""
+Manual test for JsonModeChatClient.extract_batch() using SupportTicketContract.
+
+This file is NOT part of the project deliverables.
+It exists only to manually verify:
+- concurrent single-turn extractions (bounded thread pool)
+- results in input order, with per-item attempts and latency
+- the requests-per-minute budget
+"""
+
+import argparse
+import time
+
+from .src.config import get_openai_client
+from .src.contracts.registry import get_contract
+from .src.json_client import JsonModeChatClient
+
+CUSTOMER_MESSAGES = [
+    "Hi, I'm Ana Souza (ana.souza@email.com). Order BR-9912 never arrived, tracking is stuck for 10 days.",
+    "Paulo here. I was charged twice for order BR-1203 (R$ 249,90). Please refund one of the charges.",
+    "My account is locked after too many login attempts. Username: marcos.l. I need access today.",
+    "The blender I got (order BR-5521) makes a burning smell. I want to return it. — Júlia, julia@mail.com",
+    "How do I change the delivery address of an order that has not shipped yet? Order BR-7788.",
+    "Great service last week, just wanted to say thanks to the support team! — Carla",
+]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Extract support tickets concurrently.")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--rpm", type=float, default=60.0, help="Requests per minute for the whole batch")
+    parser.add_argument("--copies", type=int, default=1, help="Repeat the sample messages N times")
+    args = parser.parse_args()
+
+    chat = JsonModeChatClient(client=get_openai_client(), contract=get_contract("support_ticket"), max_retries=2)
+    inputs = [f"Customer message:\n{m}\n\nExtract a support ticket from this message." for m in CUSTOMER_MESSAGES]
+    inputs *= max(1, args.copies)
+
+    start = time.perf_counter()
+    ok = attempts = 0
+    for item in chat.send_many(inputs, concurrency=args.concurrency, requests_per_minute=args.rpm):
+        ok += item.ok
+        attempts += item.attempts
+        ticket = item.result.get("ticket", {}) if item.ok else {}
+        outcome = f"{ticket.get('intent')}/{ticket.get('priority')}" if item.ok else item.result.get("error")
+        print(f"[{item.index:>3}] {outcome:<28} attempts={item.attempts} latency={item.latency_s:.2f}s")
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"\n{ok}/{len(inputs)} valid · {attempts} model calls · {elapsed:.1f}s "
+        f"({len(inputs) / elapsed * 60:.1f} items/min) · repair {chat.repair_stats.as_dict()}"
+    )
+
+
+if __name__ == "__main__":
+    main()
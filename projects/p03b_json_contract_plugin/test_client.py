@@ -6,6 +6,7 @@ It exists only to manually verify:
 - JSON Mode behavior
 - contract validation
 - error handling
+- history size and prompt tokens per call
 - retry feedback loop
 """
 
@@ -63,6 +64,10 @@ def main() -> None:
     result = chat.send(invalid_prompt_wrong_types)
     print("Result:\n", result)
 
+    # Prompt tokens per call grow with the history (see history="pruned" / "stateless")
+    print("\nHistory:", chat.history.describe_usage())
+    print("Usage:", chat.usage.as_dict())
+
 
 if __name__ == "__main__":
     main()